@@ -0,0 +1,225 @@
+import argparse
+import json
+import platform
+import random
+import subprocess
+import sys
+import time
+import numpy as np
+from data_engine import RealTimeDataEngine, StockData
+from stockAppFns import circular_buffer, sliding_window, min_max_heap, hashtable, priority_queue
+
+"""Reproducible micro and end-to-end benchmarks; results are written as JSON for comparing versions"""
+
+def measure(fn, ops: int, repeat: int = 3) -> dict:
+    """Best-of-repeat timing of fn(), which performs ops operations"""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    best = min(times)
+    return {"ops": ops, "seconds": best, "ops_per_sec": ops / best if best else 0, "ns_per_op": best / ops * 1e9}
+
+def bench_circular_buffer(sizes, ops, rng):
+    results = []
+    prices = [rng.uniform(1, 500) for _ in range(ops)]
+    for size in sizes:
+        for name, cls in (("CircularBuffer", circular_buffer.CircularBuffer),
+                          ("ColumnarCircularBuffer", circular_buffer.ColumnarCircularBuffer)):
+            buffer = cls(size)
+            def append():
+                for i, p in enumerate(prices):
+                    buffer.append((p, float(i)))
+            results.append({"structure": name, "op": "append", "size": size, **measure(append, ops)})
+            reads = max(1, ops // size)
+            def get_all():
+                for _ in range(reads):
+                    buffer.get_all()
+            results.append({"structure": name, "op": "get_all", "size": size, **measure(get_all, reads)})
+            def newest():
+                for _ in range(ops):
+                    buffer.return_n_newest(1)
+            results.append({"structure": name, "op": "return_n_newest(1)", "size": size, **measure(newest, ops)})
+            if hasattr(buffer, "newest_prices"):
+                def view():
+                    for _ in range(ops):
+                        buffer.newest_prices()
+                results.append({"structure": name, "op": "newest_prices", "size": size, **measure(view, ops)})
+    return results
+
+def bench_sliding_window(sizes, ops, rng):
+    results = []
+    prices = [rng.uniform(1, 500) for _ in range(ops)]
+    for size in sizes:
+        def add():
+            window = sliding_window.SlidingWindow(size)
+            for p in prices:
+                window.add(p)
+        results.append({"structure": "SlidingWindow", "op": "add", "size": size, **measure(add, ops)})
+        window = sliding_window.SlidingWindow(size)
+        window.extend(prices[:size])
+        def stats():
+            for _ in range(ops):
+                window.get_min(); window.get_max(); window.get_average(); window.get_std()
+        results.append({"structure": "SlidingWindow", "op": "min+max+avg+std", "size": size, **measure(stats, ops)})
+    return results
+
+def bench_extremes(sizes, ops, rng):
+    results = []
+    prices = [rng.uniform(1, 500) for _ in range(ops)]
+    def running():
+        extremes = min_max_heap.RunningExtremes()
+        for p in prices:
+            extremes.add(p)
+    results.append({"structure": "RunningExtremes", "op": "add", "size": ops, **measure(running, ops)})
+    for size in sizes:
+        values = prices[:size]
+        def add_remove():
+            heap = min_max_heap.MinMaxHeap()
+            for v in values:
+                heap.add(v)
+            for i in range(len(values)):
+                heap.remove_min() if i % 2 else heap.remove_max()
+        results.append({"structure": "MinMaxHeap", "op": "add+remove", "size": size, **measure(add_remove, 2 * len(values))})
+    return results
+
+def bench_hashtable(sizes, ops, rng):
+    results = []
+    for size in sizes:
+        keys = [f"SYM{i}" for i in range(size)]
+        def put():
+            table = hashtable.HashTable()
+            for k in keys:
+                table.put(k, k)
+        results.append({"structure": "HashTable", "op": "put", "size": size, **measure(put, size)})
+        table = hashtable.HashTable()
+        for k in keys:
+            table.put(k, k)
+        lookups = [keys[rng.randrange(size)] for _ in range(ops)]
+        def get():
+            for k in lookups:
+                table.get(k)
+        results.append({"structure": "HashTable", "op": "get", "size": size, **measure(get, ops)})
+    return results
+
+def bench_priority_queue(sizes, ops, rng):
+    results = []
+    for size in sizes:
+        priorities = [rng.randrange(10) for _ in range(size)]
+        def push_pop():
+            queue = priority_queue.PriorityQueue()
+            for i, p in enumerate(priorities):
+                queue.push(p, i)
+            while not queue.is_empty():
+                queue.pop()
+        results.append({"structure": "PriorityQueue", "op": "push+pop", "size": size, **measure(push_pop, 2 * size)})
+        def bulk():
+            queue = priority_queue.PriorityQueue()
+            queue.push_many([(p, i) for i, p in enumerate(priorities)])
+        results.append({"structure": "PriorityQueue", "op": "push_many", "size": size, **measure(bulk, size)})
+    return results
+
+def make_ticks(symbol_count, ticks, rng):
+    symbols = [f"S{i}" for i in range(symbol_count)]
+    return ([symbols[rng.randrange(symbol_count)] for _ in range(ticks)],
+            [round(rng.uniform(1, 500), 2) for _ in range(ticks)],
+            [float(i) for i in range(ticks)])
+
+def bench_engine(symbol_counts, window_sizes, ticks, rng):
+    results = []
+    for symbol_count in symbol_counts:
+        symbols, prices, timestamps = make_ticks(symbol_count, ticks, rng)
+        points = [StockData(s, p, 0, t) for s, p, t in zip(symbols, prices, timestamps)]
+        for window_size in window_sizes:
+            config = {"symbols": symbol_count, "window_size": window_size}
+
+            def per_tick():
+                engine = RealTimeDataEngine(buffer_size=100, window_size=window_size)
+                for point in points:
+                    engine.process_point(point)
+            results.append({"benchmark": "ingest_per_tick", **config, **measure(per_tick, ticks, repeat=1)})
+
+            engine = RealTimeDataEngine(buffer_size=100, window_size=window_size)
+            def batch():
+                for i in range(0, ticks, 10000):
+                    engine.ingest_batch(symbols[i:i + 10000], prices[i:i + 10000], None, timestamps[i:i + 10000])
+            results.append({"benchmark": "ingest_batch_10k", **config, **measure(batch, ticks, repeat=1)})
+
+            queries = 200
+            def all_data():
+                for i in range(queries):
+                    engine.get_all_data()
+                    engine.ingest(symbols[i], prices[i])  # keep a few symbols dirty
+            results.append({"benchmark": "get_all_data", **config, **measure(all_data, queries)})
+            def thresholds():
+                for i in range(queries):
+                    engine.symbols_above_price(490.0)
+                    engine.symbols_below_price(10.0)
+            results.append({"benchmark": "threshold_queries", **config, **measure(thresholds, 2 * queries)})
+            def latest():
+                for s in symbols[:10000]:
+                    engine.get_latest_price(s)
+            results.append({"benchmark": "get_latest_price", **config, **measure(latest, min(ticks, 10000))})
+    return results
+
+def environment() -> dict:
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True).stdout.strip()
+    except OSError:
+        commit = None
+    return {
+        "python": sys.version.split()[0],
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "commit": commit or None,
+        "timestamp": time.time(),
+    }
+
+def run(quick: bool = False, seed: int = 42) -> dict:
+    rng = random.Random(seed)
+    ops = 20000 if quick else 200000
+    sizes = [50, 500] if quick else [50, 500, 5000]
+    return {
+        "environment": environment(),
+        "config": {"quick": quick, "seed": seed, "ops": ops, "sizes": sizes},
+        "micro": (bench_circular_buffer(sizes, ops, rng) + bench_sliding_window(sizes, ops, rng)
+                  + bench_extremes(sizes, ops, rng) + bench_hashtable(sizes, ops, rng)
+                  + bench_priority_queue(sizes, ops, rng)),
+        "engine": bench_engine([10, 1000] if quick else [10, 1000, 10000],
+                               [20, 500] if quick else [20, 500, 5000],
+                               20000 if quick else 200000, rng),
+    }
+
+def _key(row: dict) -> tuple:
+    return tuple((k, row[k]) for k in ("structure", "op", "benchmark", "size", "symbols", "window_size") if k in row)
+
+def compare(baseline: dict, current: dict):
+    """Print ops/sec ratios of current vs baseline for matching rows"""
+    base = {_key(row): row for section in ("micro", "engine") for row in baseline.get(section, [])}
+    for section in ("micro", "engine"):
+        for row in current[section]:
+            old = base.get(_key(row))
+            if old and old["ops_per_sec"]:
+                ratio = row["ops_per_sec"] / old["ops_per_sec"]
+                label = ", ".join(f"{k}={v}" for k, v in _key(row))
+                print(f"{ratio:6.2f}x  {label}")
+
+if __name__=="__main__":
+    parser = argparse.ArgumentParser(description="Benchmark data structures and engine throughput")
+    parser.add_argument("--quick", action="store_true", help="smaller sizes for a fast smoke run")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="write JSON results to this file (default: stdout)")
+    parser.add_argument("--compare", help="baseline JSON file to compare against")
+    args = parser.parse_args()
+
+    results = run(quick=args.quick, seed=args.seed)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    else:
+        json.dump(results, sys.stdout, indent=2)
+        print()
+    if args.compare:
+        with open(args.compare) as f:
+            compare(json.load(f), results)
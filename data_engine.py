@@ -1,7 +1,13 @@
+import logging
 import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict
 from dataclasses import dataclass
-from stockAppFns import registery, priority_queue
+import numpy as np
+from stockAppFns import registery, priority_queue, sorted_index, alerts, tick_log, metrics, heavy_hitters, indicators, correlation, downsample
+
+logger = logging.getLogger(__name__)
 
 @dataclass
 class StockData:
@@ -12,128 +18,1146 @@ class StockData:
 
 class RealTimeDataEngine: # using SymbolRegistry to manage per-symbol structures.
 
-    def __init__(self, buffer_size=100, window_size=50):
-        self.registry = registery.SymbolRegistry(buffer_size, window_size)
+    def __init__(self, buffer_size=100, window_size=50, columnar=True, time_windows=(), bar_resolutions=(), bar_capacity=100,
+                 log_dir=None, checkpoint_every=None, instrument=False, hot_symbols=0, rate_half_life=60.0,
+                 buffer_sizes=None, quantiles=False, indicator_specs=(), correlation_symbols=(),
+                 correlation_window=300, correlation_interval=1.0, session_length=None):
+        self.registry = registery.SymbolRegistry(buffer_size, window_size, columnar, time_windows,
+                                                 bar_resolutions, bar_capacity, buffer_sizes, quantiles,
+                                                 indicator_specs)
         self.total_points = 0
         self.total_time = 0.0
+        self.snapshot_reads = 0
+        self.read_retries = 0  # reads that overlapped a write and had to start over
+        self.version = 0  # bumped on every per-symbol write
+        self._change_log = {}  # symbol id -> version of its last write, oldest write first
+        self._snapshot = {}  # cached get_all_data result; summaries are replaced, never mutated
+        self._snapshot_version = 0
+        self._snapshot_lock = threading.Lock()  # get_all_data callers only; ingest never takes it
+        self.price_index = sorted_index.SortedIndex()  # symbol id by latest price
+        # ranking indexes below are only read by queries, so ingest leaves them to _refresh_rankings
+        self.deviation_index = sorted_index.SortedIndex()  # symbol id by % of latest price above rolling average
+        self.change_index = sorted_index.SortedIndex()  # symbol id by % change since session open
+        self.range_index = sorted_index.SortedIndex()  # symbol id by rolling window (max - min) as % of average
+        self.session_length = session_length  # seconds per session (e.g. 86400), None = one session since start
+        self._ranked_version = 0  # engine version the ranking indexes reflect
+        self._ranking_lock = threading.Lock()  # serializes ranking refreshes among readers; ingest never takes it
+        self.alerts = alerts.AlertBook()
+        self._requests = []  # writer-state changes from other threads, run by the ingest thread (see _apply_requests)
+        self.events = EventProcessor()  # fired alerts land here
+        # decaying per-symbol tick rates for the hot_symbols busiest symbols (0 = off)
+        self.tick_rates = heavy_hitters.DecayingSpaceSaving(hot_symbols, rate_half_life) if hot_symbols else None
+        self._indicator_lock = threading.Lock()  # serializes attach/remove among readers; ingest never takes it
+        # rolling return correlations between a chosen subset of symbols, sampled on a time grid
+        self.correlation_window = correlation_window
+        self.correlation_interval = correlation_interval
+        self.correlations = None
+        if correlation_symbols:
+            self.correlations = correlation.RollingCorrelation(correlation_window, correlation_interval)
+            for symbol in correlation_symbols:
+                self.correlations.add(symbol)
+
+        # latency histograms; when off the hot path only pays for total_points/total_time
+        self.metrics = None
+        if instrument:
+            self.set_instrumentation(True)
+
+        # durability: write-ahead tick log plus periodic registry checkpoints
+        self.log_dir = log_dir
+        self.checkpoint_every = checkpoint_every  # ticks between automatic checkpoints
+        self.tick_log = None
+        self.replayed = 0
+        self._logged_symbols = 0
+        self._ticks_since_checkpoint = 0
+        if log_dir is not None:
+            self._recover()
+            self.tick_log = tick_log.TickLog(log_dir)
+            self._logged_symbols = len(self.registry)
+
+    QUERY_METHODS = ("get_latest_price", "get_rolling_average", "get_rolling_std", "get_volatility", "get_min_max",
+                     "get_window_stats", "get_bars", "get_price_history", "get_symbol_snapshot", "symbols_above_price",
+                     "symbols_below_price", "symbols_in_price_range", "symbols_above_average", "symbols_below_average",
+                     "get_changes_since", "get_all_data", "hottest_symbols", "get_quantiles", "get_digest",
+                     "get_indicator", "get_indicators", "top_correlated", "get_correlation_matrix",
+                     "top_gainers", "top_losers", "top_above_average", "top_below_average", "widest_ranges",
+                     "get_downsampled_history")
+
+    def set_instrumentation(self, enabled: bool):
+        """
+        Turn latency histograms on or off. Query methods are wrapped with timers on the
+        instance while enabled, so a disabled engine runs the plain methods untouched.
+        """
+        if enabled and self.metrics is None:
+            self.metrics = metrics.EngineMetrics()
+            for name in self.QUERY_METHODS:
+                setattr(self, name, self.metrics.wrap_query(name, getattr(self, name)))
+        elif not enabled and self.metrics is not None:
+            for name in self.QUERY_METHODS:
+                self.__dict__.pop(name, None)
+            self.metrics = None
 
     def process_point(self, data: StockData):
         """Process a single StockData point"""
-        symbol = data.symbol
-        self.registry.register(symbol)
+        start_time = time.perf_counter()
+        timer = self.metrics  # None unless instrumented; every stage lap below is then skipped
+        if timer:
+            timer.start_tick(start_time)
+        if self._requests:
+            self._apply_requests()
+        symbol_data = self.registry.get_or_create(data.symbol)
+        book = self.alerts.get(data.symbol) if self.alerts.by_symbol else None
+        prev = self._latest(symbol_data) if book else None
+        if timer:
+            timer.lap("registry")
 
-        symbol_data = self.registry.get_symbol_data(symbol)
+        # Update data structures; odd seq tells readers a write is in progress
+        symbol_data["seq"] += 1
+        try:
+            symbol_data["buffer"].append((data.price, data.timestamp))
+            if timer:
+                timer.lap("buffer")
+            symbol_data["stats"].add(data.price)
+            for window in symbol_data["time_windows"].values():
+                window.add(data.price, data.timestamp)
+            if timer:
+                timer.lap("window")
+            symbol_data["extremes"].add(data.price)
+            self._roll_session(symbol_data, data.price, data.timestamp)
+            if timer:
+                timer.lap("extremes")
+            for series in symbol_data["bars"].values():
+                series.update(data.price, data.volume, data.timestamp)
+            if timer:
+                timer.lap("bars")
+            if symbol_data["digest"] is not None:
+                symbol_data["digest"].add(data.price)
+                symbol_data["rolling_digest"].add(data.price)
+                if timer:
+                    timer.lap("quantiles")
+            if symbol_data["indicators"]:
+                for indicator in symbol_data["indicators"].values():
+                    indicator.update(data.price, data.volume, data.timestamp)
+                if timer:
+                    timer.lap("indicators")
+        finally:
+            symbol_data["seq"] += 1
+        self._after_write(symbol_data)
+        if timer:
+            timer.lap("indexes")
+        if self.tick_log is not None:
+            self._define_symbols()
+            self.tick_log.append(symbol_data["id"], data.price, data.volume, data.timestamp)
+            self._count_for_checkpoint(1)
+            if timer:
+                timer.lap("log")
+        if self.tick_rates is not None:
+            self.tick_rates.add(symbol_data["id"], data.timestamp)
+            if timer:
+                timer.lap("rates")
+        if self.correlations is not None:
+            self._observe_correlation(data)
+            if timer:
+                timer.lap("correlation")
+
+        if book:
+            self._fire(self.alerts.check(book, prev, data.price, symbol_data["stats"].get_average(), data.timestamp))
+            if timer:
+                timer.lap("alerts")
+        elapsed = time.perf_counter() - start_time
+        if timer:
+            timer.tick.record(elapsed)
+        self.total_points += 1
+        self.total_time += elapsed
+
+    def _apply_requests(self):
+        """
+        Run the changes other threads queued for the ingest thread, before its next tick.
+        Alert books and sessions have this single writer, like every per-symbol structure.
+        """
+        while self._requests:
+            self._requests.pop(0)()
+
+    def _observe_correlation(self, data: StockData):
+        tracker = self.correlations
+        if tracker.requested:
+            tracker.apply_requests()
+        col = tracker.columns.get(data.symbol)
+        if col is not None:
+            tracker.observe(col, data.price, data.timestamp)
+
+    def _fire(self, fired):
+        """Queue fired alerts; a repeat of the same alert still waiting is coalesced"""
+        if fired:
+            self.events.add_events([(priority, event, (event["symbol"], event["alert_id"])) for priority, event in fired])
+
+    def _after_write(self, symbol_data):
+        """Bookkeeping once a symbol's structures are updated"""
+        self._mark_changed(symbol_data)
+        self._update_indexes(symbol_data)
+
+    def _update_indexes(self, symbol_data):
+        self.price_index.update(symbol_data["id"], float(self._latest(symbol_data)))
+
+    def _refresh_rankings(self):
+        """
+        Re-rank the symbols written since the last refresh, found through the change log
+        like get_changes_since. Ingest only logs the write, so a ranking nobody queries
+        costs nothing per tick and a query pays O(changed symbols * log n).
+        """
+        with self._ranking_lock:
+            current = self.version  # read before the log walk; see _mark_changed
+            by_id = self.registry.by_id
+            for symbol_id in self._changed_ids_since(self._ranked_version):
+                deviation, change, spread = self._read(by_id[symbol_id], self._rankings)
+                self.deviation_index.update(symbol_id, deviation)
+                self.change_index.update(symbol_id, change)
+                self.range_index.update(symbol_id, spread)
+            self._ranked_version = current
+
+    @classmethod
+    def _rankings(cls, symbol_data) -> tuple:
+        """(% above rolling average, % change since session open, window range as % of average)"""
+        price = float(cls._latest(symbol_data))
+        stats = symbol_data["stats"]
+        avg = stats.get_average()
+        session_open = symbol_data["session_open"]
+        return ((price - avg) / avg * 100 if avg else 0.0,
+                (price / session_open - 1) * 100 if session_open else 0.0,
+                (stats.get_max() - stats.get_min()) / avg * 100 if avg else 0.0)
+
+    def _session_start(self, timestamp: float) -> float:
+        return timestamp - timestamp % self.session_length if self.session_length else 0.0
+
+    def _roll_session(self, symbol_data, price: float, timestamp: float):
+        """Take price as the session open on the first tick of a new session"""
+        start = self._session_start(timestamp)
+        if symbol_data["session_open"] is None or start > symbol_data["session_start"]:
+            symbol_data["session_start"] = start
+            symbol_data["session_open"] = float(price)
+
+    def _roll_session_batch(self, symbol_data, prices, timestamps):
+        """_roll_session for a symbol's rows in arrival order: the open is the first row of the newest session"""
+        start = self._session_start(float(timestamps[-1]))
+        if symbol_data["session_open"] is None or start > symbol_data["session_start"]:
+            first = int(np.argmax(timestamps >= start))
+            symbol_data["session_start"] = start
+            symbol_data["session_open"] = float(prices[first])
+
+    def start_session(self):
+        """
+        Start a new session; safe from any thread. Before its next tick the ingest thread
+        makes every symbol's latest price its session open.
+        """
+        self._requests.append(self._start_session)
+
+    def _start_session(self):
+        for symbol_data in self.registry.by_id:
+            latest = self._latest(symbol_data)
+            if latest is None:
+                continue
+            symbol_data["seq"] += 1
+            try:
+                symbol_data["session_open"] = float(latest)
+                symbol_data["session_start"] = symbol_data["buffer"].latest()[1]
+            finally:
+                symbol_data["seq"] += 1
+            self._mark_changed(symbol_data)  # re-ranked by the next leaderboard query
+
+    def _mark_changed(self, symbol_data):
+        """
+        Stamp the symbol with a new version and move it to the end of the change log.
+        self.version is published last, so a reader holding version v finds every write <= v in the log.
+        """
+        version = self.version + 1
+        symbol_data["version"] = version
+        log = self._change_log
+        log.pop(symbol_data["id"], None)
+        log[symbol_data["id"]] = version
+        self.version = version
+
+    def process_batch(self, data_list: List[StockData]) -> Dict[str, float]:
+        """Process a batch of StockData points"""
+        return self.ingest_batch(
+            [data.symbol for data in data_list],
+            [data.price for data in data_list],
+            [data.volume for data in data_list],
+            [data.timestamp for data in data_list],
+        )
+
+    @staticmethod
+    def _group_rows(symbols):
+        """Yield (symbol, row indices) per symbol in first-seen order, rows kept in arrival order"""
+        uniq, first, inverse = np.unique(np.asarray(symbols), return_index=True, return_inverse=True)
+        if uniq.dtype.kind == "S": # bytes symbols, e.g. from a .npy file; decode the distinct ones only
+            uniq = np.char.decode(uniq, "utf-8")
+        order = np.argsort(inverse, kind="stable")
+        groups = np.split(order, np.cumsum(np.bincount(inverse))[:-1])
+        for g in np.argsort(first):
+            yield str(uniq[g]), groups[g]
+
+    def ingest_batch(self, symbols, prices, volumes=None, timestamps=None) -> Dict[str, float]:
+        """
+        Ingest parallel arrays of ticks. Rows are grouped by symbol and applied to each
+        symbol's structures in bulk; the resulting state matches tick-by-tick ingest.
+        """
+        start_time = time.perf_counter()
+
+        prices = np.asarray(prices, dtype=np.float64)
+        n = len(prices)
+        if len(symbols) != n or (volumes is not None and len(volumes) != n) \
+                or (timestamps is not None and len(timestamps) != n):
+            raise ValueError("symbols, prices, volumes and timestamps must have the same length")
+        if timestamps is None:
+            timestamps = np.full(n, time.time())
+        else:
+            timestamps = np.asarray(timestamps, dtype=np.float64)
+        volumes = np.zeros(n) if volumes is None else np.asarray(volumes)
+
+        if n:
+            if self._requests:
+                self._apply_requests()
+            tracker = self.correlations
+            if tracker is not None and tracker.requested:
+                tracker.apply_requests()
+            correlated = []  # (rows, column) of tracked symbols, fed to the tracker in arrival order
+            row_ids = np.empty(n, dtype=np.int64) if self.tick_rates is not None else None
+            for symbol, rows in self._group_rows(symbols):
+                symbol_data = self.registry.get_or_create(symbol)
+                book = self.alerts.get(symbol) if self.alerts.by_symbol else None
+
+                symbol_prices = prices[rows]
+                price_list = symbol_prices.tolist()
+                fired = []
+                symbol_data["seq"] += 1
+                try:
+                    if book: # alerts need the rolling average after every tick
+                        prev = self._latest(symbol_data)
+                        stats = symbol_data["stats"]
+                        for price, timestamp in zip(price_list, timestamps[rows].tolist()):
+                            stats.add(price)
+                            fired.extend(self.alerts.check(book, prev, price, stats.get_average(), timestamp))
+                            prev = price
+                    else:
+                        symbol_data["stats"].extend(price_list)
+                    symbol_data["buffer"].extend(symbol_prices, timestamps[rows])
+                    symbol_data["extremes"].extend(price_list)
+                    self._roll_session_batch(symbol_data, symbol_prices, timestamps[rows])
+                    if symbol_data["time_windows"] or symbol_data["bars"] or symbol_data["indicators"]:
+                        timestamp_list = timestamps[rows].tolist()
+                        for window in symbol_data["time_windows"].values():
+                            window.extend(price_list, timestamp_list)
+                        volume_list = volumes[rows].tolist()
+                        for series in symbol_data["bars"].values():
+                            series.extend(price_list, volume_list, timestamp_list)
+                        for indicator in symbol_data["indicators"].values():
+                            indicator.extend(price_list, volume_list, timestamp_list)
+                    if symbol_data["digest"] is not None:
+                        symbol_data["digest"].extend(symbol_prices)
+                        symbol_data["rolling_digest"].extend(symbol_prices)
+                finally:
+                    symbol_data["seq"] += 1
+                self._after_write(symbol_data)
+                if self.tick_log is not None:
+                    self._define_symbols()
+                    self.tick_log.append_batch(np.full(len(rows), symbol_data["id"]), symbol_prices,
+                                               volumes[rows], timestamps[rows])
+                if row_ids is not None:
+                    row_ids[rows] = symbol_data["id"]
+                if tracker is not None and symbol in tracker.columns:
+                    correlated.append((rows, tracker.columns[symbol]))
+                self._fire(fired)
+
+            if row_ids is not None: # in arrival order, so evictions match per-tick ingest
+                self.tick_rates.add_sequence(row_ids, timestamps)
+
+            if correlated:
+                rows = np.concatenate([r for r, _ in correlated])
+                cols = np.concatenate([np.full(len(r), col) for r, col in correlated])
+                order = np.argsort(rows, kind="stable")
+                tracker.observe_many(cols[order], prices[rows[order]], timestamps[rows[order]])
+
+            if self.tick_log is not None:
+                self._count_for_checkpoint(n)
+
+        batch_time = time.perf_counter() - start_time
+        self.total_points += n
+        self.total_time += batch_time
+        if self.metrics is not None:
+            self.metrics.batch.record(batch_time)
+
+        return {
+            "batch_size": n,
+            "batch_time": batch_time,
+            "total_points": self.total_points,
+            "total_time": self.total_time,
+            "points_per_second": self.total_points / self.total_time if self.total_time else 0
+        }
+
+    def _define_symbols(self):
+        """Log names of symbols registered since the last call (ids are dense, so in order)"""
+        names = self.registry.names
+        while self._logged_symbols < len(names):
+            self.tick_log.define_symbol(self._logged_symbols, names[self._logged_symbols])
+            self._logged_symbols += 1
 
-        # Update data structures
-        symbol_data["buffer"].append((data.price, data.timestamp))
-        symbol_data["stats"].add(data.price)
-        symbol_data["extremes"].add(data.price)
+    def _count_for_checkpoint(self, n: int):
+        self._ticks_since_checkpoint += n
+        if self.checkpoint_every and self._ticks_since_checkpoint >= self.checkpoint_every:
+            self.checkpoint()
 
-    # def process_batch(self, data_list: List[StockData]) -> Dict[str, float]:
-    #     """Process a batch of StockData points"""
-    #     start_time = time.perf_counter()
+    def checkpoint(self):
+        """Commit the log and atomically write the registry state along with the log position it covers"""
+        self.tick_log.commit()
+        tick_log.write_checkpoint(self.log_dir, {
+            "ticks": self.tick_log.committed,
+            "registry": self.registry,
+            "total_points": self.total_points,
+        })
+        self._ticks_since_checkpoint = 0
 
-    #     for data in data_list:
-    #         self.process_point(data)
+    def _recover(self, chunk_size: int = 100000):
+        """
+        Load the latest checkpoint, then replay the log tail through the batch path. A checkpoint
+        taken under different structural settings (buffer, window, time window, bar or quantile
+        options) is ignored and the whole log is replayed, so the requested settings always apply.
+        """
+        state = tick_log.read_checkpoint(self.log_dir)
+        start = 0
+        if state is not None and state["registry"].config() == self.registry.config():
+            configured = self.registry.indicator_specs
+            self.registry = state["registry"]
+            for spec in configured: # global specs attach lazily, so new ones just join the list
+                if spec not in self.registry.indicator_specs:
+                    self.registry.indicator_specs.append(spec)
+            self.total_points = state["total_points"]
+            start = state["ticks"]
 
-    #     end_time = time.perf_counter()
-    #     batch_time = end_time - start_time
+        # pin ids to the logged order before replay assigns any
+        names = tick_log.read_symbols(self.log_dir)
+        for name in names[len(self.registry):]:
+            self.registry.get_or_create(name)
+        for symbol_data in self.registry.by_id:
+            if len(symbol_data["buffer"]):
+                self._after_write(symbol_data)
 
-    #     self.total_points += len(data_list)
-    #     self.total_time += batch_time
+        records = tick_log.read_ticks(self.log_dir, start)
+        symbol_array = np.array(names) if names else np.empty(0, dtype=str)
+        for i in range(0, len(records), chunk_size):
+            chunk = records[i:i + chunk_size]
+            self.ingest_batch(symbol_array[chunk["id"]], chunk["price"], chunk["volume"], chunk["timestamp"])
+        self.replayed = len(records)
 
-    #     return {
-    #         "batch_size": len(data_list),
-    #         "batch_time": batch_time,
-    #         "total_points": self.total_points,
-    #         "total_time": self.total_time,
-    #         "points_per_second": self.total_points / self.total_time if self.total_time else 0
-    #     }
+    def close(self):
+        """Flush the tick log to disk"""
+        if self.tick_log is not None:
+            self.tick_log.close()
+            self.tick_log = None
+
+    def ingest_records(self, records: np.ndarray) -> Dict[str, float]:
+        """Ingest a structured array with 'symbol' and 'price' fields (optional 'volume', 'timestamp')"""
+        names = records.dtype.names or ()
+        return self.ingest_batch(
+            records["symbol"],
+            records["price"],
+            records["volume"] if "volume" in names else None,
+            records["timestamp"] if "timestamp" in names else None,
+        )
     
-    def ingest(self, symbol: str, price: float):
+    def ingest(self, symbol: str, price: float, volume: int = 0, timestamp: float = None):
         """Convenience method for simulator"""
-        data = StockData(symbol, price, 0, time.time())
+        data = StockData(symbol, price, volume, time.time() if timestamp is None else timestamp)
         self.process_point(data)
 
+    def _read(self, symbol_data, reader):
+        """
+        Seqlock read: run reader and retry if a write started or finished meanwhile.
+        Writers never wait on readers, so ingest takes no lock. A reader that raises on
+        torn state is retried too; its error only reaches the caller from a stable read.
+        """
+        self.snapshot_reads += 1
+        while True:
+            seq = symbol_data["seq"]
+            if not seq & 1:
+                try:
+                    result = reader(symbol_data)
+                except Exception:
+                    if symbol_data["seq"] == seq:
+                        raise
+                else:
+                    if symbol_data["seq"] == seq:
+                        return result
+            self.read_retries += 1
+            time.sleep(0)  # yield so the writer can finish
+
+    def add_alert(self, symbol: str, kind: str, value: float = None, priority: int = 1, direction: str = "both") -> int:
+        """
+        Register a standing alert ("above", "below", "pct_move" or "cross_avg"); safe from any thread.
+        The ingest thread puts it in place before its next tick, from then on it is checked on
+        every tick of its symbol and fired alerts are queued on self.events.
+        """
+        alert = self.alerts.create(symbol, kind, value, priority, direction)  # a bad alert raises here
+        self._requests.append(lambda: self.alerts.add(alert, self._latest_of(symbol)))
+        return alert.alert_id
+
+    def remove_alert(self, alert_id: int) -> bool:
+        """Withdraw an alert from the next tick on; False if it is unknown or already removed"""
+        if not self.alerts.cancel(alert_id):
+            return False
+        self._requests.append(lambda: self.alerts.remove(alert_id))
+        return True
+
+    def _latest_of(self, symbol: str):
+        symbol_data = self.registry.get_symbol_data(symbol)
+        return self._latest(symbol_data) if symbol_data is not None else None
+
     def get_latest_price(self, symbol: str):
-        if not self.registry.exists(symbol):
+        symbol_data = self.registry.get_symbol_data(symbol)
+        if symbol_data is None:
             return None
-        buffer = self.registry.get_symbol_data(symbol)["buffer"]
-        recent = buffer.return_n_newest(1)
-        return recent[0][0] if recent else None
+        return self._read(symbol_data, self._latest)
+
+    @staticmethod
+    def _latest(symbol_data):
+        latest = symbol_data["buffer"].latest()
+        return latest[0] if latest else None
 
     def get_rolling_average(self, symbol: str) -> float:
         """Get current rolling average"""
-        if not self.registry.exists(symbol):
+        symbol_data = self.registry.get_symbol_data(symbol)
+        if symbol_data is None:
+            return None
+        return self._read(symbol_data, lambda data: data["stats"].get_average())
+
+    def get_rolling_std(self, symbol: str) -> float:
+        """Get standard deviation of prices in the rolling window"""
+        symbol_data = self.registry.get_symbol_data(symbol)
+        if symbol_data is None:
             return None
-        return self.registry.get_symbol_data(symbol)["stats"].get_average()
+        return self._read(symbol_data, lambda data: data["stats"].get_std())
+
+    def get_volatility(self, symbol: str) -> float:
+        """Get standard deviation of tick returns in the rolling window"""
+        symbol_data = self.registry.get_symbol_data(symbol)
+        if symbol_data is None:
+            return None
+        return self._read(symbol_data, lambda data: data["stats"].get_volatility())
 
     def get_min_max(self, symbol: str):
         """Get current min and max prices"""
-        if not self.registry.exists(symbol):
+        symbol_data = self.registry.get_symbol_data(symbol)
+        if symbol_data is None:
             return (None, None)
-        extremes = self.registry.get_symbol_data(symbol)["extremes"]
+        return self._read(symbol_data, self._min_max)
+
+    @staticmethod
+    def _min_max(symbol_data):
+        extremes = symbol_data["extremes"]
         return (extremes.get_min(), extremes.get_max())
 
+    @staticmethod
+    def _time_window_stats(window) -> dict:
+        return {
+            "count": len(window),
+            "sum": window.get_sum(),
+            "avg": window.get_average(),
+            "min": window.get_min(),
+            "max": window.get_max(),
+            "truncated": False,
+        }
+
+    def get_window_stats(self, symbol: str, seconds: float, now: float = None) -> dict:
+        """
+        Count/sum/avg/min/max of the ticks in the last `seconds` before now, or before the
+        newest tick when now is None (windows only move when the symbol ticks, so pass
+        now = time.time() to age out a quiet symbol). Configured time_windows answer in
+        O(1) unless some of their ticks have aged out by now; other spans binary-search
+        the buffer timestamps and are truncated to what the buffer still holds.
+        """
+        symbol_data = self.registry.get_symbol_data(symbol)
+        if symbol_data is None:
+            return None
+        return self._read(symbol_data, lambda data: self._window_stats(data, seconds, now))
+
+    @classmethod
+    def _window_stats(cls, symbol_data, seconds, now) -> dict:
+        window = symbol_data["time_windows"].get(seconds)
+        # readers never evict, so a configured window only answers if none of its ticks expired by now
+        if window is not None and (now is None or not window.window or window.window[0][0] > now - seconds):
+            return cls._time_window_stats(window)
+        return cls._buffer_window_stats(symbol_data["buffer"], seconds, now)
+
+    @staticmethod
+    def _buffer_window_stats(buffer, seconds, now=None) -> dict:
+        empty = {"count": 0, "sum": 0.0, "avg": 0, "min": None, "max": None, "truncated": False}
+        latest = buffer.latest()
+        if latest is None:
+            return empty
+        cutoff = (latest[1] if now is None else now) - seconds
+        if hasattr(buffer, "count_after"):
+            n = buffer.count_after(cutoff)
+            prices = buffer.newest_prices(n)
+        else:
+            prices = [p for p, ts in buffer.get_all() if ts > cutoff]
+            n = len(prices)
+        if n == 0:
+            return empty
+        total = float(np.sum(prices))
+        return {
+            "count": n,
+            "sum": total,
+            "avg": total / n,
+            "min": float(np.min(prices)),
+            "max": float(np.max(prices)),
+            "truncated": n == len(buffer) and len(buffer) == buffer.capacity,
+        }
+
+    def get_bars(self, symbol: str, resolution: float, n: int = None) -> dict:
+        """Newest n OHLCV bars of a configured resolution, oldest first, as column arrays"""
+        symbol_data = self.registry.get_symbol_data(symbol)
+        if symbol_data is None or resolution not in symbol_data["bars"]:
+            return None
+        return self._read(symbol_data, lambda data: data["bars"][resolution].get_bars(n))
+
+    def get_quantiles(self, symbol: str, qs=(0.5, 0.95, 0.99), rolling: bool = False) -> dict:
+        """
+        Estimated price quantiles {q: price} from the symbol's t-digest: all-time, or over
+        about the last window_size prices when rolling. Needs quantiles=True.
+        """
+        digest = self.get_digest(symbol, rolling)
+        if digest is None:
+            return None
+        return dict(zip(qs, digest.quantiles(qs)))
+
+    def get_digest(self, symbol: str, rolling: bool = False):
+        """Copy of the symbol's t-digest; digests merge, e.g. to combine partitions or symbols"""
+        symbol_data = self.registry.get_symbol_data(symbol)
+        if symbol_data is None or symbol_data["digest"] is None:
+            return None
+        if rolling:
+            return self._read(symbol_data, lambda data: data["rolling_digest"].digest())
+        return self._read(symbol_data, lambda data: data["digest"].copy())
+
+    def add_indicator(self, spec: str, symbol: str = None):
+        """
+        Attach an indicator (e.g. "ema:20", "rsi:14", "macd:12,26,9", "bollinger:20,2", "vwap")
+        to one symbol, seeded from its buffered history. With symbol None the spec is offered
+        for every symbol instead and each symbol attaches it on its first indicator read, so
+        symbols nobody queries pay nothing per tick.
+        """
+        indicators.create(spec)  # fail early on a bad spec
+        if symbol is None:
+            if spec not in self.registry.indicator_specs:
+                self.registry.indicator_specs.append(spec)
+            return
+        specs = self.registry.symbol_indicators.setdefault(symbol, [])
+        if spec not in specs:
+            specs.append(spec)
+        symbol_data = self.registry.get_symbol_data(symbol)
+        if symbol_data is not None:
+            self._attach_indicator(symbol_data, spec)
+
+    def remove_indicator(self, spec: str, symbol: str = None):
+        """Stop updating an indicator for one symbol, or everywhere when symbol is None"""
+        if symbol is None:
+            if spec in self.registry.indicator_specs:
+                self.registry.indicator_specs.remove(spec)
+            for specs in self.registry.symbol_indicators.values():
+                if spec in specs:
+                    specs.remove(spec)
+            targets = self.registry.by_id
+        else:
+            specs = self.registry.symbol_indicators.get(symbol, [])
+            if spec in specs:
+                specs.remove(spec)
+            symbol_data = self.registry.get_symbol_data(symbol)
+            targets = [symbol_data] if symbol_data is not None else []
+        with self._indicator_lock:
+            for symbol_data in targets:
+                if spec in symbol_data["indicators"]:
+                    symbol_data["indicators"] = {s: ind for s, ind in symbol_data["indicators"].items() if s != spec}
+
+    def _attach_indicator(self, symbol_data, spec: str):
+        """
+        Attach an indicator seeded from the buffer without stalling ingest. A PendingIndicator
+        is published first (by swapping in a new dict, so the writer never sees the dict change
+        under it) and collects ticks while the seed is built from a seqlock snapshot; ticks the
+        snapshot already holds are skipped by ordinal (stats.count) when it resolves.
+        """
+        with self._indicator_lock:
+            current = symbol_data["indicators"].get(spec)
+            if current is not None and not isinstance(current, indicators.PendingIndicator):
+                return current
+            indicator = indicators.create(spec)  # a bad spec raises before anything is published
+            pending = indicators.PendingIndicator(spec, lambda: symbol_data["stats"].count)
+            symbol_data["indicators"] = {**symbol_data["indicators"], spec: pending}
+
+            try:
+                (prices, timestamps), seeded_through = self._read(
+                    symbol_data, lambda data: (self._history(data), data["stats"].count))
+                prices = np.asarray(prices, dtype=np.float64).tolist()
+                indicator.extend(prices, [0] * len(prices), np.asarray(timestamps, dtype=np.float64).tolist())  # per-tick volume is not buffered
+            except Exception:
+                # drop the stand-in so it does not queue ticks forever
+                symbol_data["indicators"] = {s: ind for s, ind in symbol_data["indicators"].items() if s != spec}
+                raise
+            pending.resolve(indicator, seeded_through)
+            # swap the real indicator in; a writer still holding the stand-in is forwarded to it
+            symbol_data["indicators"] = {**symbol_data["indicators"], spec: indicator}
+            return indicator
+
+    def get_indicator(self, symbol: str, spec: str):
+        """
+        Current value of an indicator for a symbol: a float, a dict for multi-line
+        indicators, or None while warming up. An indicator not yet attached to the
+        symbol (including global specs) is attached on first use, seeded from the
+        buffered prices.
+        """
+        symbol_data = self.registry.get_symbol_data(symbol)
+        if symbol_data is None:
+            return None
+        self._ensure_indicator(symbol_data, spec)
+        return self._read(symbol_data, lambda data: data["indicators"][spec].value())
+
+    def _ensure_indicator(self, symbol_data, spec: str):
+        current = symbol_data["indicators"].get(spec)
+        if current is None or isinstance(current, indicators.PendingIndicator):
+            self._attach_indicator(symbol_data, spec)
+
+    def get_indicators(self, symbol: str) -> dict:
+        """Values of the global indicator specs plus any others attached to a symbol, by spec"""
+        symbol_data = self.registry.get_symbol_data(symbol)
+        if symbol_data is None:
+            return None
+        for spec in tuple(self.registry.indicator_specs):
+            self._ensure_indicator(symbol_data, spec)
+        return self._read(symbol_data, lambda data: {spec: indicator.value()
+                                                     for spec, indicator in data["indicators"].items()})
+
+    def track_correlation(self, *symbols: str):
+        """Add symbols to the correlation set; each joins at the next ingested tick (safe from any thread)"""
+        if self.correlations is None:
+            tracker = correlation.RollingCorrelation(self.correlation_window, self.correlation_interval)
+            for symbol in symbols:
+                tracker.add(symbol)
+            self.correlations = tracker
+            return
+        for symbol in symbols:
+            self.correlations.request(symbol)
+
+    def top_correlated(self, symbol: str, k: int = 5, absolute: bool = False) -> list:
+        """
+        Up to k (symbol, correlation) tracked symbols whose sampled returns move most like
+        symbol's over the last correlation_window samples, strongest first; absolute ranks
+        by |correlation| to include inverse pairs. O(m) for m tracked symbols.
+        """
+        tracker = self.correlations
+        col = tracker.columns.get(symbol) if tracker is not None else None
+        if col is None:
+            return []
+        keys = tracker.keys
+        return [(keys[other], corr) for other, corr in tracker.top(col, k, absolute)]
+
+    def get_correlation_matrix(self):
+        """(symbols, correlation matrix) of the tracked set, or None before two samples"""
+        tracker = self.correlations
+        if tracker is None:
+            return None
+        keys = list(tracker.keys)
+        matrix = tracker.correlation()
+        if matrix is None:
+            return None
+        m = min(len(keys), len(matrix))
+        return keys[:m], matrix[:m, :m]
+
+    def get_downsampled_history(self, symbol: str, width: int = 500, n: int = None, method: str = "lttb",
+                                resolution: float = None):
+        """
+        (timestamps, prices) of the newest n buffered ticks reduced to about width points
+        for charting ("lttb" keeps shape, "minmax" keeps every spike). With resolution,
+        the closes of that configured bar series are used instead, for longer history.
+        """
+        reducer = downsample.METHODS.get(method)
+        if reducer is None:
+            raise ValueError(f"unknown downsampling method: {method}")
+        if resolution is not None:
+            bars = self.get_bars(symbol, resolution, n)
+            if bars is None:
+                return None
+            return reducer(bars["time"], bars["close"], width)
+        symbol_data = self.registry.get_symbol_data(symbol)
+        if symbol_data is None:
+            return None
+        prices, timestamps = self._read(symbol_data, self._history)
+        if n is not None:
+            start = max(len(prices) - n, 0)
+            prices, timestamps = prices[start:], timestamps[start:]
+        return reducer(timestamps, prices, width)
+
+    def get_price_history(self, symbol: str, n: int = None):
+        """
+        n newest prices oldest first (numpy view for columnar buffers). The view's bounds
+        come from a seqlock read; its contents are overwritten once the buffer wraps past them.
+        """
+        symbol_data = self.registry.get_symbol_data(symbol)
+        if symbol_data is None:
+            return None
+        return self._read(symbol_data, lambda data: self._newest_prices(data["buffer"], n))
+
+    @staticmethod
+    def _newest_prices(buffer, n):
+        if hasattr(buffer, "newest_prices"):
+            return buffer.newest_prices(n)
+        points = buffer.return_n_newest(len(buffer) if n is None else n)
+        return [point[0] for point in reversed(points)]
+
+    @staticmethod
+    def _history(symbol_data):
+        """Copies of the buffered prices and timestamps, oldest first"""
+        buffer = symbol_data["buffer"]
+        if hasattr(buffer, "newest_prices"):
+            return buffer.newest_prices().copy(), buffer.newest_timestamps().copy()
+        points = buffer.get_all()
+        return [p[0] for p in points], [p[1] for p in points]
+
+    @classmethod
+    def _copy_state(cls, symbol_data) -> dict:
+        stats = symbol_data["stats"]
+        extremes = symbol_data["extremes"]
+        prices, timestamps = cls._history(symbol_data)
+        return {
+            "seq": symbol_data["seq"],
+            "prices": prices,
+            "timestamps": timestamps,
+            "window": stats.get_values(),
+            "avg": stats.get_average(),
+            "window_min": stats.get_min(),
+            "window_max": stats.get_max(),
+            "min": extremes.get_min(),
+            "max": extremes.get_max(),
+        }
+
+    def get_symbol_snapshot(self, symbol: str) -> dict:
+        """Point-in-time copy of a symbol's history, window and extremes"""
+        symbol_data = self.registry.get_symbol_data(symbol)
+        if symbol_data is None:
+            return None
+        return self._read(symbol_data, self._copy_state)
+
+    def get_read_stats(self) -> Dict[str, float]:
+        """Reader contention: how often snapshot reads had to retry"""
+        return {
+            "snapshot_reads": self.snapshot_reads,
+            "read_retries": self.read_retries,
+            "retry_rate": self.read_retries / self.snapshot_reads if self.snapshot_reads else 0,
+        }
+
+    def get_metrics(self) -> dict:
+        """
+        Ingest throughput plus, when instrumented, latency percentiles (microseconds)
+        per tick, per ingest stage, per batch and per query method.
+        """
+        result = {
+            "instrumented": self.metrics is not None,
+            "total_points": self.total_points,
+            "total_time": self.total_time,
+            "points_per_second": self.total_points / self.total_time if self.total_time else 0,
+            "symbols": len(self.registry),
+            "reads": self.get_read_stats(),
+            "events": self.events.get_stats(),
+        }
+        if self.metrics is not None:
+            result.update(self.metrics.snapshot())
+        return result
+
+    def hottest_symbols(self, k: int = 10) -> list:
+        """
+        Up to k (symbol, ticks per second, error bound) busiest symbols, heaviest first.
+        Rates decay with rate_half_life and are measured at the newest tick's timestamp;
+        a symbol's true rate lies within error bound below its estimate.
+        """
+        if self.tick_rates is None:
+            return []
+        names = self.registry.names
+        return [(names[symbol_id], rate, error) for symbol_id, rate, error in self.tick_rates.top(k)]
+
+    def suggest_buffer_sizes(self, seconds: float, k: int = None, minimum: int = None, maximum: int = 100000) -> dict:
+        """
+        Buffer capacity per hot symbol that holds `seconds` of ticks at its current rate,
+        never below the configured buffer_size. Pass the result as buffer_sizes= on the next start.
+        """
+        if self.tick_rates is None:
+            return {}
+        minimum = self.registry.buffer_size if minimum is None else minimum
+        hot = self.hottest_symbols(len(self.tick_rates) if k is None else k)
+        return {symbol: min(maximum, max(minimum, int(rate * seconds) + 1)) for symbol, rate, _ in hot}
+
     def list_symbols(self) -> List[str]:
         """Return all currently registered symbols"""
         return self.registry.all_symbols()
 
     def symbols_above_price(self, threshold: float):
-        """Return all symbols where latest price is above threshold"""
-        result = []
-        for symbol in self.list_symbols():
-            price = self.get_latest_price(symbol)
-            if price is not None and price > threshold:
-                result.append((symbol, price))
-        return result
+        """Return all symbols where latest price is above threshold, O(log n + k)"""
+        names = self.registry.names
+        return [(names[symbol_id], price) for price, symbol_id in self.price_index.above(threshold)]
 
     def symbols_below_price(self, threshold: float):
-        """Return all symbols where latest price is below threshold"""
+        """Return all symbols where latest price is below threshold, O(log n + k)"""
+        names = self.registry.names
+        return [(names[symbol_id], price) for price, symbol_id in self.price_index.below(threshold)]
+
+    def symbols_in_price_range(self, low: float, high: float):
+        """Return all symbols with low <= latest price <= high, O(log n + k)"""
+        names = self.registry.names
+        return [(names[symbol_id], price) for price, symbol_id in self.price_index.range(low, high)]
+
+    def _with_average(self, pairs):
+        names, by_id = self.registry.names, self.registry.by_id
         result = []
-        for symbol in self.list_symbols():
-            price = self.get_latest_price(symbol)
-            if price is not None and price < threshold:
-                result.append((symbol, price))
+        for deviation, symbol_id in pairs:
+            result.append((names[symbol_id], self.price_index.get(symbol_id),
+                           self._read(by_id[symbol_id], lambda data: data["stats"].get_average())))
         return result
 
     def symbols_above_average(self):
         """Return all symbols where latest price > rolling average"""
-        result = []
-        for symbol in self.list_symbols():
-            price = self.get_latest_price(symbol)
-            avg = self.get_rolling_average(symbol)
-            if price is not None and avg is not None and price > avg:
-                result.append((symbol, price, avg))
-        return result
+        self._refresh_rankings()
+        return self._with_average(self.deviation_index.above(0.0))
+
+    def symbols_below_average(self):
+        """Return all symbols where latest price < rolling average"""
+        self._refresh_rankings()
+        return self._with_average(self.deviation_index.below(0.0))
+
+    def _leaders(self, pairs) -> list:
+        names = self.registry.names
+        return [(names[symbol_id], value, self.price_index.get(symbol_id)) for value, symbol_id in pairs]
+
+    def top_gainers(self, k: int = 10) -> list:
+        """Up to k (symbol, % change since session open, price) with the largest gains, O(k + changed)"""
+        self._refresh_rankings()
+        return self._leaders([p for p in self.change_index.largest(k) if p[0] > 0])
+
+    def top_losers(self, k: int = 10) -> list:
+        """Up to k (symbol, % change since session open, price) with the largest losses, O(k + changed)"""
+        self._refresh_rankings()
+        return self._leaders([p for p in self.change_index.smallest(k) if p[0] < 0])
+
+    def top_above_average(self, k: int = 10) -> list:
+        """Up to k (symbol, % above rolling average, price) furthest above their average, O(k + changed)"""
+        self._refresh_rankings()
+        return self._leaders([p for p in self.deviation_index.largest(k) if p[0] > 0])
+
+    def top_below_average(self, k: int = 10) -> list:
+        """Up to k (symbol, % from rolling average, price) furthest below their average, O(k + changed)"""
+        self._refresh_rankings()
+        return self._leaders([p for p in self.deviation_index.smallest(k) if p[0] < 0])
+
+    def widest_ranges(self, k: int = 10) -> list:
+        """Up to k (symbol, rolling window range as % of average, price) with the widest ranges, O(k + changed)"""
+        self._refresh_rankings()
+        return self._leaders(self.range_index.largest(k))
+
+    def _changed_ids_since(self, version: int) -> list:
+        """Ids written after version, oldest write first; walks only the changed tail of the log"""
+        while True:
+            try:
+                ids = []
+                for symbol_id, symbol_version in reversed(self._change_log.items()):
+                    if symbol_version <= version:
+                        break
+                    ids.append(symbol_id)
+                ids.reverse()
+                return ids
+            except RuntimeError: # log mutated by a concurrent ingest, walk again
+                self.read_retries += 1
+
+    def get_changes_since(self, version: int = 0) -> dict:
+        """
+        Summaries of symbols updated after version, plus the version to pass next time.
+        Every write up to the returned version is included; later ones may be too and
+        are then sent again by the next call.
+        """
+        current = self.version  # read before the log walk; see _mark_changed
+        names, by_id = self.registry.names, self.registry.by_id
+        changes = {}
+        for symbol_id in self._changed_ids_since(version):
+            changes[names[symbol_id]] = self._read(by_id[symbol_id], self._summary)
+        return {"version": current, "changes": changes}
 
     def get_all_data(self) -> dict:
-        """Get complete snapshot of all symbol data"""
-        snapshot = {}
-        for symbol in self.list_symbols():
-            snapshot[symbol] = {
-                "latest": self.get_latest_price(symbol),
-                "avg": self.get_rolling_average(symbol),
-                "min": self.get_min_max(symbol)[0],
-                "max": self.get_min_max(symbol)[1]
-            }
-        return snapshot
+        """
+        Get complete snapshot of all symbol data, refreshing only symbols changed since the last call.
+        The returned dict is shared between callers and must not be modified. Changed symbols get a
+        new summary dict swapped in, so a held summary never changes, but a held result sees later
+        summaries; the dict is only replaced when new symbols appear, so iterating it never fails.
+        """
+        with self._snapshot_lock:
+            delta = self.get_changes_since(self._snapshot_version)
+            changes, snapshot = delta["changes"], self._snapshot
+            if any(symbol not in snapshot for symbol in changes): # growing: publish a new dict, O(universe) once per new symbol
+                self._snapshot = {**snapshot, **changes}
+            else: # per-symbol copy on write, O(changed)
+                snapshot.update(changes)
+            self._snapshot_version = delta["version"]
+            return self._snapshot
+
+    @classmethod
+    def _summary(cls, symbol_data) -> dict:
+        extremes = symbol_data["extremes"]
+        return {
+            "latest": cls._latest(symbol_data),
+            "avg": symbol_data["stats"].get_average(),
+            "min": extremes.get_min(),
+            "max": extremes.get_max()
+        }
 
 
 class EventProcessor:
-    def __init__(self):
+    """
+    Priority queue of events plus a dispatcher that hands batches to registered
+    handlers on a thread pool. An event added with a key that is still queued is
+    coalesced into the queued one instead of being queued twice.
+    """
+    def __init__(self, max_workers: int = 4, batch_size: int = 64):
         self.queue = priority_queue.PriorityQueue()  # custom priority queue
+        self.handlers = []
+        self.max_workers = max_workers
+        self.batch_size = batch_size
+        self.lock = threading.Lock()
+        self.not_empty = threading.Condition(self.lock)
+        self.pool = None
+        self.thread = None
+        self.running = False
+        self.coalesced = 0
+        self.dispatched = 0
+        self.handler_errors = 0
+
+    def add_handler(self, handler):
+        """handler(event) is called from pool threads, so it must be thread-safe"""
+        self.handlers.append(handler)
+
+    def _coalesce(self, priority, action, key) -> bool:
+        if key is None or key not in self.queue:
+            return False
+        old_priority, _ = self.queue.get(key)
+        self.queue.update(key, min(priority, old_priority), action)
+        self.coalesced += 1
+        return True
+
+    def add_event(self, priority: int, action, key=None):
+        with self.lock:
+            if not self._coalesce(priority, action, key):
+                self.queue.push(priority, action, key)
+            self.not_empty.notify()
+
+    def add_events(self, events):
+        """Queue many (priority, action) or (priority, action, key) events at once"""
+        with self.lock:
+            fresh = {}
+            for event in events:
+                priority, action, key = event if len(event) == 3 else (event[0], event[1], None)
+                if self._coalesce(priority, action, key):
+                    continue
+                if key is not None and key in fresh: # repeated within this batch
+                    priority = min(priority, fresh[key][0])
+                    self.coalesced += 1
+                fresh[key if key is not None else object()] = (priority, action, key)
+            if len(fresh) > len(self.queue): # bulk heapify beats n pushes here
+                self.queue.push_many(fresh.values())
+            else:
+                for entry in fresh.values():
+                    self.queue.push(*entry)
+            self.not_empty.notify()
+
+    def cancel(self, key):
+        with self.lock:
+            return self.queue.cancel(key)
+
+    def _take(self, limit: int) -> list:
+        batch = []
+        while len(batch) < limit and not self.queue.is_empty():
+            batch.append(self.queue.pop())
+        return batch
 
-    def add_event(self, priority: int, action: str):
-        self.queue.push(priority, action)
+    def _deliver(self, handler, batch):
+        """Runs on pool threads; counters are only changed under self.lock"""
+        for event in batch:
+            try:
+                handler(event)
+            except Exception:
+                with self.lock:
+                    self.handler_errors += 1
+                logger.exception("Event handler %r failed on %r", handler, event)
+
+    def _deliver_all(self, batch):
+        if not self.handlers:
+            for event in batch:
+                print(f"[ALERT] {event}")
+        for handler in self.handlers:
+            self._deliver(handler, batch)
 
     def process_next(self):
-        if not self.queue.is_empty():
-            event = self.queue.pop() 
-            print(f"[ALERT] {event}")
-            return event
+        """Pop and handle one event on the caller's thread"""
+        with self.lock:
+            batch = self._take(1)
+            self.dispatched += len(batch)
+        if batch:
+            self._deliver_all(batch)
+            return batch[0]
         return None
 
     def process_all(self):
-        while not self.queue.is_empty():
-            self.process_next()
+        while self.process_next() is not None:
+            pass
+
+    def dispatch_batch(self) -> list:
+        """Pop up to batch_size events and submit them to the pool, one task per handler"""
+        with self.lock:
+            batch = self._take(self.batch_size)
+            self.dispatched += len(batch)
+        if not batch:
+            return []
+        if self.pool is None:
+            self.pool = ThreadPoolExecutor(max_workers=self.max_workers)
+        if not self.handlers:
+            return [self.pool.submit(self._deliver, lambda event: print(f"[ALERT] {event}"), batch)]
+        return [self.pool.submit(self._deliver, handler, batch) for handler in self.handlers]
+
+    def _run(self):
+        while True:
+            with self.not_empty:
+                while self.running and self.queue.is_empty():
+                    self.not_empty.wait(timeout=0.5)
+                if not self.running and self.queue.is_empty():
+                    return
+            self.dispatch_batch()
+
+    def start(self):
+        """Start the background dispatcher thread"""
+        if not self.running:
+            self.running = True
+            if self.pool is None:
+                self.pool = ThreadPoolExecutor(max_workers=self.max_workers)
+            self.thread = threading.Thread(target=self._run, daemon=True)
+            self.thread.start()
+
+    def stop(self, wait: bool = True):
+        """Stop after the queue drains; waits for in-flight handlers when wait is set"""
+        with self.not_empty:
+            self.running = False
+            self.not_empty.notify_all()
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+        if self.pool is not None:
+            self.pool.shutdown(wait=wait)
+            self.pool = None
+
+    def get_stats(self) -> Dict[str, int]:
+        with self.lock:
+            return {
+                "queued": len(self.queue),
+                "dispatched": self.dispatched,
+                "coalesced": self.coalesced,
+                "handler_errors": self.handler_errors,
+            }
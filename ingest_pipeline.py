@@ -0,0 +1,252 @@
+import asyncio
+import time
+from collections import deque
+from typing import Dict
+
+BLOCK = "block"
+DROP_OLDEST = "drop_oldest"
+CONFLATE = "conflate"
+
+class SourceQueue:
+    """
+    Bounded tick queue for one producer. Overload policies:
+      - block:       when full, put() waits for space
+      - drop_oldest: when full, the oldest queued tick is discarded
+      - conflate:    a tick for a symbol already queued always overwrites it in place
+                     (latest price, summed volume), so at most one tick per symbol waits;
+                     when full with a new symbol, the oldest queued tick is discarded
+    """
+
+    def __init__(self, name: str, capacity: int, policy: str = BLOCK):
+        if policy not in (BLOCK, DROP_OLDEST, CONFLATE):
+            raise ValueError(f"unknown overload policy: {policy}")
+        self.name = name
+        self.capacity = capacity
+        self.policy = policy
+        self.items = deque()    # [symbol, price, volume, timestamp] lists
+        self.pending = {}       # symbol -> newest queued entry (conflate mode)
+        self.not_full = asyncio.Event()
+        self.not_full.set()
+        self.on_put = None      # set by the pipeline to wake the consumer
+        self.received = 0
+        self.dropped = 0
+        self.conflated = 0
+        self.max_depth = 0
+
+    def _drop_oldest(self):
+        entry = self.items.popleft()
+        if self.pending.get(entry[0]) is entry:
+            del self.pending[entry[0]]
+        self.dropped += 1
+
+    def put_nowait(self, symbol: str, price: float, volume: int = 0, timestamp: float = None) -> bool:
+        """Queue a tick without waiting; False if it was rejected (block policy, queue full)"""
+        if timestamp is None:
+            timestamp = time.time()
+        self.received += 1
+
+        if self.policy == CONFLATE:
+            entry = self.pending.get(symbol)
+            if entry is not None:
+                entry[1], entry[2], entry[3] = price, entry[2] + volume, timestamp
+                self.conflated += 1
+                return True
+
+        if len(self.items) >= self.capacity:
+            if self.policy == BLOCK:
+                self.received -= 1
+                return False
+            self._drop_oldest()
+
+        entry = [symbol, price, volume, timestamp]
+        self.items.append(entry)
+        if self.policy == CONFLATE:
+            self.pending[symbol] = entry
+        if len(self.items) > self.max_depth:
+            self.max_depth = len(self.items)
+        if len(self.items) >= self.capacity:
+            self.not_full.clear()
+        if self.on_put:
+            self.on_put()
+        return True
+
+    async def put(self, symbol: str, price: float, volume: int = 0, timestamp: float = None):
+        """Queue a tick, waiting for space under the block policy"""
+        while not self.put_nowait(symbol, price, volume, timestamp):
+            await self.not_full.wait()
+
+    def drain(self, limit: int, out) -> int:
+        """Move up to limit ticks into the out column lists"""
+        taken = 0
+        while self.items and taken < limit:
+            entry = self.items.popleft()
+            if self.pending.get(entry[0]) is entry:
+                del self.pending[entry[0]]
+            for column, value in zip(out, entry):
+                column.append(value)
+            taken += 1
+        if taken:
+            self.not_full.set()
+        return taken
+
+    def __len__(self):
+        return len(self.items)
+
+
+class AsyncIngestPipeline:
+    """
+    Asyncio front end for RealTimeDataEngine. Producers write to per-source bounded
+    queues; one consumer task drains them round-robin in micro-batches of up to
+    batch_size ticks or batch_interval_us microseconds and calls engine.ingest_batch.
+    """
+
+    def __init__(self, engine, queue_capacity=10000, batch_size=512, batch_interval_us=1000, policy=BLOCK):
+        self.engine = engine
+        self.queue_capacity = queue_capacity
+        self.batch_size = batch_size
+        self.batch_interval = batch_interval_us / 1e6
+        self.policy = policy
+        self.sources: Dict[str, SourceQueue] = {}
+        self._data_ready = None
+        self._loop = None
+        self._task = None
+        self._running = False
+        self.batches = 0
+        self.ticks_ingested = 0
+        self.last_batch_size = 0
+        self.last_batch_time = 0.0
+
+    def add_source(self, name: str, capacity: int = None, policy: str = None) -> SourceQueue:
+        """Create (or return) the bounded queue for a producer"""
+        source = self.sources.get(name)
+        if source is None:
+            source = SourceQueue(name, capacity or self.queue_capacity, policy or self.policy)
+            source.on_put = self._wake
+            self.sources[name] = source
+        return source
+
+    def _wake(self):
+        if self._data_ready is not None:
+            self._data_ready.set()
+
+    def queued(self) -> int:
+        return sum(len(source) for source in self.sources.values())
+
+    def _drain(self, out, limit: int) -> int:
+        """Round-robin across sources so one busy feed cannot starve the rest"""
+        total = 0
+        sources = [source for source in self.sources.values() if source.items]
+        while sources and total < limit:
+            share = max(1, (limit - total) // len(sources))
+            for source in sources:
+                total += source.drain(min(share, limit - total), out)
+                if total >= limit:
+                    break
+            sources = [source for source in sources if source.items]
+        return total
+
+    async def _collect(self, out):
+        """
+        Wait for the first tick, then keep draining into out until the batch fills or the
+        interval ends. out belongs to the caller so a cancelled wait does not lose ticks
+        already taken off the queues.
+        """
+        loop = asyncio.get_running_loop()
+        while not self.queued():
+            self._data_ready.clear()
+            await self._data_ready.wait()
+        deadline = loop.time() + self.batch_interval
+        count = self._drain(out, self.batch_size)
+        while count < self.batch_size:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            self._data_ready.clear()
+            try:
+                await asyncio.wait_for(self._data_ready.wait(), remaining)
+            except asyncio.TimeoutError:
+                break
+            count += self._drain(out, self.batch_size - count)
+
+    def _ingest(self, out):
+        start = time.perf_counter()
+        self.engine.ingest_batch(*out)
+        self.last_batch_time = time.perf_counter() - start
+        self.last_batch_size = len(out[0])
+        self.batches += 1
+        self.ticks_ingested += len(out[0])
+
+    async def run(self):
+        """Consumer loop; runs until stop() and flushes what is left"""
+        self._data_ready = asyncio.Event()
+        self._running = True
+        out = ([], [], [], [])
+        try:
+            while self._running:
+                await self._collect(out)
+                batch, out = out, ([], [], [], [])
+                if batch[0]:
+                    self._ingest(batch)
+        finally:
+            if out[0]:
+                self._ingest(out)
+            self.flush()
+
+    def start(self) -> asyncio.Task:
+        """Schedule the consumer on the running loop"""
+        self._loop = asyncio.get_running_loop()
+        self._task = self._loop.create_task(self.run())
+        return self._task
+
+    def put_threadsafe(self, source_name: str, symbol: str, price: float, volume: int = 0, timestamp: float = None):
+        """
+        Hand a tick over from a non-asyncio thread (e.g. a simulator thread). Under the
+        block policy the calling thread waits until the tick is queued; never call it
+        from the loop's own thread.
+        """
+        if timestamp is None:
+            timestamp = time.time()
+        source = self.sources[source_name]
+        if source.policy == BLOCK:
+            asyncio.run_coroutine_threadsafe(source.put(symbol, price, volume, timestamp), self._loop).result()
+        else:
+            self._loop.call_soon_threadsafe(source.put_nowait, symbol, price, volume, timestamp)
+
+    async def stop(self):
+        self._running = False
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def flush(self):
+        """Synchronously ingest everything still queued"""
+        while self.queued():
+            out = ([], [], [], [])
+            self._drain(out, self.batch_size)
+            self._ingest(out)
+
+    def get_metrics(self) -> dict:
+        return {
+            "queued": self.queued(),
+            "batches": self.batches,
+            "ticks_ingested": self.ticks_ingested,
+            "avg_batch_size": self.ticks_ingested / self.batches if self.batches else 0,
+            "last_batch_size": self.last_batch_size,
+            "last_batch_time": self.last_batch_time,
+            "sources": {
+                name: {
+                    "depth": len(source),
+                    "max_depth": source.max_depth,
+                    "capacity": source.capacity,
+                    "policy": source.policy,
+                    "received": source.received,
+                    "dropped": source.dropped,
+                    "conflated": source.conflated,
+                }
+                for name, source in self.sources.items()
+            },
+        }
@@ -0,0 +1,125 @@
+import argparse
+import time
+import numpy as np
+import pandas as pd
+from data_engine import RealTimeDataEngine
+from stockAppFns import tick_log
+
+"""Stream historical ticks into RealTimeDataEngine in chunks, for backtests and warm-up"""
+
+def iter_csv(path: str, chunk_size: int = 100000, symbol_col="symbol", price_col="price",
+             volume_col="volume", timestamp_col="timestamp"):
+    """
+    Yield (symbols, prices, volumes, timestamps) arrays from a multi-symbol CSV without loading it whole.
+    Timestamps may be unix seconds or anything pd.to_datetime parses; volume is optional.
+    """
+    header = pd.read_csv(path, nrows=0).columns
+    usecols = [c for c in (symbol_col, price_col, volume_col, timestamp_col) if c in header]
+    reader = pd.read_csv(path, chunksize=chunk_size, usecols=usecols,
+                         dtype={symbol_col: str, price_col: np.float64})
+    for chunk in reader:
+        n = len(chunk)
+        volumes = chunk[volume_col].to_numpy(np.float64) if volume_col in chunk else np.zeros(n)
+        if timestamp_col not in chunk:
+            timestamps = np.full(n, time.time())
+        elif pd.api.types.is_numeric_dtype(chunk[timestamp_col]):
+            timestamps = chunk[timestamp_col].to_numpy(np.float64)
+        else:
+            # via a timedelta: the parsed resolution (s, us, ns) varies with the pandas version and input
+            parsed = pd.to_datetime(chunk[timestamp_col], utc=True)
+            timestamps = (parsed - pd.Timestamp(0, tz="UTC")).dt.total_seconds().to_numpy()
+        yield chunk[symbol_col].to_numpy(), chunk[price_col].to_numpy(np.float64), volumes, timestamps
+
+def iter_records(path: str, chunk_size: int = 100000):
+    """Yield chunks from a .npy structured array with symbol, price, volume and timestamp fields (memory-mapped)"""
+    records = np.load(path, mmap_mode="r")
+    for i in range(0, len(records), chunk_size):
+        chunk = records[i:i + chunk_size]
+        yield chunk["symbol"], chunk["price"], chunk["volume"], chunk["timestamp"]
+
+def iter_tick_log(directory: str, chunk_size: int = 100000):
+    """Yield chunks from an engine tick log directory (see stockAppFns/tick_log.py)"""
+    names = np.array(tick_log.read_symbols(directory))
+    records = tick_log.read_ticks(directory)
+    for i in range(0, len(records), chunk_size):
+        chunk = records[i:i + chunk_size]
+        yield names[chunk["id"]], chunk["price"], chunk["volume"], chunk["timestamp"]
+
+class ReplayDriver:
+    """
+    Feeds tick chunks to engine.ingest_batch. speed=None replays as fast as possible;
+    otherwise ticks are released at speed x their recorded pace (timestamps must ascend).
+    """
+
+    def __init__(self, engine, speed: float = None, report_every: float = None):
+        self.engine = engine
+        self.speed = speed
+        self.report_every = report_every  # seconds between progress prints
+        self.ticks = 0
+        self.chunks = 0
+        self.elapsed = 0.0
+
+    def _paced(self, symbols, prices, volumes, timestamps, clock):
+        """Ingest a chunk in slices as the scaled replay clock reaches each tick"""
+        wall_start, first_ts = clock
+        i, n = 0, len(prices)
+        while i < n:
+            horizon = first_ts + (time.perf_counter() - wall_start) * self.speed
+            j = int(np.searchsorted(timestamps, horizon, side="right"))
+            if j > i:
+                self.engine.ingest_batch(symbols[i:j], prices[i:j], volumes[i:j], timestamps[i:j])
+                i = j
+            else:
+                time.sleep(max(0.0, (timestamps[i] - first_ts) / self.speed - (time.perf_counter() - wall_start)))
+
+    def run(self, chunks) -> dict:
+        start = time.perf_counter()
+        last_report = start
+        clock = None
+        for symbols, prices, volumes, timestamps in chunks:
+            if self.speed:
+                if clock is None and len(timestamps):
+                    clock = (time.perf_counter(), float(timestamps[0]))
+                self._paced(symbols, prices, volumes, timestamps, clock)
+            else:
+                self.engine.ingest_batch(symbols, prices, volumes, timestamps)
+            self.ticks += len(prices)
+            self.chunks += 1
+
+            now = time.perf_counter()
+            if self.report_every and now - last_report >= self.report_every:
+                print(f"Replayed {self.ticks} ticks ({self.ticks / (now - start):.0f} ticks/sec)")
+                last_report = now
+
+        self.elapsed = time.perf_counter() - start
+        return self.get_stats()
+
+    def get_stats(self) -> dict:
+        return {
+            "ticks": self.ticks,
+            "chunks": self.chunks,
+            "seconds": self.elapsed,
+            "ticks_per_second": self.ticks / self.elapsed if self.elapsed else 0,
+        }
+
+def open_source(path: str, chunk_size: int):
+    if path.endswith(".npy"):
+        return iter_records(path, chunk_size)
+    if path.endswith(".csv"):
+        return iter_csv(path, chunk_size)
+    return iter_tick_log(path, chunk_size)
+
+if __name__=="__main__":
+    parser = argparse.ArgumentParser(description="Replay historical ticks through RealTimeDataEngine")
+    parser.add_argument("source", help="CSV file, .npy structured array, or tick log directory")
+    parser.add_argument("--speed", type=float, default=None, help="replay speed multiplier (default: as fast as possible)")
+    parser.add_argument("--chunk-size", type=int, default=100000)
+    parser.add_argument("--buffer-size", type=int, default=100)
+    parser.add_argument("--window-size", type=int, default=50)
+    args = parser.parse_args()
+
+    engine = RealTimeDataEngine(buffer_size=args.buffer_size, window_size=args.window_size)
+    driver = ReplayDriver(engine, speed=args.speed, report_every=5.0)
+    stats = driver.run(open_source(args.source, args.chunk_size))
+    print(f"Replayed {stats['ticks']} ticks for {len(engine.list_symbols())} symbols "
+          f"in {stats['seconds']:.2f}s ({stats['ticks_per_second']:.0f} ticks/sec)")
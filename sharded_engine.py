@@ -0,0 +1,274 @@
+import time
+import zlib
+import multiprocessing as mp
+from typing import List
+import numpy as np
+from data_engine import RealTimeDataEngine
+
+def shard_for(symbol: str, num_shards: int) -> int:
+    """Stable symbol -> shard mapping (builtin hash() is salted per process)"""
+    return zlib.crc32(symbol.encode()) % num_shards
+
+def balanced_placement(rates: dict, num_shards: int) -> dict:
+    """
+    Symbol -> shard assignment spreading tick rates evenly: heaviest symbol first onto
+    the least loaded shard. Feed it hottest_symbols() rates; unlisted symbols stay hashed.
+    """
+    loads = [0.0] * num_shards
+    placement = {}
+    for symbol, rate in sorted(rates.items(), key=lambda item: item[1], reverse=True):
+        shard = loads.index(min(loads))
+        placement[symbol] = shard
+        loads[shard] += rate
+    return placement
+
+def _shard_worker(conn, buffer_size, window_size, hot_symbols, quantiles):
+    """
+    Owns one RealTimeDataEngine; applies tick batches and answers query calls over a pipe.
+    Batches get no reply, so a failed chunk is kept and returned as the error of the next call.
+    """
+    engine = RealTimeDataEngine(buffer_size, window_size, hot_symbols=hot_symbols, quantiles=quantiles)
+    batch_error = None
+    while True:
+        msg = conn.recv()
+        kind = msg[0]
+        if kind == "batch":
+            for chunk in msg[1]:
+                try:
+                    engine.ingest_batch(*chunk)
+                except Exception as e:
+                    batch_error = batch_error or e  # report the first; later chunks still apply
+        elif kind == "call":
+            _, method, args = msg
+            if batch_error is not None:
+                conn.send((False, batch_error))
+                batch_error = None
+                continue
+            try:
+                conn.send((True, getattr(engine, method)(*args)))
+            except Exception as e:
+                conn.send((False, e))
+        elif kind == "stop":
+            conn.close()
+            return
+
+class ShardedDataEngine:
+    """
+    Partitions symbols across worker processes, each running its own RealTimeDataEngine.
+    Ticks are buffered per shard and shipped as batches; queries fan out and merge.
+    """
+
+    def __init__(self, num_shards=None, buffer_size=100, window_size=50, flush_size=1024, hot_symbols=128,
+                 placement=None, quantiles=False):
+        self.num_shards = num_shards or mp.cpu_count()
+        self.flush_size = flush_size
+        self._shard_cache = dict(placement or {})  # symbol -> shard index, seeded with pinned symbols
+        if any(not 0 <= shard < self.num_shards for shard in self._shard_cache.values()):
+            raise ValueError(f"placement shards must be in range(0, {self.num_shards})")
+        self._pending = [self._empty_batch() for _ in range(self.num_shards)]  # single ticks, column lists
+        self._chunks = [[] for _ in range(self.num_shards)]  # queued column chunks, in arrival order
+        self._queued = [0] * self.num_shards
+        self._conns = []
+        self._procs = []
+        for _ in range(self.num_shards):
+            parent_conn, child_conn = mp.Pipe()
+            proc = mp.Process(target=_shard_worker, args=(child_conn, buffer_size, window_size, hot_symbols, quantiles),
+                              daemon=True)
+            proc.start()
+            child_conn.close()
+            self._conns.append(parent_conn)
+            self._procs.append(proc)
+
+    @staticmethod
+    def _empty_batch():
+        return ([], [], [], [])
+
+    def _shard(self, symbol: str) -> int:
+        shard = self._shard_cache.get(symbol)
+        if shard is None:
+            shard = self._shard_cache[symbol] = shard_for(symbol, self.num_shards)
+        return shard
+
+    def ingest(self, symbol: str, price: float, volume: int = 0, timestamp: float = None):
+        """Queue one tick for its shard; shipped once flush_size ticks are pending"""
+        shard = self._shard(symbol)
+        batch = self._pending[shard]
+        batch[0].append(symbol)
+        batch[1].append(price)
+        batch[2].append(volume)
+        batch[3].append(time.time() if timestamp is None else timestamp)
+        self._queued[shard] += 1
+        if self._queued[shard] >= self.flush_size:
+            self._flush_shard(shard)
+
+    def ingest_batch(self, symbols, prices, volumes=None, timestamps=None):
+        """Split parallel arrays by shard and queue them"""
+        n = len(prices)
+        symbols = np.asarray(symbols)
+        prices = np.asarray(prices, dtype=np.float64)
+        volumes = np.zeros(n, dtype=np.int64) if volumes is None else np.asarray(volumes)
+        timestamps = np.full(n, time.time()) if timestamps is None else np.asarray(timestamps, dtype=np.float64)
+        if n == 0:
+            return
+
+        # route each distinct symbol once, then broadcast back to rows
+        uniq, inverse = np.unique(symbols, return_inverse=True)
+        if uniq.dtype.kind == "S": # bytes symbols route like their decoded names
+            uniq = np.char.decode(uniq, "utf-8")
+        shards = np.array([self._shard(str(s)) for s in uniq], dtype=np.int64)[inverse]
+
+        for shard in np.unique(shards).tolist():
+            rows = np.flatnonzero(shards == shard)
+            self._seal(shard)
+            self._chunks[shard].append((symbols[rows], prices[rows], volumes[rows], timestamps[rows]))
+            self._queued[shard] += len(rows)
+            if self._queued[shard] >= self.flush_size:
+                self._flush_shard(shard)
+
+    def _seal(self, shard: int):
+        """Move pending single ticks into the chunk list so ordering is kept"""
+        batch = self._pending[shard]
+        if batch[0]:
+            self._chunks[shard].append(batch)
+            self._pending[shard] = self._empty_batch()
+
+    def _flush_shard(self, shard: int):
+        self._seal(shard)
+        if self._chunks[shard]:
+            self._conns[shard].send(("batch", self._chunks[shard]))
+            self._chunks[shard] = []
+            self._queued[shard] = 0
+
+    def flush(self):
+        """Ship every pending tick to its shard"""
+        for shard in range(self.num_shards):
+            self._flush_shard(shard)
+
+    def _call(self, shard: int, method: str, *args):
+        self._flush_shard(shard)
+        conn = self._conns[shard]
+        conn.send(("call", method, args))
+        ok, result = conn.recv()
+        if not ok:
+            raise result
+        return result
+
+    def _call_all(self, method: str, *args) -> list:
+        """
+        Send to every shard before waiting on any, so shards work in parallel. Every reply
+        is read before the first error is raised, so no pipe is left holding a stale one.
+        """
+        self.flush()
+        for conn in self._conns:
+            conn.send(("call", method, args))
+        replies = [conn.recv() for conn in self._conns]
+        for ok, result in replies:
+            if not ok:
+                raise result
+        return [result for _, result in replies]
+
+    def get_latest_price(self, symbol: str):
+        return self._call(self._shard(symbol), "get_latest_price", symbol)
+
+    def get_rolling_average(self, symbol: str) -> float:
+        return self._call(self._shard(symbol), "get_rolling_average", symbol)
+
+    def get_min_max(self, symbol: str):
+        return self._call(self._shard(symbol), "get_min_max", symbol)
+
+    def get_quantiles(self, symbol: str, qs=(0.5, 0.95, 0.99), rolling: bool = False) -> dict:
+        return self._call(self._shard(symbol), "get_quantiles", symbol, qs, rolling)
+
+    def get_digest(self, symbol: str, rolling: bool = False):
+        return self._call(self._shard(symbol), "get_digest", symbol, rolling)
+
+    def add_indicator(self, spec: str, symbol: str = None):
+        if symbol is None:
+            self._call_all("add_indicator", spec)
+        else:
+            self._call(self._shard(symbol), "add_indicator", spec, symbol)
+
+    def get_indicator(self, symbol: str, spec: str):
+        return self._call(self._shard(symbol), "get_indicator", symbol, spec)
+
+    def get_indicators(self, symbol: str) -> dict:
+        return self._call(self._shard(symbol), "get_indicators", symbol)
+
+    def get_downsampled_history(self, symbol: str, width: int = 500, n: int = None, method: str = "lttb",
+                                resolution: float = None):
+        return self._call(self._shard(symbol), "get_downsampled_history", symbol, width, n, method, resolution)
+
+    def list_symbols(self) -> List[str]:
+        return [symbol for part in self._call_all("list_symbols") for symbol in part]
+
+    def _merged_by_price(self, method: str, *args) -> list:
+        """Shard results merged into one list ascending by price, as a single engine returns them"""
+        return sorted((row for part in self._call_all(method, *args) for row in part), key=lambda row: row[1])
+
+    def symbols_above_price(self, threshold: float):
+        return self._merged_by_price("symbols_above_price", threshold)
+
+    def symbols_below_price(self, threshold: float):
+        return self._merged_by_price("symbols_below_price", threshold)
+
+    def symbols_in_price_range(self, low: float, high: float):
+        return self._merged_by_price("symbols_in_price_range", low, high)
+
+    def _merged_by_deviation(self, method: str) -> list:
+        """Shard results merged ascending by distance from the rolling average, as a single engine returns them"""
+        rows = [row for part in self._call_all(method) for row in part]
+        return sorted(rows, key=lambda row: (row[1] - row[2]) / row[2] if row[2] else 0.0)
+
+    def symbols_above_average(self):
+        return self._merged_by_deviation("symbols_above_average")
+
+    def symbols_below_average(self):
+        return self._merged_by_deviation("symbols_below_average")
+
+    def hottest_symbols(self, k: int = 10) -> list:
+        """Busiest symbols across shards; each symbol lives on one shard, so per-shard top k merge exactly"""
+        return self._merged_top("hottest_symbols", k, True)
+
+    def suggest_placement(self, k: int = 100) -> dict:
+        """Placement for the k hottest symbols that evens out per-shard tick rates; pass as placement= on restart"""
+        return balanced_placement({symbol: rate for symbol, rate, _ in self.hottest_symbols(k)}, self.num_shards)
+
+    def _merged_top(self, method: str, k: int, descending: bool) -> list:
+        rows = [row for part in self._call_all(method, k) for row in part]
+        return sorted(rows, key=lambda row: row[1], reverse=descending)[:k]
+
+    def top_gainers(self, k: int = 10) -> list:
+        return self._merged_top("top_gainers", k, True)
+
+    def top_losers(self, k: int = 10) -> list:
+        return self._merged_top("top_losers", k, False)
+
+    def top_above_average(self, k: int = 10) -> list:
+        return self._merged_top("top_above_average", k, True)
+
+    def top_below_average(self, k: int = 10) -> list:
+        return self._merged_top("top_below_average", k, False)
+
+    def widest_ranges(self, k: int = 10) -> list:
+        return self._merged_top("widest_ranges", k, True)
+
+    def get_all_data(self) -> dict:
+        snapshot = {}
+        for part in self._call_all("get_all_data"):
+            snapshot.update(part)
+        return snapshot
+
+    def close(self):
+        self.flush()
+        for conn in self._conns:
+            conn.send(("stop",))
+        for proc in self._procs:
+            proc.join(timeout=5)
+        self._conns = []
+        self._procs = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
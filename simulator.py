@@ -6,8 +6,9 @@ def simulate_feed(engine, symbols: list[str], steps=100, delay=0.1):
     for _ in range(steps):
         symbol = random.choice(symbols)
         price = round(random.uniform(100, 500), 2)
-        print(f"Ingesting: {symbol} @ {price}")
-        engine.ingest(symbol, price)
+        volume = random.randint(1, 1000)
+        print(f"Ingesting: {symbol} @ {price} x {volume}")
+        engine.ingest(symbol, price, volume)
         time.sleep(delay)
 
 if __name__=="__main__":
@@ -0,0 +1,184 @@
+import itertools
+from bisect import bisect_left, bisect_right, insort
+from dataclasses import dataclass
+
+ABOVE = "above"          # price rises above value
+BELOW = "below"          # price falls below value
+PCT_MOVE = "pct_move"    # price moves value percent from its reference, then re-arms at the new price
+CROSS_AVG = "cross_avg"  # price crosses its rolling average
+
+INF = float('inf')
+
+@dataclass
+class Alert:
+    alert_id: int
+    symbol: str
+    kind: str
+    value: float = None
+    priority: int = 1
+    direction: str = "both"   # "up", "down" or "both" for pct_move / cross_avg
+    reference: float = None   # pct_move: price the move is measured from
+
+
+class SymbolAlerts:
+    """
+    Standing conditions for one symbol. Price-level triggers live in two lists
+    sorted by level, so a tick only bisects to the levels it crossed.
+    """
+
+    def __init__(self):
+        self.up = []            # (level, alert_id), fire when price rises through level
+        self.down = []          # (level, alert_id), fire when price falls through level
+        self.avg_alerts = []    # CROSS_AVG alerts
+        self.unarmed = []       # PCT_MOVE alerts waiting for a first price
+        self.last_side = 0      # sign of (price - rolling average) at the last tick
+        self.count = 0
+
+    def _levels(self, alert):
+        if alert.kind == ABOVE:
+            return [(self.up, alert.value)]
+        if alert.kind == BELOW:
+            return [(self.down, alert.value)]
+        move = alert.reference * alert.value / 100
+        levels = []
+        if alert.direction in ("up", "both"):
+            levels.append((self.up, alert.reference + move))
+        if alert.direction in ("down", "both"):
+            levels.append((self.down, alert.reference - move))
+        return levels
+
+    def arm(self, alert):
+        for side, level in self._levels(alert):
+            insort(side, (level, alert.alert_id))
+
+    def disarm(self, alert):
+        for side, level in self._levels(alert):
+            i = bisect_left(side, (level, alert.alert_id))
+            if i < len(side) and side[i] == (level, alert.alert_id):
+                del side[i]
+
+    def crossed(self, prev, price) -> list:
+        """Ids of price-level triggers crossed moving from prev to price"""
+        if prev is None: # first price: report whatever is already on the trigger side
+            return [alert_id for _, alert_id in self.up[:bisect_left(self.up, (price, -INF))]] + \
+                   [alert_id for _, alert_id in self.down[bisect_right(self.down, (price, INF)):]]
+        if price > prev:
+            # levels in [prev, price): was at or below, now above
+            return [alert_id for _, alert_id in self.up[bisect_left(self.up, (prev, -INF)):bisect_left(self.up, (price, -INF))]]
+        if price < prev:
+            # levels in (price, prev]: was at or above, now below
+            return [alert_id for _, alert_id in self.down[bisect_right(self.down, (price, INF)):bisect_right(self.down, (prev, INF))]]
+        return []
+
+
+class AlertBook:
+    """
+    All standing alerts, grouped per symbol so a tick only looks at its own symbol.
+    create() may be called from any thread; add(), remove() and check() change the
+    per-symbol books and belong to the ingest thread.
+    """
+
+    def __init__(self):
+        self.by_symbol = {}     # symbol -> SymbolAlerts
+        self.alerts = {}        # alert_id -> Alert in a book
+        self.active = {}        # alert_id -> Alert created and not yet cancelled, kept by callers
+        self.ids = itertools.count()
+
+    def create(self, symbol: str, kind: str, value=None, priority=1, direction="both") -> Alert:
+        """Validate and number a new alert; it is checked once add() puts it in its symbol's book"""
+        if kind not in (ABOVE, BELOW, PCT_MOVE, CROSS_AVG):
+            raise ValueError(f"unknown alert kind: {kind}")
+        if kind != CROSS_AVG and value is None:
+            raise ValueError(f"{kind} alerts need a value")
+        if direction not in ("up", "down", "both"):
+            raise ValueError(f"unknown direction: {direction}")
+        alert = Alert(next(self.ids), symbol, kind, value, priority, direction)
+        self.active[alert.alert_id] = alert
+        return alert
+
+    def cancel(self, alert_id: int) -> bool:
+        """Caller side of a removal: False if the alert is unknown or already cancelled"""
+        return self.active.pop(alert_id, None) is not None
+
+    def add(self, alert: Alert, current_price=None) -> int:
+        """Put a created alert in its symbol's book; pct_move measures from current_price (or the next tick)"""
+        self.alerts[alert.alert_id] = alert
+        book = self.by_symbol.get(alert.symbol)
+        if book is None:
+            book = self.by_symbol[alert.symbol] = SymbolAlerts()
+        book.count += 1
+        if alert.kind == CROSS_AVG:
+            book.avg_alerts.append(alert)
+        elif alert.kind == PCT_MOVE and current_price is None:
+            book.unarmed.append(alert)
+        else:
+            if alert.kind == PCT_MOVE:
+                alert.reference = current_price
+            book.arm(alert)
+        return alert.alert_id
+
+    def remove(self, alert_id: int) -> bool:
+        self.active.pop(alert_id, None)
+        alert = self.alerts.pop(alert_id, None)
+        if alert is None:
+            return False
+        book = self.by_symbol[alert.symbol]
+        if alert.kind == CROSS_AVG:
+            book.avg_alerts.remove(alert)
+        elif alert in book.unarmed:
+            book.unarmed.remove(alert)
+        else:
+            book.disarm(alert)
+        book.count -= 1
+        if book.count == 0:
+            del self.by_symbol[alert.symbol]
+        return True
+
+    def get(self, symbol: str) -> SymbolAlerts:
+        return self.by_symbol.get(symbol)
+
+    def check(self, book: SymbolAlerts, prev, price, avg, timestamp) -> list:
+        """Evaluate one tick for one symbol; returns (priority, event) pairs for alerts that fired"""
+        fired = []
+        for alert_id in book.crossed(prev, price):
+            alert = self.alerts[alert_id]
+            event = self._event(alert, price, timestamp)
+            if alert.kind == PCT_MOVE: # re-arm around the new price
+                event["reference"] = alert.reference
+                book.disarm(alert)
+                alert.reference = price
+                book.arm(alert)
+            fired.append((alert.priority, event))
+
+        if book.unarmed:
+            for alert in book.unarmed:
+                alert.reference = price
+                book.arm(alert)
+            book.unarmed = []
+
+        if book.avg_alerts and avg is not None:
+            side = (price > avg) - (price < avg)
+            if side and book.last_side and side != book.last_side:
+                direction = "up" if side > 0 else "down"
+                for alert in book.avg_alerts:
+                    if alert.direction in (direction, "both"):
+                        event = self._event(alert, price, timestamp)
+                        event["avg"] = avg
+                        fired.append((alert.priority, event))
+            if side:
+                book.last_side = side
+        return fired
+
+    @staticmethod
+    def _event(alert, price, timestamp) -> dict:
+        return {
+            "alert_id": alert.alert_id,
+            "symbol": alert.symbol,
+            "kind": alert.kind,
+            "value": alert.value,
+            "price": price,
+            "timestamp": timestamp,
+        }
+
+    def __len__(self):
+        return len(self.alerts)
@@ -0,0 +1,84 @@
+import numpy as np
+
+# columns of a bar row
+TIME, OPEN, HIGH, LOW, CLOSE, VOLUME, COUNT = range(7)
+COLUMNS = ("time", "open", "high", "low", "close", "volume", "count")
+
+class BarSeries:
+    """
+    OHLCV bars of one resolution (seconds) for one symbol. The open bar is kept in
+    plain Python fields and written into a fixed-size circular float64 array only
+    when it closes, so a tick costs a handful of comparisons.
+    """
+
+    def __init__(self, resolution: float, capacity: int = 100):
+        self.resolution = resolution
+        self.capacity = capacity
+        self.data = np.empty((capacity, len(COLUMNS)), dtype=np.float64)  # closed bars
+        self.head = 0
+        self.size = 0
+        self.current = None  # [start, open, high, low, close, volume, count] of the open bar
+        self.late_dropped = 0
+
+    def update(self, price: float, volume: float, timestamp: float):
+        start = timestamp - timestamp % self.resolution
+        bar = self.current
+        if bar is not None and start == bar[TIME]:
+            if price > bar[HIGH]:
+                bar[HIGH] = price
+            elif price < bar[LOW]:
+                bar[LOW] = price
+            bar[CLOSE] = price
+            bar[VOLUME] += volume
+            bar[COUNT] += 1
+        elif bar is None or start > bar[TIME]:
+            if bar is not None:
+                self._close(bar)
+            self.current = [start, price, price, price, price, volume, 1]
+        else:
+            self._update_late(start, price, volume)
+
+    def extend(self, prices, volumes, timestamps):
+        """Apply many ticks in order; same result as calling update for each"""
+        update = self.update
+        for price, volume, timestamp in zip(prices, volumes, timestamps):
+            update(price, volume, timestamp)
+
+    def _close(self, bar):
+        self.data[self.head] = bar
+        self.head = (self.head + 1) % self.capacity
+        self.size = min(self.size + 1, self.capacity)
+
+    def _update_late(self, start, price, volume):
+        """Out-of-order tick: fold into its closed bar if still held (close is left alone)"""
+        for i in range(self.size):
+            row = self.data[(self.head - 1 - i) % self.capacity]
+            if row[TIME] == start:
+                row[HIGH] = max(row[HIGH], price)
+                row[LOW] = min(row[LOW], price)
+                row[VOLUME] += volume
+                row[COUNT] += 1
+                return
+            if row[TIME] < start: # gap with no bar for that period
+                break
+        self.late_dropped += 1
+
+    def get_bars(self, n: int = None) -> dict:
+        """Newest n bars (including the open one) oldest first, as column arrays"""
+        total = self.size + (self.current is not None)
+        if n is None or n > total:
+            n = total
+        if n <= 0:
+            return {name: self.data[:0, i].copy() for i, name in enumerate(COLUMNS)}
+        closed = max(0, min(n - (self.current is not None), self.size))
+        start = (self.head - closed) % self.capacity
+        if start + closed <= self.capacity:
+            rows = self.data[start:start + closed]
+        else:
+            rows = np.concatenate((self.data[start:], self.data[:self.head]))
+        if self.current is not None and n > 0:
+            rows = np.vstack((rows, np.asarray(self.current, dtype=np.float64)))
+        return {name: rows[:, i] for i, name in enumerate(COLUMNS)}
+
+    def __len__(self):
+        return self.size + (self.current is not None)
@@ -1,3 +1,5 @@
+import numpy as np
+
 class CircularBuffer:
     def __init__(self, capacity: int):  
         self.capacity = capacity
@@ -17,6 +19,11 @@ class CircularBuffer:
         self.is_full = (self.head == self.tail)
         self.size = min(self.size + 1, self.capacity) # if size less than capacity then add 1 to size
 
+    def extend(self, prices, timestamps)->None:
+        """Append many points, oldest first"""
+        for point in zip(prices, timestamps):
+            self.append(point)
+
     
     def remove_oldest(self)->dict:
         if self.size == 0:
@@ -57,10 +64,146 @@ class CircularBuffer:
         
         return result  
 
+    def latest(self):
+        """Newest (price, timestamp) or None"""
+        if self.size == 0:
+            return None
+        return self.buffer[(self.head - 1) % self.capacity]
+
     def __len__(self):
         return self.size
     
     def __str__(self):
         return f"CircularBuffer(size={self.size}, capacity={self.capacity})"
 
-        
+
+class ColumnarCircularBuffer:
+    """
+    Fixed-size ring storing prices and timestamps as preallocated float64 columns.
+    Reads hand back numpy views (at most two slices across the wrap point) instead of copies.
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.size = 0
+        self.head = 0
+        self.tail = 0
+        self.prices = np.empty(self.capacity, dtype=np.float64)
+        self.timestamps = np.empty(self.capacity, dtype=np.float64)
+        self.is_full = False
+
+    def append(self, data)->None: # data appended is a tuple (price, timestamp)
+        self.prices[self.head] = data[0]
+        self.timestamps[self.head] = data[1]
+        if self.is_full:
+            self.tail = (self.tail + 1) % self.capacity
+
+        self.head = (self.head + 1) % self.capacity
+
+        self.is_full = (self.head == self.tail)
+        self.size = min(self.size + 1, self.capacity)
+
+    def extend(self, prices, timestamps)->None:
+        """Append many points, oldest first, with at most two slice writes per column"""
+        prices = np.asarray(prices, dtype=np.float64)
+        timestamps = np.asarray(timestamps, dtype=np.float64)
+        n = len(prices)
+        if n == 0:
+            return
+        if n >= self.capacity: # only the newest capacity points survive
+            self.prices[:] = prices[-self.capacity:]
+            self.timestamps[:] = timestamps[-self.capacity:]
+            self.head = self.tail = 0
+            self.size = self.capacity
+            self.is_full = True
+            return
+
+        first = min(n, self.capacity - self.head)
+        self.prices[self.head:self.head + first] = prices[:first]
+        self.timestamps[self.head:self.head + first] = timestamps[:first]
+        if first < n: # wrap around to the start
+            self.prices[:n - first] = prices[first:]
+            self.timestamps[:n - first] = timestamps[first:]
+
+        self.head = (self.head + n) % self.capacity
+        self.size = min(self.size + n, self.capacity)
+        self.tail = (self.head - self.size) % self.capacity
+        self.is_full = self.size == self.capacity
+
+    def remove_oldest(self):
+        if self.size == 0:
+            return None
+
+        oldest = (float(self.prices[self.tail]), float(self.timestamps[self.tail]))
+        self.tail = (self.tail + 1) % self.capacity
+
+        self.size -= 1
+        self.is_full = False
+        return oldest
+
+    def _segments(self, n=None)->list:
+        """Slices covering the n newest slots, oldest first (at most two)"""
+        if n is None or n > self.size:
+            n = self.size
+        if n <= 0:
+            return []
+
+        start = (self.head - n) % self.capacity
+        if start + n <= self.capacity:
+            return [slice(start, start + n)]
+        return [slice(start, self.capacity), slice(0, self.head)]
+
+    def price_segments(self, n=None)->list:
+        """Zero-copy views of the n newest prices, oldest first"""
+        return [self.prices[s] for s in self._segments(n)]
+
+    def timestamp_segments(self, n=None)->list:
+        """Zero-copy views of the n newest timestamps, oldest first"""
+        return [self.timestamps[s] for s in self._segments(n)]
+
+    def newest_prices(self, n=None):
+        """n newest prices oldest first; a view unless the range wraps"""
+        segments = self.price_segments(n)
+        if not segments:
+            return self.prices[:0]
+        return segments[0] if len(segments) == 1 else np.concatenate(segments)
+
+    def newest_timestamps(self, n=None):
+        """n newest timestamps oldest first; a view unless the range wraps"""
+        segments = self.timestamp_segments(n)
+        if not segments:
+            return self.timestamps[:0]
+        return segments[0] if len(segments) == 1 else np.concatenate(segments)
+
+    def count_after(self, cutoff: float) -> int:
+        """Number of newest points with timestamp > cutoff, by binary search (timestamps ascend)"""
+        count = 0
+        for segment in reversed(self.timestamp_segments()):
+            idx = int(np.searchsorted(segment, cutoff, side="right"))
+            count += len(segment) - idx
+            if idx > 0:
+                break
+        return count
+
+    def latest(self):
+        """Newest (price, timestamp) or None"""
+        if self.size == 0:
+            return None
+        idx = (self.head - 1) % self.capacity
+        return (float(self.prices[idx]), float(self.timestamps[idx]))
+
+    def return_n_newest(self, n:int=1)->list:
+        """Newest first list of (price, timestamp) tuples, same shape as CircularBuffer"""
+        prices = self.newest_prices(n)[::-1].tolist()
+        timestamps = self.newest_timestamps(n)[::-1].tolist()
+        return list(zip(prices, timestamps))
+
+    def get_all(self)->list:
+        """Get all items in order (oldest to newest)"""
+        return list(zip(self.newest_prices().tolist(), self.newest_timestamps().tolist()))
+
+    def __len__(self):
+        return self.size
+
+    def __str__(self):
+        return f"ColumnarCircularBuffer(size={self.size}, capacity={self.capacity})"
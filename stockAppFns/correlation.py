@@ -0,0 +1,159 @@
+import numpy as np
+
+class RollingCorrelation:
+    """
+    Rolling covariance/correlation of log returns for a chosen set of keys. Ticks only
+    record each key's last price; every `interval` seconds of tick time the prices are
+    sampled into one aligned return vector. The last `window` vectors live in a ring
+    with a validity mask: a key has no return until it has two sampled prices, and a
+    key added mid-run has none for the samples before it joined. Each pair is measured
+    only over the samples both keys have, from running pairwise sums kept as m x m
+    matrices, so a sample costs O(m^2) vectorized work and a correlation row is O(m).
+    """
+
+    def __init__(self, window: int = 300, interval: float = 1.0, refresh_every: int = None):
+        self.window = window
+        self.interval = interval
+        self.refresh_every = refresh_every or window  # samples between exact recomputes of the sums
+        self.keys = []          # column -> key
+        self.columns = {}       # key -> column
+        self.last = np.empty(0)           # last price per column (nan until the first tick)
+        self.sampled = np.empty(0)        # price per column at the previous sample
+        self.ring = np.zeros((window, 0))  # return vectors (0 where missing), row = sample slot
+        self.valid = np.zeros((window, 0))  # 1.0 where the ring holds a real return
+        # (samples, pair counts, sums of r_i, sums of r_i^2, sums of r_i * r_j), entry [i, j]
+        # summed over the samples where both i and j have a return
+        self.state = (0,) + tuple(np.zeros((0, 0)) for _ in range(4))
+        self.samples = 0
+        self.next_sample = None
+        self.requested = []     # keys queued by other threads, added by the ingest thread
+
+    def add(self, key) -> int:
+        """Start tracking key; its history begins at the next sample. Call from the ingest thread"""
+        col = self.columns.get(key)
+        if col is not None:
+            return col
+        col = len(self.keys)
+        self.last = np.append(self.last, np.nan)
+        self.sampled = np.append(self.sampled, np.nan)
+        self.ring = np.pad(self.ring, ((0, 0), (0, 1)))
+        self.valid = np.pad(self.valid, ((0, 0), (0, 1)))  # earlier samples are missing, not zero
+        n, *sums = self.state
+        self.state = (n, *(np.pad(matrix, ((0, 1), (0, 1))) for matrix in sums))
+        self.keys.append(key)
+        self.columns[key] = col  # publish last, once the arrays have room
+        return col
+
+    def request(self, key):
+        """Ask for key to be tracked from any thread; applied by apply_requests on the ingest thread"""
+        self.requested.append(key)
+
+    def apply_requests(self):
+        while self.requested:
+            self.add(self.requested.pop(0))
+
+    def observe(self, col: int, price: float, timestamp: float):
+        """Record a tick for a tracked column; samples first if the tick crosses a sample boundary"""
+        if self.next_sample is None:
+            self.next_sample = timestamp - timestamp % self.interval + self.interval
+        elif timestamp >= self.next_sample:
+            self._sample()
+            self.next_sample = timestamp - timestamp % self.interval + self.interval
+        self.last[col] = price
+
+    def observe_many(self, cols, prices, timestamps):
+        """observe() for arrays of ticks in time order, sampling only at boundaries"""
+        cols = np.asarray(cols)
+        prices = np.asarray(prices, dtype=np.float64)
+        timestamps = np.asarray(timestamps, dtype=np.float64)
+        i, n = 0, len(cols)
+        while i < n:
+            if self.next_sample is None:
+                self.next_sample = timestamps[i] - timestamps[i] % self.interval + self.interval
+            elif timestamps[i] >= self.next_sample:
+                self._sample()
+                self.next_sample = timestamps[i] - timestamps[i] % self.interval + self.interval
+            j = i + int(np.searchsorted(timestamps[i:], self.next_sample, side="left"))
+            # last tick per column wins within the segment
+            seg_cols = cols[i:j][::-1]
+            uniq, first = np.unique(seg_cols, return_index=True)
+            self.last[uniq] = prices[i:j][::-1][first]
+            i = j
+
+    def _sample(self):
+        with np.errstate(divide="ignore", invalid="ignore"):
+            returns = np.log(self.last / self.sampled)
+        valid = np.isfinite(returns).astype(np.float64)  # columns without two prices yet have no return
+        returns[valid == 0] = 0.0
+        self.sampled = self.last.copy()
+
+        slot = self.samples % self.window
+        old, old_valid = self.ring[slot].copy(), self.valid[slot].copy()
+        self.ring[slot], self.valid[slot] = returns, valid
+        self.samples += 1
+        if self.samples % self.refresh_every == 0: # drop accumulated rounding error
+            live = min(self.samples, self.window)
+            self.state = (live,) + self._pair_sums(self.ring[:live], self.valid[:live])
+            return
+        n, counts, sums, squares, products = self.state
+        added = self._pair_sums(returns[None], valid[None])
+        if n == self.window:
+            removed = self._pair_sums(old[None], old_valid[None])
+            self.state = (n,) + tuple(total + a - r for total, a, r in zip((counts, sums, squares, products), added, removed))
+        else:
+            self.state = (n + 1,) + tuple(total + a for total, a in zip((counts, sums, squares, products), added))
+
+    @staticmethod
+    def _pair_sums(returns, valid):
+        """Pairwise (counts, sums, squares, products) of sample rows; returns are 0 where not valid"""
+        return valid.T @ valid, returns.T @ valid, (returns * returns).T @ valid, returns.T @ returns
+
+    @staticmethod
+    def _pair_moments(counts, sums_i, sums_j, squares_i, squares_j, products):
+        """Covariance and the two variances of pairs over their shared samples (nan below 2 samples)"""
+        with np.errstate(divide="ignore", invalid="ignore"):
+            counts = np.where(counts >= 2, counts, np.nan)
+            mean_i, mean_j = sums_i / counts, sums_j / counts
+            cov = products / counts - mean_i * mean_j
+            var_i = np.clip(squares_i / counts - mean_i * mean_i, 0, None)
+            var_j = np.clip(squares_j / counts - mean_j * mean_j, 0, None)
+        return cov, var_i, var_j
+
+    def covariance(self):
+        """Covariance matrix of returns, each pair over the samples both keys have (None before two samples)"""
+        n, counts, sums, squares, products = self.state
+        if n < 2:
+            return None
+        return self._pair_moments(counts, sums, sums.T, squares, squares.T, products)[0]
+
+    def correlation(self):
+        """Correlation matrix; nan where a pair shares under two samples or a key has no variance"""
+        n, counts, sums, squares, products = self.state
+        if n < 2:
+            return None
+        cov, var_i, var_j = self._pair_moments(counts, sums, sums.T, squares, squares.T, products)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return cov / np.sqrt(var_i * var_j)
+
+    def correlation_row(self, col: int):
+        """Correlations of one column with every column, O(m)"""
+        n, counts, sums, squares, products = self.state
+        if n < 2:
+            return None
+        cov, var_i, var_j = self._pair_moments(counts[col], sums[col], sums[:, col], squares[col],
+                                               squares[:, col], products[col])
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return cov / np.sqrt(var_i * var_j)
+
+    def top(self, col: int, k: int = 5, absolute: bool = False) -> list:
+        """Up to k (column, correlation) most correlated with col, strongest first"""
+        row = self.correlation_row(col)
+        if row is None:
+            return []
+        scores = np.abs(row) if absolute else row.copy()
+        scores[col] = np.nan
+        valid = np.flatnonzero(~np.isnan(scores))
+        if k < len(valid):
+            valid = valid[np.argpartition(-scores[valid], k - 1)[:k]]
+        order = valid[np.argsort(-scores[valid], kind="stable")]
+        return [(int(c), float(row[c])) for c in order]
@@ -0,0 +1,55 @@
+import numpy as np
+
+"""Reduce long price series to about one point per pixel for charting"""
+
+def lttb(x, y, threshold: int):
+    """
+    Largest-triangle-three-buckets: keep the first and last points plus, per bucket,
+    the point forming the largest triangle with the previously kept point and the
+    next bucket's average. Preserves the visual shape; returns (x, y) of threshold points.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return x, y
+
+    # bucket i = edges[i]:edges[i + 1]; the last edge is clipped so the final bucket is the last point
+    edges = np.minimum(np.arange(threshold, dtype=np.int64) * (n - 2) // (threshold - 2) + 1, n)
+    keep = np.empty(threshold, dtype=np.int64)
+    keep[0], keep[-1] = 0, n - 1
+    a = 0
+    for i in range(threshold - 2):
+        start, end = edges[i], edges[i + 1]
+        avg_x = x[end:edges[i + 2]].mean()
+        avg_y = y[end:edges[i + 2]].mean()
+        area = np.abs((x[a] - avg_x) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (avg_y - y[a]))
+        a = start + int(np.argmax(area))
+        keep[i + 1] = a
+    return x[keep], y[keep]
+
+def min_max(x, y, width: int):
+    """
+    Min/max decimation: split into width // 2 buckets and keep each bucket's lowest
+    and highest point in time order, so spikes always survive. Returns (x, y).
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    n = len(x)
+    buckets = width // 2
+    if n <= width or buckets < 1:
+        return x, y
+
+    size = -(-n // buckets)
+    buckets = -(-n // size)
+    # pad to equal rows with the last value, so a padded winner maps back to the last point
+    grid = np.full(size * buckets, y[-1])
+    grid[:n] = y
+    grid = grid.reshape(buckets, size)
+    offsets = np.arange(buckets) * size
+    lows = np.minimum(offsets + np.argmin(grid, axis=1), n - 1)
+    highs = np.minimum(offsets + np.argmax(grid, axis=1), n - 1)
+    keep = np.unique(np.concatenate((lows, highs, [0, n - 1])))
+    return x[keep], y[keep]
+
+METHODS = {"lttb": lttb, "minmax": min_max}
@@ -1,52 +1,65 @@
 # using for stock symbol lookups
 class HashTable:
+    """
+    Separate-chaining hash table. Each entry keeps its full hash, so resizing
+    never rehashes keys and lookups compare hashes before strings. Reads may run
+    alongside a single writer: a resize fills a new bucket list before publishing
+    it, and readers index whichever list they loaded by its own length.
+    """
     def __init__(self, initial_capacity: int = 16):
         self.capacity = initial_capacity
         self.size = 0
         self.buckets = [[] for _ in range(self.capacity)]
         self.load_factor_threshold = 0.75
     
-    def _hash(self, key: str) -> int: # hash function
-        hash_val = 0
-        for char in key:
-            hash_val = (hash_val * 31 + ord(char)) % self.capacity
-        return hash_val
+    def _hash(self, key: str) -> int: # full hash; CPython caches it on the str object
+        return hash(key)
     
-    def _resize(self): # Resize hash table when load factor exceeded
-        old_buckets = self.buckets
-        self.capacity *= 2
-        self.size = 0
+    def __setstate__(self, state):
+        """Rehash on unpickle: str hashes are salted per process (PYTHONHASHSEED), so stored ones go stale"""
+        self.__dict__.update(state)
+        entries = [entry for bucket in self.buckets for entry in bucket]
         self.buckets = [[] for _ in range(self.capacity)]
+        for key, value, _ in entries:
+            hash_val = self._hash(key)
+            self.buckets[hash_val % self.capacity].append((key, value, hash_val))
+    
+    def _resize(self): # Resize hash table when load factor exceeded, O(n) amortized over inserts
+        capacity = self.capacity * 2
+        new_buckets = [[] for _ in range(capacity)]
         
-        # Rehash all items
-        for bucket in old_buckets:
-            for key, value in bucket:
-                self.put(key, value)
+        # Redistribute using the stored hashes, then publish the filled list in one step
+        for bucket in self.buckets:
+            for entry in bucket:
+                new_buckets[entry[2] % capacity].append(entry)
+        self.buckets = new_buckets
+        self.capacity = capacity
     
     def put(self, key: str, value): # Insert or update key-value pair
         if self.size >= self.capacity * self.load_factor_threshold:
             self._resize()
         
         hash_val = self._hash(key)
-        bucket = self.buckets[hash_val]
+        bucket = self.buckets[hash_val % self.capacity]
         
         # Check if key already exists
-        for i, (k, v) in enumerate(bucket):
-            if k == key:
-                bucket[i] = (key, value)
+        for i, (k, v, h) in enumerate(bucket):
+            if h == hash_val and k == key:
+                bucket[i] = (key, value, hash_val)
                 return
         
         # Add new key-value pair
-        bucket.append((key, value))
+        bucket.append((key, value, hash_val))
         self.size += 1
     
     def get(self, key: str):
         """Get value by key"""
         hash_val = self._hash(key)
-        bucket = self.buckets[hash_val]
+        buckets = self.buckets  # load once: a concurrent resize may swap it
+        bucket = buckets[hash_val % len(buckets)]
         
-        for k, v in bucket:
-            if k == key:
+        for k, v, h in bucket:
+            if h == hash_val and k == key:
                 return v
         
         return None
@@ -54,10 +67,10 @@ class HashTable:
     def remove(self, key: str):
         """Remove key-value pair"""
         hash_val = self._hash(key)
-        bucket = self.buckets[hash_val]
+        bucket = self.buckets[hash_val % self.capacity]
         
-        for i, (k, v) in enumerate(bucket):
-            if k == key:
+        for i, (k, v, h) in enumerate(bucket):
+            if h == hash_val and k == key:
                 del bucket[i]
                 self.size -= 1
                 return v
@@ -70,14 +83,14 @@ class HashTable:
     def keys(self): # Get all keys
         keys = []
         for bucket in self.buckets:
-            for k, v in bucket:
+            for k, v, h in bucket:
                 keys.append(k)
         return keys
     
     def values(self): # Get all values
         values = []
         for bucket in self.buckets:
-            for k, v in bucket:
+            for k, v, h in bucket:
                 values.append(v)
         return values
     
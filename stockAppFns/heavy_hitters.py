@@ -0,0 +1,111 @@
+import math
+import numpy as np
+from stockAppFns import priority_queue
+
+class DecayingSpaceSaving:
+    """
+    Space-saving top-K over exponentially decaying tick counts. At most capacity keys
+    are monitored in a min-priority queue by count; an unmonitored key takes over the
+    smallest counter and inherits its count as error bound. Counts use forward decay:
+    a tick at time t adds 2 ** ((t - landmark) / half_life), so older ticks never need
+    touching and the ordering of counters stays valid as time moves on.
+    """
+
+    RESCALE_AT = 500  # exponent at which the landmark moves, before weights overflow
+
+    def __init__(self, capacity: int = 128, half_life: float = 60.0):
+        self.capacity = capacity
+        self.half_life = half_life
+        self.queue = priority_queue.PriorityQueue()  # key -> (scaled count, scaled error), smallest first
+        self.landmark = None
+        self.last_time = None
+        self.evictions = 0
+
+    def _weight(self, timestamp: float) -> float:
+        if self.landmark is None:
+            self.landmark = timestamp
+        exponent = (timestamp - self.landmark) / self.half_life
+        if exponent > self.RESCALE_AT:
+            self._rescale(timestamp, exponent)
+            exponent = 0.0
+        return 2.0 ** exponent
+
+    def _rescale(self, timestamp: float, exponent: float):
+        """Re-base every counter on a new landmark; a uniform scale keeps the heap ordered"""
+        factor = 2.0 ** -exponent
+        for entry in self.queue.heap:
+            entry[0] *= factor
+            entry[2] *= factor
+        self.landmark = timestamp
+
+    def add(self, key, timestamp: float, count: int = 1):
+        """Count count ticks of key at timestamp (timestamps should roughly ascend)"""
+        if self.last_time is None or timestamp > self.last_time:
+            self.last_time = timestamp
+        self._count(key, count * self._weight(timestamp))
+
+    def add_many(self, key, timestamps):
+        """Count one tick of key per timestamp; same result as calling add for each"""
+        timestamps = np.asarray(timestamps, dtype=np.float64)
+        if not len(timestamps):
+            return
+        newest = float(timestamps.max())
+        self._weight(newest) # sets the landmark and rescales if needed
+        if self.last_time is None or newest > self.last_time:
+            self.last_time = newest
+        weight = float(np.sum(np.exp2((timestamps - self.landmark) / self.half_life)))
+        self._count(key, weight)
+
+    def add_sequence(self, keys, timestamps):
+        """
+        Count one tick per (key, timestamp) pair in arrival order; same result as calling
+        add for each. Consecutive ticks of one key are summed into a single update, and
+        eviction sees the keys in the order they arrived.
+        """
+        keys = np.asarray(keys)
+        timestamps = np.asarray(timestamps, dtype=np.float64)
+        if not len(timestamps):
+            return
+        newest = float(timestamps.max())
+        self._weight(newest) # sets the landmark and rescales if needed
+        if self.last_time is None or newest > self.last_time:
+            self.last_time = newest
+        weights = np.exp2((timestamps - self.landmark) / self.half_life)
+        starts = np.flatnonzero(np.concatenate(([True], keys[1:] != keys[:-1])))
+        for key, weight in zip(keys[starts].tolist(), np.add.reduceat(weights, starts).tolist()):
+            self._count(key, weight)
+
+    def _count(self, key, weight: float):
+        queue = self.queue
+        current = queue.get(key)
+        if current is not None:
+            queue.update(key, current[0] + weight)
+        elif len(queue) < self.capacity:
+            queue.push(weight, 0.0, key)
+        else: # take over the smallest counter
+            floor = queue.heap[0][0]
+            queue.replace(floor + weight, floor, key)
+            self.evictions += 1
+
+    def _per_second(self, now: float) -> float:
+        """Factor turning a scaled count into ticks per second at now (steady state: rate = count * ln2 / half_life)"""
+        now = self.last_time if now is None else now
+        return math.log(2) / self.half_life * 2.0 ** ((self.landmark - now) / self.half_life)
+
+    def top(self, k: int = 10, now: float = None) -> list:
+        """Up to k (key, ticks per second, error bound) heaviest first, decayed to now (default: newest tick)"""
+        if self.landmark is None:
+            return []
+        per_second = self._per_second(now)
+        entries = sorted(self.queue.heap, key=lambda entry: entry[0], reverse=True)[:k]
+        return [(entry[3], entry[0] * per_second, entry[2] * per_second) for entry in entries]
+
+    def rate(self, key, now: float = None):
+        """Estimated ticks per second of key, None if it is not monitored"""
+        current = self.queue.get(key)
+        if current is None:
+            return None
+        return current[0] * self._per_second(now)
+
+    def __len__(self):
+        return len(self.queue)
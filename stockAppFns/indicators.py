@@ -0,0 +1,210 @@
+import math
+import threading
+from collections import deque
+from stockAppFns.sliding_window import _RunningMoments
+
+"""
+Incremental technical indicators, O(1) per tick. An indicator is named by a spec
+string "name:arg,arg" (e.g. "ema:20", "macd:12,26,9", "vwap"); new kinds plug in
+with register().
+"""
+
+class Indicator:
+    """Base class: update() takes one tick, value() reports the current reading (None while warming up)"""
+
+    def update(self, price: float, volume: float, timestamp: float):
+        raise NotImplementedError
+
+    def extend(self, prices, volumes, timestamps):
+        """Apply many ticks in order; same result as calling update for each"""
+        update = self.update
+        for price, volume, timestamp in zip(prices, volumes, timestamps):
+            update(price, volume, timestamp)
+
+    def value(self):
+        raise NotImplementedError
+
+
+class EMA(Indicator):
+    """Exponential moving average, seeded with the first price"""
+
+    def __init__(self, period: int = 20):
+        self.period = period
+        self.alpha = 2 / (period + 1)
+        self.current = None
+
+    def add(self, value: float):
+        if self.current is None:
+            self.current = value
+        else:
+            self.current += self.alpha * (value - self.current)
+        return self.current
+
+    def update(self, price, volume, timestamp):
+        self.add(price)
+
+    def value(self):
+        return self.current
+
+
+class RSI(Indicator):
+    """Wilder's relative strength index; plain averages over the first period changes, then smoothed"""
+
+    def __init__(self, period: int = 14):
+        self.period = period
+        self.prev = None
+        self.changes = 0
+        self.avg_gain = 0.0
+        self.avg_loss = 0.0
+
+    def update(self, price, volume, timestamp):
+        prev, self.prev = self.prev, price
+        if prev is None:
+            return
+        change = price - prev
+        gain, loss = (change, 0.0) if change > 0 else (0.0, -change)
+        self.changes += 1
+        n = min(self.changes, self.period)
+        self.avg_gain += (gain - self.avg_gain) / n
+        self.avg_loss += (loss - self.avg_loss) / n
+
+    def value(self):
+        if self.changes < self.period:
+            return None
+        if self.avg_loss == 0:
+            return 100.0
+        return 100 - 100 / (1 + self.avg_gain / self.avg_loss)
+
+
+class MACD(Indicator):
+    """MACD line (fast EMA - slow EMA), its signal EMA and the histogram between them"""
+
+    def __init__(self, fast: int = 12, slow: int = 26, signal: int = 9):
+        self.fast = EMA(fast)
+        self.slow = EMA(slow)
+        self.signal = EMA(signal)
+
+    def update(self, price, volume, timestamp):
+        self.signal.add(self.fast.add(price) - self.slow.add(price))
+
+    def value(self):
+        if self.signal.current is None:
+            return None
+        macd = self.fast.current - self.slow.current
+        return {"macd": macd, "signal": self.signal.current, "histogram": macd - self.signal.current}
+
+
+class BollingerBands(Indicator):
+    """Moving average of the last period prices with bands k standard deviations away"""
+
+    def __init__(self, period: int = 20, k: float = 2.0):
+        self.period = period
+        self.k = k
+        self.window = deque(maxlen=period)
+        self.moments = _RunningMoments()
+
+    def update(self, price, volume, timestamp):
+        evicted = self.window[0] if len(self.window) == self.period else None
+        self.window.append(price)
+        self.moments.add(price, evicted)
+
+    def value(self):
+        if len(self.window) < self.period:
+            return None
+        middle = self.moments.mean
+        width = self.k * math.sqrt(self.moments.variance())
+        return {"middle": middle, "upper": middle + width, "lower": middle - width}
+
+
+class VWAP(Indicator):
+    """Volume-weighted average price, restarting every `session` seconds when set (e.g. 86400)"""
+
+    def __init__(self, session: float = None):
+        self.session = session
+        self.session_start = None
+        self.notional = 0.0
+        self.volume = 0.0
+
+    def update(self, price, volume, timestamp):
+        if self.session:
+            start = timestamp - timestamp % self.session
+            if start != self.session_start:
+                if self.session_start is not None and start < self.session_start:
+                    return  # late tick from a finished session
+                self.session_start = start
+                self.notional = self.volume = 0.0
+        self.notional += price * volume
+        self.volume += volume
+
+    def value(self):
+        return self.notional / self.volume if self.volume else None
+
+
+class PendingIndicator(Indicator):
+    """
+    Stand-in published while an indicator is seeded off the ingest thread. The writer's
+    ticks are queued with their ordinal (from tick_count) until resolve() hands over a
+    seeded indicator and the ordinal of its last tick; later queued ticks are replayed
+    into it and from then on updates pass straight through.
+    """
+
+    def __init__(self, spec: str, tick_count):
+        self.spec = spec
+        self.tick_count = tick_count  # callable: ordinal of the tick being written
+        self.lock = threading.Lock()
+        self.queued = []   # (ordinal of first tick, prices, volumes, timestamps)
+        self.indicator = None
+
+    def update(self, price, volume, timestamp):
+        with self.lock:
+            if self.indicator is not None:
+                self.indicator.update(price, volume, timestamp)
+            else:
+                self.queued.append((self.tick_count(), [price], [volume], [timestamp]))
+
+    def extend(self, prices, volumes, timestamps):
+        with self.lock:
+            if self.indicator is not None:
+                self.indicator.extend(prices, volumes, timestamps)
+            else:
+                self.queued.append((self.tick_count() - len(prices) + 1, prices, volumes, timestamps))
+
+    def resolve(self, indicator: Indicator, seeded_through: int) -> Indicator:
+        with self.lock:
+            for first, prices, volumes, timestamps in self.queued:
+                skip = max(0, seeded_through + 1 - first)
+                indicator.extend(prices[skip:], volumes[skip:], timestamps[skip:])
+            self.queued = []
+            self.indicator = indicator
+        return indicator
+
+    def value(self):
+        return self.indicator.value() if self.indicator is not None else None
+
+    def __reduce__(self):
+        # checkpointed mid-seed: restore as a fresh indicator of the same spec
+        return create, (self.spec,)
+
+
+INDICATORS = {
+    "ema": EMA,
+    "rsi": RSI,
+    "macd": MACD,
+    "bollinger": BollingerBands,
+    "vwap": VWAP,
+}
+
+def register(name: str, cls):
+    """Make an Indicator subclass available to specs as name:args"""
+    INDICATORS[name] = cls
+
+def _number(text: str):
+    return float(text) if any(c in text for c in ".eE") else int(text)
+
+def create(spec: str) -> Indicator:
+    """Build an indicator from its spec, e.g. "rsi:14" -> RSI(14)"""
+    name, _, args = spec.partition(":")
+    cls = INDICATORS.get(name)
+    if cls is None:
+        raise ValueError(f"unknown indicator: {name}")
+    return cls(*(_number(arg) for arg in args.split(",") if arg))
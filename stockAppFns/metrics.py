@@ -0,0 +1,125 @@
+import threading
+import time
+
+SUB_BUCKETS = 8   # buckets per power of two, so a bucket is at most 12.5% wide
+BUCKETS = 512     # covers every 64-bit nanosecond count
+
+def _bucket(ns: int) -> int:
+    if ns < 2 * SUB_BUCKETS:
+        return ns
+    shift = ns.bit_length() - 4
+    return shift * SUB_BUCKETS + (ns >> shift)
+
+def _bucket_upper(index: int) -> int:
+    """Largest nanosecond count that lands in bucket index"""
+    if index < 2 * SUB_BUCKETS:
+        return index
+    shift = index // SUB_BUCKETS - 1
+    return ((index - shift * SUB_BUCKETS + 1) << shift) - 1
+
+
+class LatencyHistogram:
+    """
+    Fixed-size log-linear histogram of durations (HDR style): recording is a
+    bit_length and a list increment, and percentiles are within 12.5%.
+    """
+
+    def __init__(self):
+        self.counts = [0] * BUCKETS
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds: float):
+        self.counts[_bucket(int(seconds * 1e9))] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, q: float) -> float:
+        """Upper bound of the q-th percentile (0-100) in seconds"""
+        if not self.count:
+            return 0.0
+        rank = max(1, int(q / 100 * self.count + 0.5))
+        seen = 0
+        for index, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank:
+                return min(_bucket_upper(index) / 1e9, self.max)
+        return self.max
+
+    def summary(self) -> dict:
+        """Count plus mean/p50/p99/p999/max in microseconds"""
+        return {
+            "count": self.count,
+            "mean_us": self.total / self.count * 1e6 if self.count else 0.0,
+            "p50_us": self.percentile(50) * 1e6,
+            "p99_us": self.percentile(99) * 1e6,
+            "p999_us": self.percentile(99.9) * 1e6,
+            "max_us": self.max * 1e6,
+        }
+
+    def reset(self):
+        self.__init__()
+
+
+class EngineMetrics:
+    """Latency histograms for ingest (per tick, per stage, per batch) and per query method"""
+
+    STAGES = ("registry", "buffer", "window", "extremes", "bars", "quantiles", "indicators", "indexes", "log", "rates", "correlation", "alerts")
+
+    def __init__(self):
+        self.tick = LatencyHistogram()
+        self.batch = LatencyHistogram()
+        self.stages = {stage: LatencyHistogram() for stage in self.STAGES}
+        self.queries = {}   # method name -> LatencyHistogram
+        self.started = time.time()
+        self._last = 0.0    # perf_counter at the end of the previous stage of the current tick
+        self._in_query = threading.local()  # set while a thread runs a timed query
+
+    def start_tick(self, start: float):
+        self._last = start
+
+    def lap(self, stage: str):
+        """Record the time since the previous lap (or start_tick) as stage"""
+        now = time.perf_counter()
+        self.stages[stage].record(now - self._last)
+        self._last = now
+
+    def wrap_query(self, name: str, method):
+        """
+        Return method timed into the histogram for name. Only the outermost timed query
+        on a thread is recorded, so queries built on other queries count once.
+        """
+        histogram = self.queries.setdefault(name, LatencyHistogram())
+        clock = time.perf_counter
+        in_query = self._in_query
+
+        def timed(*args, **kwargs):
+            if getattr(in_query, "active", False):
+                return method(*args, **kwargs)
+            in_query.active = True
+            start = clock()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                histogram.record(clock() - start)
+                in_query.active = False
+        timed.__name__ = name
+        timed.__doc__ = method.__doc__
+        return timed
+
+    def snapshot(self) -> dict:
+        return {
+            "since": self.started,
+            "ingest": self.tick.summary(),
+            "batches": self.batch.summary(),
+            "stages": {stage: h.summary() for stage, h in self.stages.items() if h.count},
+            "queries": {name: h.summary() for name, h in self.queries.items() if h.count},
+        }
+
+    def reset(self):
+        for histogram in (self.tick, self.batch, *self.stages.values(), *self.queries.values()):
+            histogram.reset()
+        self.started = time.time()
@@ -1,111 +1,148 @@
+class RunningExtremes:
+    """Constant-memory all-time min/max tracker, O(1) add"""
+
+    def __init__(self):
+        self.min_val = None
+        self.max_val = None
+        self.size = 0
+
+    def add(self, value):
+        if self.size == 0:
+            self.min_val = self.max_val = value
+        elif value < self.min_val:
+            self.min_val = value
+        elif value > self.max_val:
+            self.max_val = value
+        self.size += 1
+
+    def extend(self, values): # Fold a batch in with one min/max pass
+        if not values:
+            return
+        lo, hi = min(values), max(values)
+        if self.size == 0:
+            self.min_val, self.max_val = lo, hi
+        else:
+            if lo < self.min_val:
+                self.min_val = lo
+            if hi > self.max_val:
+                self.max_val = hi
+        self.size += len(values)
+
+    def get_min(self): # Get minimum value O(1)
+        return self.min_val
+
+    def get_max(self): # Get maximum value O(1)
+        return self.max_val
+
+    def __len__(self):
+        return self.size
+
+
 class MinMaxHeap:
+    """
+    Single-array min-max heap: even levels are min levels, odd levels are max levels.
+    Use when values must also be removed; for all-time extremes prefer RunningExtremes.
+    """
+
     def __init__(self):
-        self.min_heap = []  # For minimum values
-        self.max_heap = []  # For maximum values 
+        self.heap = []
         self.size = 0
-    
-    def _heapify_up_min(self, idx):
-        while idx > 0:
-            parent = (idx - 1) // 2
-            if self.min_heap[idx] < self.min_heap[parent]:
-                self.min_heap[idx], self.min_heap[parent] = self.min_heap[parent], self.min_heap[idx]
-                idx = parent
+
+    @staticmethod
+    def _is_min_level(idx):
+        return (idx + 1).bit_length() % 2 == 1
+
+    def _swap(self, i, j):
+        self.heap[i], self.heap[j] = self.heap[j], self.heap[i]
+
+    def _push_up(self, idx):
+        if idx == 0:
+            return
+        parent = (idx - 1) // 2
+        if self._is_min_level(idx):
+            if self.heap[idx] > self.heap[parent]:
+                self._swap(idx, parent)
+                self._push_up_grand(parent, max_level=True)
             else:
-                break
-    
-    def _heapify_down_min(self, idx):
-        while True:
-            smallest = idx
-            left = 2 * idx + 1
-            right = 2 * idx + 2
-            
-            if left < len(self.min_heap) and self.min_heap[left] < self.min_heap[smallest]:
-                smallest = left
-            
-            if right < len(self.min_heap) and self.min_heap[right] < self.min_heap[smallest]:
-                smallest = right
-            
-            if smallest != idx:
-                self.min_heap[idx], self.min_heap[smallest] = self.min_heap[smallest], self.min_heap[idx]
-                idx = smallest
+                self._push_up_grand(idx, max_level=False)
+        else:
+            if self.heap[idx] < self.heap[parent]:
+                self._swap(idx, parent)
+                self._push_up_grand(parent, max_level=False)
             else:
-                break
-    
-    def _heapify_up_max(self, idx):
-        while idx > 0:
-            parent = (idx - 1) // 2
-            if self.max_heap[idx] > self.max_heap[parent]:
-                self.max_heap[idx], self.max_heap[parent] = self.max_heap[parent], self.max_heap[idx]
-                idx = parent
-            else:
-                break
-    
-    def _heapify_down_max(self, idx):
-        while True:
-            largest = idx
-            left = 2 * idx + 1
-            right = 2 * idx + 2
-            
-            if left < len(self.max_heap) and self.max_heap[left] > self.max_heap[largest]:
-                largest = left
-            
-            if right < len(self.max_heap) and self.max_heap[right] > self.max_heap[largest]:
-                largest = right
-            
-            if largest != idx:
-                self.max_heap[idx], self.max_heap[largest] = self.max_heap[largest], self.max_heap[idx]
-                idx = largest
+                self._push_up_grand(idx, max_level=True)
+
+    def _push_up_grand(self, idx, max_level):
+        while idx > 2:
+            grand = ((idx - 1) // 2 - 1) // 2
+            if (self.heap[idx] > self.heap[grand]) if max_level else (self.heap[idx] < self.heap[grand]):
+                self._swap(idx, grand)
+                idx = grand
             else:
                 break
-    
-    def add(self, value): # Add value to both heaps
-        self.min_heap.append(value)
-        self.max_heap.append(value)
-        
-        self._heapify_up_min(len(self.min_heap) - 1)
-        self._heapify_up_max(len(self.max_heap) - 1)
-        
+
+    def _push_down(self, idx):
+        max_level = not self._is_min_level(idx)
+        better = (lambda a, b: a > b) if max_level else (lambda a, b: a < b)
+        n = len(self.heap)
+        while 2 * idx + 1 < n:
+            # best among children and grandchildren
+            first_child = 2 * idx + 1
+            candidates = [first_child, first_child + 1,
+                          2 * first_child + 1, 2 * first_child + 2,
+                          2 * first_child + 3, 2 * first_child + 4]
+            best = first_child
+            for c in candidates[1:]:
+                if c < n and better(self.heap[c], self.heap[best]):
+                    best = c
+
+            if best <= first_child + 1: # child
+                if better(self.heap[best], self.heap[idx]):
+                    self._swap(best, idx)
+                return
+
+            if not better(self.heap[best], self.heap[idx]):
+                return
+            self._swap(best, idx)
+            parent = (best - 1) // 2
+            if better(self.heap[parent], self.heap[best]):
+                self._swap(best, parent)
+            idx = best
+
+    def _max_index(self):
+        if len(self.heap) <= 2:
+            return len(self.heap) - 1
+        return 1 if self.heap[1] >= self.heap[2] else 2
+
+    def add(self, value): # Add value O(log n)
+        self.heap.append(value)
         self.size += 1
-    
+        self._push_up(self.size - 1)
+
     def get_min(self): # Get minimum value O(1)
-        return self.min_heap[0] if self.min_heap else None
-    
+        return self.heap[0] if self.heap else None
+
     def get_max(self): # Get maximum value O(1)
-        return self.max_heap[0] if self.max_heap else None
-    
+        return self.heap[self._max_index()] if self.heap else None
+
+    def _remove_at(self, idx):
+        value = self.heap[idx]
+        last = self.heap.pop()
+        self.size -= 1
+        if idx < self.size:
+            self.heap[idx] = last
+            self._push_down(idx)
+        return value
+
     def remove_min(self): # Remove and return minimum value O(log n)
-        if not self.min_heap:
+        if not self.heap:
             return None
-        
-        min_val = self.min_heap[0]
-        self.min_heap[0] = self.min_heap[-1]
-        self.min_heap.pop()
-        
-        # Remove from max heap too
-        self.max_heap.remove(min_val)
-        
-        if self.min_heap:
-            self._heapify_down_min(0)
-        
-        self.size -= 1
-        return min_val
-    
+        return self._remove_at(0)
+
     def remove_max(self): # Remove and return maximum value O(log n)
-        if not self.max_heap:
+        if not self.heap:
             return None
-        
-        max_val = self.max_heap[0]
-        self.max_heap[0] = self.max_heap[-1]
-        self.max_heap.pop()
-        
-        # Remove from min heap too
-        self.min_heap.remove(max_val)
-        
-        if self.max_heap:
-            self._heapify_down_max(0)
-        
-        self.size -= 1
-        return max_val
-    
+        return self._remove_at(self._max_index())
+
     def __len__(self):
-        return self.size
\ No newline at end of file
+        return self.size
@@ -1,8 +1,14 @@
 """Min-heap based priority queue for processing events"""
 class PriorityQueue:
+    """
+    Entries are [priority, seq, item, key]. seq breaks priority ties in FIFO order,
+    and a key -> heap position map gives O(log n) cancel and update.
+    """
     def __init__(self):
         self.heap = []
         self.size = 0
+        self.positions = {}  # key -> index in heap
+        self.counter = 0     # insertion order, for FIFO tie-breaking
     
     def _parent(self, idx):
         return (idx - 1) // 2
@@ -12,14 +18,20 @@ class PriorityQueue:
     
     def _right_child(self, idx):
         return 2 * idx + 2
+
+    def _less(self, i, j):
+        a, b = self.heap[i], self.heap[j]
+        return a[0] < b[0] or (a[0] == b[0] and a[1] < b[1])
     
     def _swap(self, i, j):
         self.heap[i], self.heap[j] = self.heap[j], self.heap[i]
+        self.positions[self.heap[i][3]] = i
+        self.positions[self.heap[j][3]] = j
     
     def _heapify_up(self, idx):
         while idx > 0:
             parent = self._parent(idx)
-            if self.heap[idx][0] < self.heap[parent][0]:
+            if self._less(idx, parent):
                 self._swap(idx, parent)
                 idx = parent
             else:
@@ -31,10 +43,10 @@ class PriorityQueue:
             left = self._left_child(idx)
             right = self._right_child(idx)
             
-            if left < self.size and self.heap[left][0] < self.heap[smallest][0]:
+            if left < self.size and self._less(left, smallest):
                 smallest = left
             
-            if right < self.size and self.heap[right][0] < self.heap[smallest][0]:
+            if right < self.size and self._less(right, smallest):
                 smallest = right
             
             if smallest != idx:
@@ -42,34 +54,95 @@ class PriorityQueue:
                 idx = smallest
             else:
                 break
+
+    def _new_entry(self, priority, item, key=None):
+        seq = self.counter
+        self.counter += 1
+        if key is None:
+            key = ("seq", seq)
+        elif key in self.positions:
+            raise KeyError(f"key already queued: {key!r}")
+        return [priority, seq, item, key]
     
-    def push(self, priority, item): # Add item with priority
-        self.heap.append((priority, item))
+    def push(self, priority, item, key=None): # Add item with priority, returns its key
+        entry = self._new_entry(priority, item, key)
+        self.heap.append(entry)
+        self.positions[entry[3]] = self.size
         self.size += 1
         self._heapify_up(self.size - 1)
+        return entry[3]
+
+    def push_many(self, entries): # Bulk add (priority, item) or (priority, item, key), O(n) heapify
+        keys = []
+        for entry in entries:
+            entry = self._new_entry(*entry)
+            self.positions[entry[3]] = len(self.heap)
+            self.heap.append(entry)
+            keys.append(entry[3])
+        self.size = len(self.heap)
+        for idx in range(self.size // 2 - 1, -1, -1):
+            self._heapify_down(idx)
+        return keys
+
+    def _remove_at(self, idx):
+        entry = self.heap[idx]
+        last = self.heap.pop()
+        self.size -= 1
+        del self.positions[entry[3]]
+        if idx < self.size:
+            self.heap[idx] = last
+            self.positions[last[3]] = idx
+            self._heapify_down(idx)
+            self._heapify_up(idx)
+        return entry
     
     def pop(self): # Remove and return highest priority item
         if self.size == 0:
             return None
-        
-        if self.size == 1:
-            self.size = 0
-            return self.heap.pop()[1]
-        
-        # Get the root (highest priority)
-        root = self.heap[0][1]
-        
-        # Move last element to root
-        self.heap[0] = self.heap.pop()
-        self.size -= 1
-        
-        # Restore heap property
+        return self._remove_at(0)[2]
+
+    def replace(self, priority, item, key=None): # Pop the top item and push a new one with a single sift, returns the popped item
+        if self.size == 0:
+            self.push(priority, item, key)
+            return None
+        top = self.heap[0]
+        entry = self._new_entry(priority, item, key) if key != top[3] else [priority, top[1], item, key]
+        del self.positions[top[3]]
+        self.heap[0] = entry
+        self.positions[entry[3]] = 0
         self._heapify_down(0)
-        
-        return root
+        return top[2]
+
+    def cancel(self, key): # Remove a queued item by key O(log n), returns it or None
+        idx = self.positions.get(key)
+        if idx is None:
+            return None
+        return self._remove_at(idx)[2]
+
+    def update(self, key, priority=None, item=None): # Change a queued item's priority and/or payload O(log n)
+        idx = self.positions.get(key)
+        if idx is None:
+            return False
+        entry = self.heap[idx]
+        if item is not None:
+            entry[2] = item
+        if priority is not None and priority != entry[0]:
+            entry[0] = priority
+            self._heapify_down(idx)
+            self._heapify_up(self.positions[key])
+        return True
+
+    def get(self, key): # Queued (priority, item) for key, or None
+        idx = self.positions.get(key)
+        if idx is None:
+            return None
+        return (self.heap[idx][0], self.heap[idx][2])
+
+    def __contains__(self, key):
+        return key in self.positions
     
     def peek(self): # Get highest priority item without removing
-        return self.heap[0][1] if self.size > 0 else None
+        return self.heap[0][2] if self.size > 0 else None
     
     def is_empty(self):
         return self.size == 0
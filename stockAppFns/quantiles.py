@@ -0,0 +1,173 @@
+import math
+from collections import deque
+import numpy as np
+
+class TDigest:
+    """
+    Mergeable quantile sketch (t-digest). Values are buffered and folded into at most
+    about `compression` weighted centroids, kept small near the tails so extreme
+    quantiles stay accurate. Memory is bounded and add() is O(1) amortized.
+    """
+
+    def __init__(self, compression: int = 100):
+        self.compression = compression
+        self.buffer_size = 5 * compression
+        self.means = np.empty(0)
+        self.weights = np.empty(0)
+        self.buffer = []   # values not yet folded into centroids
+        self.count = 0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, value: float):
+        self.buffer.append(value)
+        self.count += 1
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        if len(self.buffer) >= self.buffer_size:
+            self._compress()
+
+    def extend(self, values):
+        values = np.asarray(values, dtype=np.float64)
+        if not len(values):
+            return
+        self.count += len(values)
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+        # compress at the same points add() would, so batch and per-value results match
+        i = 0
+        while i < len(values):
+            j = i + self.buffer_size - len(self.buffer)
+            self.buffer.extend(values[i:j].tolist())
+            i = j
+            if len(self.buffer) >= self.buffer_size:
+                self._compress()
+
+    def _fold(self, means, weights, buffer, extra_means=None, extra_weights=None):
+        """Centroids of existing centroids, buffered values and optional extra centroids; touches no state"""
+        parts_m, parts_w = [means], [weights]
+        if buffer:
+            parts_m.append(np.asarray(buffer, dtype=np.float64))
+            parts_w.append(np.ones(len(buffer)))
+        if extra_means is not None:
+            parts_m.append(extra_means)
+            parts_w.append(extra_weights)
+        means, weights = np.concatenate(parts_m), np.concatenate(parts_w)
+        if not len(means):
+            return means, weights
+        order = np.argsort(means, kind="stable")
+        means, weights = means[order], weights[order]
+
+        # a centroid covers at most one unit of the scale k(q) = compression / pi * asin(2q - 1)
+        cumulative = np.cumsum(weights)
+        left = (cumulative - weights) / cumulative[-1]
+        k = np.floor(self.compression / math.pi * np.arcsin(2 * left - 1))
+        starts = np.flatnonzero(np.concatenate(([True], k[1:] != k[:-1])))
+        folded = np.add.reduceat(weights, starts)
+        return np.add.reduceat(means * weights, starts) / folded, folded
+
+    def _compress(self, means=None, weights=None):
+        """Fold buffer, current centroids and optional extra centroids into new centroids (writer only)"""
+        buffer, self.buffer = self.buffer, []
+        self.means, self.weights = self._fold(self.means, self.weights, buffer, means, weights)
+
+    def centroids(self):
+        """
+        (means, weights) arrays with everything folded in. Works on copies, so readers
+        can call it while the writer adds values; the digest itself is left unchanged.
+        """
+        means, weights, buffer = self.means, self.weights, list(self.buffer)
+        if not buffer:
+            return means, weights
+        return self._fold(means, weights, buffer)
+
+    def merge(self, other: "TDigest"):
+        """Fold another digest into this one"""
+        if not other.count:
+            return self
+        means, weights = other.centroids()
+        self.count += other.count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self._compress(means, weights)
+        return self
+
+    def copy(self) -> "TDigest":
+        """Independent digest with the same contents; does not modify this one"""
+        digest = TDigest(self.compression)
+        digest.means, digest.weights = self.centroids()
+        digest.count, digest.min, digest.max = self.count, self.min, self.max
+        return digest
+
+    def quantile(self, q: float):
+        """Estimated q-quantile (0 <= q <= 1), None if empty"""
+        return self.quantiles([q])[0]
+
+    def quantiles(self, qs) -> list:
+        if not self.count:
+            return [None] * len(qs)
+        means, weights = self.centroids()
+        total = weights.sum()
+        # interpolate between centroid centres, pinned to the exact min and max
+        centres = np.concatenate(([0.0], np.cumsum(weights) - weights / 2, [total]))
+        values = np.concatenate(([self.min], means, [self.max]))
+        return np.interp(np.asarray(qs, dtype=np.float64) * total, centres, values).tolist()
+
+    def __len__(self):
+        return self.count
+
+
+class RollingQuantiles:
+    """
+    Quantiles of roughly the last `window` values: a ring of t-digests, each filled
+    with window / buckets values. The oldest digest is dropped whole, so the covered
+    span is between window - window / buckets and window values.
+    """
+
+    def __init__(self, window: int, buckets: int = 8, compression: int = 50):
+        self.window = window
+        self.compression = compression
+        self.span = max(1, math.ceil(window / buckets))
+        self.closed = deque(maxlen=max(1, buckets - 1))  # full digests, oldest first
+        self.current = TDigest(compression)
+        self.rotations = 0
+        self._merged = None   # (rotations, merge of self.closed) cached by readers
+
+    def _rotate(self):
+        self.closed.append(self.current)
+        self.current = TDigest(self.compression)
+        self.rotations += 1
+
+    def add(self, value: float):
+        if self.current.count >= self.span:
+            self._rotate()
+        self.current.add(value)
+
+    def extend(self, values):
+        values = np.asarray(values, dtype=np.float64)
+        i = 0
+        while i < len(values):
+            if self.current.count >= self.span:
+                self._rotate()
+            j = i + self.span - self.current.count
+            self.current.extend(values[i:j])
+            i = j
+
+    def digest(self) -> TDigest:
+        """Merged t-digest of the covered values, built from copies so the writer is never disturbed"""
+        rotations, current = self.rotations, self.current
+        cached = self._merged
+        if cached is None or cached[0] != rotations:
+            merged = TDigest(self.compression)
+            for digest in list(self.closed):
+                merged.merge(digest)
+            cached = self._merged = (rotations, merged)  # tagged, so a stale build is never reused
+        return cached[1].copy().merge(current)
+
+    def quantiles(self, qs) -> list:
+        return self.digest().quantiles(qs)
+
+    def __len__(self):
+        return sum(d.count for d in self.closed) + self.current.count
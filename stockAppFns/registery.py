@@ -1,31 +1,100 @@
-from stockAppFns import hashtable, circular_buffer, sliding_window, min_max_heap
+from stockAppFns import hashtable, circular_buffer, sliding_window, min_max_heap, bars, quantiles, indicators
 
 class SymbolRegistry:
     """
     For each symbol having
-      - CircularBuffer (recent prices)
+      - CircularBuffer (recent prices), ColumnarCircularBuffer when columnar=True
       - SlidingWindow (for rolling stats)
-      - MinMaxHeap (to track global min/max)
+      - RunningExtremes (to track global min/max in constant memory)
+      - TimeWindow per configured span (rolling stats over the last N seconds)
+      - BarSeries per configured resolution (OHLCV bars)
+      - TDigest (all-time) and RollingQuantiles (last window_size prices) when quantiles=True
+      - Indicators configured for that symbol, by spec (see indicators.py); global specs
+        are attached by the engine on the symbol's first indicator read
+    Symbols are interned into dense integer ids (registration order), so per-symbol
+    state can also be addressed by id.
     """
     
-    def __init__(self, buffer_size=100, window_size=50):
+    def __init__(self, buffer_size=100, window_size=50, columnar=False, time_windows=(), bar_resolutions=(), bar_capacity=100,
+                 buffer_sizes=None, quantiles=False, indicator_specs=()):
         self.symbols = hashtable.HashTable()
         self.buffer_size = buffer_size
+        self.buffer_sizes = dict(buffer_sizes or {})  # symbol -> buffer capacity overriding buffer_size
         self.window_size = window_size
+        self.columnar = columnar
+        self.time_windows = tuple(time_windows)  # spans in seconds
+        self.bar_resolutions = tuple(bar_resolutions)  # seconds per bar
+        self.bar_capacity = bar_capacity
+        self.quantiles = quantiles
+        self.indicator_specs = list(indicator_specs)  # indicators offered for every symbol, attached on first read
+        self.symbol_indicators = {}  # symbol -> indicator specs attached to that symbol only
+        self.names = []         # id -> symbol
+        self.by_id = []         # id -> symbol-dict
 
-    def register(self, symbol: str): # Register a new symbol with initialized structures if not already registered
-        if not self.symbols.contains(symbol):
-            self.symbols.put(symbol, {            # putting symbol-dict inside hashtable
-                "buffer": circular_buffer.CircularBuffer(self.buffer_size),
+    def config(self) -> dict:
+        """Settings that shape the per-symbol structures; state built under other settings is not reusable"""
+        return {
+            "buffer_size": self.buffer_size,
+            "buffer_sizes": self.buffer_sizes,
+            "window_size": self.window_size,
+            "columnar": self.columnar,
+            "time_windows": self.time_windows,
+            "bar_resolutions": self.bar_resolutions,
+            "bar_capacity": self.bar_capacity,
+            "quantiles": self.quantiles,
+        }
+
+    def _new_buffer(self, symbol):
+        size = self.buffer_sizes.get(symbol, self.buffer_size)
+        if self.columnar:
+            return circular_buffer.ColumnarCircularBuffer(size)
+        return circular_buffer.CircularBuffer(size)
+
+    def get_or_create(self, symbol: str) -> dict: # Resolve a symbol with a single lookup, creating it on first sight
+        symbol_data = self.symbols.get(symbol)
+        if symbol_data is None:
+            symbol_data = {
+                "id": len(self.names),
+                "seq": 0,               # even = stable, odd = write in progress
+                "version": 0,           # engine version of the last write
+                "session_start": None,  # start time of the current session
+                "session_open": None,   # first price of the current session
+                "buffer": self._new_buffer(symbol),
                 "stats": sliding_window.SlidingWindow(self.window_size),
-                "extremes": min_max_heap.MinMaxHeap()
-            })
+                "extremes": min_max_heap.RunningExtremes(),
+                "time_windows": {span: sliding_window.TimeWindow(span) for span in self.time_windows},
+                "bars": {res: bars.BarSeries(res, self.bar_capacity) for res in self.bar_resolutions},
+                "digest": quantiles.TDigest() if self.quantiles else None,
+                "rolling_digest": quantiles.RollingQuantiles(self.window_size) if self.quantiles else None,
+                "indicators": {spec: indicators.create(spec)   # spec -> Indicator, replaced (never mutated) on attach
+                               for spec in self.symbol_indicators.get(symbol, [])}
+            }
+            self.symbols.put(symbol, symbol_data)   # putting symbol-dict inside hashtable
+            self.names.append(symbol)
+            self.by_id.append(symbol_data)
+        return symbol_data
+
+    def register(self, symbol: str) -> int: # Register a new symbol with initialized structures if not already registered
+        return self.get_or_create(symbol)["id"]
 
     def get_symbol_data(self, symbol: str) -> dict: # Retrieve data associated with a symbol
         return self.symbols.get(symbol)
 
+    def get_by_id(self, symbol_id: int) -> dict: # Retrieve data by interned id, O(1) list index
+        return self.by_id[symbol_id]
+
+    def symbol_id(self, symbol: str): # Interned id of a symbol, None if unknown
+        symbol_data = self.symbols.get(symbol)
+        return symbol_data["id"] if symbol_data is not None else None
+
+    def symbol_name(self, symbol_id: int) -> str:
+        return self.names[symbol_id]
+
     def exists(self, symbol: str) -> bool: # Check if a symbol is already registered
         return self.symbols.contains(symbol)
 
-    def all_symbols(self) -> list: # List all registered symbols
-        return self.symbols.keys()
+    def all_symbols(self) -> list: # List all registered symbols, in id order
+        return list(self.names)
+
+    def __len__(self):
+        return len(self.names)
@@ -1,4 +1,36 @@
 from collections import deque
+import math
+
+class _RunningMoments:
+    """Welford mean/variance over a bounded window, updated in O(1) per add/evict"""
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def add(self, value, evicted=None):
+        if evicted is None:
+            self.count += 1
+            delta = value - self.mean
+            self.mean += delta / self.count
+            self.m2 += delta * (value - self.mean)
+        else: # replace evicted with value, count unchanged
+            old_mean = self.mean
+            self.mean += (value - evicted) / self.count
+            self.m2 += (value - evicted) * (value - self.mean + evicted - old_mean)
+        if self.m2 < 0: # guard against rounding drift
+            self.m2 = 0.0
+
+    def variance(self, ddof=0):
+        return self.m2 / (self.count - ddof) if self.count > ddof else 0.0
+
+    def recompute(self, values):
+        """Exact two-pass mean/m2 of the current window, dropping accumulated rounding drift"""
+        self.count = len(values)
+        self.mean = math.fsum(values) / self.count if self.count else 0.0
+        self.m2 = math.fsum((value - self.mean) ** 2 for value in values)
+
 
 class SlidingWindow:
     """Efficient sliding window for moving calculations"""
@@ -9,28 +41,70 @@ class SlidingWindow:
         self.sum = 0.0
         self.min_val = float('inf')
         self.max_val = float('-inf')
+        self.count = 0  # total values ever added, used as a position for the extreme deques
+        self._min_deque = deque()  # (position, value), values increasing
+        self._max_deque = deque()  # (position, value), values decreasing
+        self._moments = _RunningMoments()
+        self._returns = deque(maxlen=max(size - 1, 1))
+        self._return_moments = _RunningMoments()
     
     def add(self, value):
-        """Add value to window"""
+        """Add value to window, amortized O(1)"""
+        evicted = None
         if len(self.window) == self.size:
             # Remove oldest value from sum
-            old_val = self.window[0]
-            self.sum -= old_val
-        
+            evicted = self.window[0]
+            self.sum -= evicted
+
+        if self.window and self.size > 1:
+            self._add_return(self.window[-1], value)
+
         self.window.append(value)
         self.sum += value
+        self._moments.add(value, evicted)
         
         # Update min/max efficiently
-        self._update_extremes()
+        self._update_extremes(value)
+        self.count += 1
+        if self.count % self.size == 0: # once per window length, so still amortized O(1)
+            self.sum = math.fsum(self.window)
+            self._moments.recompute(self.window)
+            self._return_moments.recompute(self._returns)
+
+    def extend(self, values):
+        """Add many values in order; same result as calling add for each"""
+        add = self.add
+        for value in values:
+            add(value)
+
+    def _add_return(self, prev, value):
+        """Track tick-to-tick returns of the values inside the window"""
+        if prev == 0:
+            return
+        ret = value / prev - 1
+        evicted = self._returns[0] if len(self._returns) == self._returns.maxlen else None
+        self._returns.append(ret)
+        self._return_moments.add(ret, evicted)
     
-    def _update_extremes(self):
-        """Update min/max values in window"""
-        if len(self.window) == 0:
-            self.min_val = float('inf')
-            self.max_val = float('-inf')
-        else:
-            self.min_val = min(self.window)
-            self.max_val = max(self.window)
+    def _update_extremes(self, value):
+        """Update min/max with monotonic deques"""
+        pos = self.count
+        while self._min_deque and self._min_deque[-1][1] >= value:
+            self._min_deque.pop()
+        self._min_deque.append((pos, value))
+        while self._max_deque and self._max_deque[-1][1] <= value:
+            self._max_deque.pop()
+        self._max_deque.append((pos, value))
+
+        # Drop positions that slid out of the window
+        oldest = pos - self.size + 1
+        if self._min_deque[0][0] < oldest:
+            self._min_deque.popleft()
+        if self._max_deque[0][0] < oldest:
+            self._max_deque.popleft()
+
+        self.min_val = self._min_deque[0][1]
+        self.max_val = self._max_deque[0][1]
     
     def get_average(self):
         """Get moving average O(1)"""
@@ -47,6 +121,20 @@ class SlidingWindow:
     def get_range(self):
         """Get price range (max - min)"""
         return self.max_val - self.min_val if self.window else 0
+
+    def get_variance(self, ddof=0):
+        """Get variance of values in window O(1)"""
+        return self._moments.variance(ddof) if self.window else None
+
+    def get_std(self, ddof=0):
+        """Get standard deviation of values in window O(1)"""
+        return math.sqrt(self._moments.variance(ddof)) if self.window else None
+
+    def get_volatility(self):
+        """Get standard deviation of tick-to-tick returns in window O(1)"""
+        if len(self._returns) < 2:
+            return None
+        return math.sqrt(self._return_moments.variance(ddof=1))
     
     def get_values(self):
         """Get all values in window"""
@@ -58,3 +146,68 @@ class SlidingWindow:
     
     def __len__(self):
         return len(self.window)
+
+
+class TimeWindow:
+    """Rolling stats over the ticks of the last span seconds, amortized O(1) per add"""
+
+    def __init__(self, span: float):
+        self.span = span
+        self.window = deque()  # (timestamp, value), oldest first
+        self.sum = 0.0
+        self.last_timestamp = None
+        self._min_deque = deque()  # (timestamp, value), values increasing
+        self._max_deque = deque()  # (timestamp, value), values decreasing
+
+    def add(self, value, timestamp):
+        """Add a tick and evict ticks older than timestamp - span"""
+        self.window.append((timestamp, value))
+        self.sum += value
+        while self._min_deque and self._min_deque[-1][1] >= value:
+            self._min_deque.pop()
+        self._min_deque.append((timestamp, value))
+        while self._max_deque and self._max_deque[-1][1] <= value:
+            self._max_deque.pop()
+        self._max_deque.append((timestamp, value))
+        self.last_timestamp = timestamp
+        self._evict(timestamp - self.span)
+
+    def extend(self, values, timestamps):
+        """Add many ticks in order; same result as calling add for each"""
+        add = self.add
+        for value, timestamp in zip(values, timestamps):
+            add(value, timestamp)
+
+    def expire(self, now: float):
+        """Evict ticks that fell out of the window by wall-clock time now"""
+        self._evict(now - self.span)
+
+    def _evict(self, cutoff):
+        window = self.window
+        while window and window[0][0] <= cutoff:
+            self.sum -= window.popleft()[1]
+        if not window:
+            self.sum = 0.0  # drop accumulated rounding error
+        while self._min_deque and self._min_deque[0][0] <= cutoff:
+            self._min_deque.popleft()
+        while self._max_deque and self._max_deque[0][0] <= cutoff:
+            self._max_deque.popleft()
+
+    def get_sum(self):
+        return self.sum
+
+    def get_average(self):
+        """Get average over the time window O(1)"""
+        return self.sum / len(self.window) if self.window else 0
+
+    def get_min(self):
+        return self._min_deque[0][1] if self.window else None
+
+    def get_max(self):
+        return self._max_deque[0][1] if self.window else None
+
+    def get_range(self):
+        return self._max_deque[0][1] - self._min_deque[0][1] if self.window else 0
+
+    def __len__(self):
+        return len(self.window)
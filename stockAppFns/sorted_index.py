@@ -0,0 +1,119 @@
+from bisect import bisect_left, bisect_right, insort
+
+class SortedIndex:
+    """
+    Keys ordered by a numeric value, stored as (value, key) pairs in sorted blocks
+    of bounded size. Update is O(log n) search plus a small in-block shift;
+    range queries are O(log n + k).
+    """
+
+    def __init__(self, load: int = 256):
+        self.load = load
+        self.blocks = []    # sorted lists of (value, key)
+        self.maxes = []     # last pair of each block, for locating blocks
+        self.values = {}    # key -> current value
+
+    def _insert(self, item):
+        if not self.blocks:
+            self.blocks.append([item])
+            self.maxes.append(item)
+            return
+        i = bisect_left(self.maxes, item)
+        if i == len(self.maxes):
+            i -= 1
+        block = self.blocks[i]
+        insort(block, item)
+        self.maxes[i] = block[-1]
+        if len(block) > 2 * self.load: # split oversized block
+            self.blocks[i:i + 1] = [block[:self.load], block[self.load:]]
+            self.maxes[i:i + 1] = [block[self.load - 1], block[-1]]
+
+    def _remove(self, item):
+        i = bisect_left(self.maxes, item)
+        block = self.blocks[i]
+        del block[bisect_left(block, item)]
+        if block:
+            self.maxes[i] = block[-1]
+        else:
+            del self.blocks[i]
+            del self.maxes[i]
+
+    def update(self, key, value): # Insert key or move it to its new value
+        old = self.values.get(key)
+        if old is not None:
+            if old == value:
+                return
+            self._remove((old, key))
+        self.values[key] = value
+        self._insert((value, key))
+
+    def discard(self, key):
+        old = self.values.pop(key, None)
+        if old is not None:
+            self._remove((old, key))
+
+    def get(self, key):
+        return self.values.get(key)
+
+    def _position(self, item, right: bool):
+        """(block, offset) of the first pair > item (right) or >= item (left)"""
+        find = bisect_right if right else bisect_left
+        i = find(self.maxes, item)
+        if i == len(self.blocks):
+            return i, 0
+        return i, find(self.blocks[i], item)
+
+    def _slice(self, start, stop) -> list:
+        if start >= stop: # empty or inverted range
+            return []
+        (bi, oi), (bj, oj) = start, stop
+        if bi == bj:
+            return self.blocks[bi][oi:oj] if bi < len(self.blocks) else []
+        result = self.blocks[bi][oi:]
+        for block in self.blocks[bi + 1:bj]:
+            result.extend(block)
+        if bj < len(self.blocks):
+            result.extend(self.blocks[bj][:oj])
+        return result
+
+    def range(self, low=None, high=None, inclusive=(True, True)) -> list:
+        """(value, key) pairs with low <= value <= high (bounds optional), ascending"""
+        if low is None:
+            start = (0, 0)
+        else:
+            # keys never compare with +/-inf, so these sentinels sit before/after every key of equal value
+            start = self._position((low, float('-inf')) if inclusive[0] else (low, float('inf')), right=True)
+        if high is None:
+            stop = (len(self.blocks), 0)
+        else:
+            stop = self._position((high, float('inf')) if inclusive[1] else (high, float('-inf')), right=False)
+        return self._slice(start, stop)
+
+    def smallest(self, k: int) -> list:
+        """The k pairs with the lowest values, ascending, O(k)"""
+        result = []
+        for block in self.blocks:
+            if len(result) >= k:
+                break
+            result.extend(block[:k - len(result)])
+        return result
+
+    def largest(self, k: int) -> list:
+        """The k pairs with the highest values, descending, O(k)"""
+        result = []
+        for block in reversed(self.blocks):
+            if len(result) >= k:
+                break
+            result.extend(block[:-(k - len(result)) - 1:-1])
+        return result
+
+    def above(self, threshold) -> list:
+        """Pairs with value > threshold"""
+        return self.range(threshold, None, inclusive=(False, True))
+
+    def below(self, threshold) -> list:
+        """Pairs with value < threshold"""
+        return self.range(None, threshold, inclusive=(True, False))
+
+    def __len__(self):
+        return len(self.values)
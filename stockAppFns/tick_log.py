@@ -0,0 +1,148 @@
+import os
+import pickle
+import threading
+import time
+import numpy as np
+
+# one fixed-size record per tick, so the log can be read back as a numpy memmap
+TICK_DTYPE = np.dtype([("id", "<u4"), ("price", "<f8"), ("volume", "<f8"), ("timestamp", "<f8")])
+
+TICKS_FILE = "ticks.log"
+SYMBOLS_FILE = "symbols.log"   # one symbol per line, line number = symbol id
+CHECKPOINT_FILE = "checkpoint.pkl"
+
+class TickLog:
+    """
+    Append-only binary tick log with group commit: records are buffered and written
+    plus fsynced once group_size ticks are pending or fsync_interval seconds passed.
+    A flusher thread commits ticks left pending when the feed goes quiet, so no
+    appended tick waits much longer than fsync_interval to reach disk.
+    """
+
+    def __init__(self, directory: str, group_size: int = 4096, fsync_interval: float = 0.05):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.group_size = group_size
+        self.fsync_interval = fsync_interval
+        self.ticks = open(os.path.join(directory, TICKS_FILE), "ab")
+        self.symbols = open(os.path.join(directory, SYMBOLS_FILE), "a", encoding="utf-8")
+        # a torn record from a crash is dropped on read; start the next record on a boundary
+        extra = self.ticks.tell() % TICK_DTYPE.itemsize
+        if extra:
+            self.ticks.truncate(self.ticks.tell() - extra)
+            self.ticks.seek(0, os.SEEK_END)
+        self.committed = self.ticks.tell() // TICK_DTYPE.itemsize
+        self.pending = []          # (id, price, volume, timestamp) single ticks
+        self.pending_arrays = []   # structured arrays from batches, in order with single ticks
+        self.pending_count = 0
+        self.pending_symbols = []
+        self.last_commit = time.monotonic()
+        self.commits = 0
+        self.lock = threading.Lock()  # shared with the flusher thread
+        self._closed = threading.Event()
+        self._flusher = threading.Thread(target=self._flush_idle, daemon=True)
+        self._flusher.start()
+
+    def _flush_idle(self):
+        while not self._closed.wait(self.fsync_interval):
+            with self.lock:
+                if (self.pending_count or self.pending_symbols) and \
+                        time.monotonic() - self.last_commit >= self.fsync_interval:
+                    self._commit()
+
+    def define_symbol(self, symbol_id: int, symbol: str):
+        """Record a new symbol; ids must arrive in order 0, 1, 2, ..."""
+        with self.lock:
+            self.pending_symbols.append(symbol)
+
+    def append(self, symbol_id: int, price: float, volume: float, timestamp: float):
+        with self.lock:
+            self.pending.append((symbol_id, price, volume, timestamp))
+            self.pending_count += 1
+            self._maybe_commit()
+
+    def append_batch(self, ids, prices, volumes, timestamps):
+        records = np.empty(len(ids), dtype=TICK_DTYPE)
+        records["id"] = ids
+        records["price"] = prices
+        records["volume"] = volumes
+        records["timestamp"] = timestamps
+        with self.lock:
+            self._seal()
+            self.pending_arrays.append(records)
+            self.pending_count += len(records)
+            self._maybe_commit()
+
+    def _seal(self):
+        if self.pending:
+            self.pending_arrays.append(np.array(self.pending, dtype=TICK_DTYPE))
+            self.pending = []
+
+    def _maybe_commit(self):
+        if self.pending_count >= self.group_size or time.monotonic() - self.last_commit >= self.fsync_interval:
+            self._commit()
+
+    def commit(self):
+        """Write and fsync everything pending; symbols go first so every tick can be resolved"""
+        with self.lock:
+            self._commit()
+
+    def _commit(self):
+        if self.pending_symbols:
+            self.symbols.write("".join(symbol + "\n" for symbol in self.pending_symbols))
+            self.symbols.flush()
+            os.fsync(self.symbols.fileno())
+            self.pending_symbols = []
+        self._seal()
+        if self.pending_arrays:
+            for records in self.pending_arrays:
+                self.ticks.write(records.tobytes())
+            self.ticks.flush()
+            os.fsync(self.ticks.fileno())
+            self.committed += self.pending_count
+            self.pending_arrays = []
+            self.pending_count = 0
+            self.commits += 1
+        self.last_commit = time.monotonic()
+
+    def close(self):
+        self._closed.set()
+        self._flusher.join()
+        self.commit()
+        self.ticks.close()
+        self.symbols.close()
+
+
+def read_symbols(directory: str) -> list:
+    path = os.path.join(directory, SYMBOLS_FILE)
+    if not os.path.exists(path):
+        return []
+    with open(path, encoding="utf-8") as f:
+        return f.read().splitlines()
+
+def read_ticks(directory: str, start: int = 0):
+    """Memory-mapped structured array of committed ticks from record start on"""
+    path = os.path.join(directory, TICKS_FILE)
+    if not os.path.exists(path):
+        return np.empty(0, dtype=TICK_DTYPE)
+    count = os.path.getsize(path) // TICK_DTYPE.itemsize
+    if count <= start:
+        return np.empty(0, dtype=TICK_DTYPE)
+    return np.memmap(path, dtype=TICK_DTYPE, mode="r", offset=start * TICK_DTYPE.itemsize, shape=(count - start,))
+
+def write_checkpoint(directory: str, state: dict):
+    """Atomically replace the checkpoint (write to a temp file, fsync, rename)"""
+    path = os.path.join(directory, CHECKPOINT_FILE)
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+def read_checkpoint(directory: str):
+    path = os.path.join(directory, CHECKPOINT_FILE)
+    if not os.path.exists(path):
+        return None
+    with open(path, "rb") as f:
+        return pickle.load(f)
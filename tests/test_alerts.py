@@ -0,0 +1,108 @@
+import sys
+import threading
+import pytest
+from data_engine import RealTimeDataEngine
+
+def _fired(engine):
+    events = []
+    while True:
+        event = engine.events.process_next()
+        if event is None:
+            return events
+        events.append(event)
+
+@pytest.fixture
+def engine():
+    engine = RealTimeDataEngine(window_size=3)
+    engine.events.add_handler(lambda event: None)
+    return engine
+
+def test_level_alerts_fire_on_crossing_only(engine):
+    engine.ingest("A", 100.0, 1, 1.0)
+    above = engine.add_alert("A", "above", 105.0)
+    below = engine.add_alert("A", "below", 95.0, priority=0)
+    for i, price in enumerate((104.0, 106.0, 107.0, 104.0, 106.0, 94.0)):
+        engine.ingest("A", price, 1, 2.0 + i)
+    fired = [(event["alert_id"], event["price"]) for event in _fired(engine)]
+    # the two crossings of 105 are coalesced into one queued event; the below alert has priority 0
+    assert fired == [(below, 94.0), (above, 106.0)]
+
+def test_pct_move_rearms_at_the_new_price(engine):
+    engine.ingest("A", 100.0, 1, 1.0)
+    alert = engine.add_alert("A", "pct_move", 10.0, direction="up")
+    for i, price in enumerate((109.0, 111.0, 115.0, 123.0)):
+        engine.ingest("A", price, 1, 2.0 + i)
+        if i == 1:
+            first = _fired(engine)
+    assert [(e["price"], e["reference"]) for e in first] == [(111.0, 100.0)]
+    assert [(e["alert_id"], e["price"], e["reference"]) for e in _fired(engine)] == [(alert, 123.0, 111.0)]
+
+def test_cross_average_and_removal(engine):
+    alert = engine.add_alert("A", "cross_avg", direction="down")
+    for i, price in enumerate((100.0, 102.0, 104.0, 90.0)):
+        engine.ingest("A", price, 1, 1.0 + i)
+    events = _fired(engine)
+    assert [(e["alert_id"], e["price"]) for e in events] == [(alert, 90.0)]
+    assert events[0]["avg"] == pytest.approx((102.0 + 104.0 + 90.0) / 3)
+    assert engine.remove_alert(alert) and not engine.remove_alert(alert)
+    engine.ingest("A", 200.0, 1, 10.0)
+    engine.ingest("A", 10.0, 1, 11.0)
+    assert _fired(engine) == []
+
+def test_batch_ingest_fires_the_same_alerts():
+    prices = [100.0, 106.0, 99.0, 94.0, 107.0, 93.0, 100.0]
+    events = []
+    for batched in (False, True):
+        engine = RealTimeDataEngine(window_size=3)
+        engine.events.add_handler(lambda event: None)
+        engine.add_alert("A", "above", 105.0)
+        engine.add_alert("A", "below", 95.0)
+        engine.add_alert("A", "cross_avg")
+        if batched:
+            engine.ingest_batch(["A"] * len(prices), prices, timestamps=[float(i) for i in range(len(prices))])
+        else:
+            for i, price in enumerate(prices):
+                engine.ingest("A", price, 0, float(i))
+        events.append(_fired(engine))
+    assert events[0] == events[1] and events[0]
+
+def test_bad_alerts_are_rejected(engine):
+    for args in (("A", "sideways", 1.0), ("A", "above"), ("A", "pct_move", 5.0, 1, "left")):
+        with pytest.raises(ValueError):
+            engine.add_alert(*args)
+
+def test_alert_changes_are_applied_by_the_ingest_thread(engine):
+    engine.ingest("A", 100.0, 1, 1.0)
+    alert = engine.add_alert("A", "above", 105.0)
+    assert engine.alerts.get("A") is None  # queued, the book is only touched by ingest
+    assert engine.remove_alert(alert) and not engine.remove_alert(alert) and not engine.remove_alert(99)
+    engine.ingest("A", 110.0, 1, 2.0)
+    assert _fired(engine) == [] and len(engine.alerts) == 0
+
+def test_alerts_added_during_ingest_are_never_lost():
+    engine = RealTimeDataEngine(window_size=3)
+    engine.events.add_handler(lambda event: None)
+    engine.ingest("A", 100.0, 1, 0.0)
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    stop = threading.Event()
+
+    def write():
+        i = 0
+        while not stop.is_set():
+            i += 1
+            engine.ingest("A" if i % 2 else "B", 100.0, 1, float(i))
+
+    writer = threading.Thread(target=write)
+    writer.start()
+    try:
+        ids = [engine.add_alert("AB"[i % 2], "pct_move", 5.0) for i in range(2000)]
+    finally:
+        stop.set()
+        writer.join()
+        sys.setswitchinterval(interval)
+    engine.ingest("A", 100.0, 1, 1e9)
+    engine.ingest("B", 100.0, 1, 1e9)
+    books = [engine.alerts.get(symbol) for symbol in "AB"]
+    assert len(engine.alerts) == len(ids) == sum(book.count for book in books)
+    assert all(not book.unarmed and len(book.up) == len(book.down) == book.count for book in books)
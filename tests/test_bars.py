@@ -0,0 +1,57 @@
+import numpy as np
+from data_engine import RealTimeDataEngine
+from stockAppFns.bars import BarSeries, COLUMNS
+
+def _brute_force(prices, volumes, timestamps, resolution):
+    bars = {}
+    for price, volume, timestamp in zip(prices, volumes, timestamps):
+        start = timestamp - timestamp % resolution
+        bar = bars.setdefault(start, [start, price, price, price, price, 0.0, 0])
+        bar[2], bar[3], bar[4] = max(bar[2], price), min(bar[3], price), price
+        bar[5] += volume
+        bar[6] += 1
+    return [bars[start] for start in sorted(bars)]
+
+def test_bars_match_brute_force_and_wrap():
+    rng = np.random.default_rng(3)
+    timestamps = np.sort(rng.uniform(0, 600, 2000))
+    prices = rng.uniform(90, 110, 2000)
+    volumes = rng.integers(1, 100, 2000).astype(float)
+    series = BarSeries(10, capacity=20)
+    series.extend(prices.tolist(), volumes.tolist(), timestamps.tolist())
+    expected = _brute_force(prices, volumes, timestamps, 10)[-21:]
+    bars = series.get_bars()
+    assert len(bars["time"]) == 21
+    for i, name in enumerate(COLUMNS):
+        assert np.allclose(bars[name], [bar[i] for bar in expected])
+    assert np.allclose(series.get_bars(5)["close"], [bar[4] for bar in expected[-5:]])
+
+def test_zero_bars_is_empty_at_every_head_position():
+    series = BarSeries(1, capacity=4)
+    for t in range(12):
+        series.update(float(t), 1, float(t))
+        for n in (0, -1):
+            bars = series.get_bars(n)
+            assert all(len(bars[name]) == 0 for name in COLUMNS)
+        assert len(series.get_bars(1)["close"]) == 1 and series.get_bars(1)["close"][0] == float(t)
+
+def test_late_tick_folds_into_closed_bar():
+    series = BarSeries(10)
+    for price, timestamp in ((10.0, 1.0), (12.0, 11.0), (5.0, 3.0)):
+        series.update(price, 1, timestamp)
+    bars = series.get_bars()
+    assert bars["low"].tolist() == [5.0, 12.0] and bars["close"].tolist() == [10.0, 12.0]
+    assert bars["count"].tolist() == [2, 1]
+
+def test_engine_bars_batch_matches_per_tick():
+    rng = np.random.default_rng(4)
+    timestamps = np.sort(rng.uniform(0, 300, 500))
+    prices = rng.uniform(90, 110, 500)
+    single = RealTimeDataEngine(bar_resolutions=(1, 60))
+    batched = RealTimeDataEngine(bar_resolutions=(1, 60))
+    for price, timestamp in zip(prices, timestamps):
+        single.ingest("A", float(price), 2, float(timestamp))
+    batched.ingest_batch(["A"] * 500, prices, np.full(500, 2), timestamps)
+    for resolution in (1, 60):
+        one, many = single.get_bars("A", resolution), batched.get_bars("A", resolution)
+        assert all(np.array_equal(one[name], many[name]) for name in COLUMNS)
@@ -0,0 +1,45 @@
+import numpy as np
+import pytest
+from data_engine import RealTimeDataEngine
+
+def _ticks(n=3000, seed=5):
+    rng = np.random.default_rng(seed)
+    symbols = rng.choice(["AAPL", "MSFT", "GOOGL", "TSLA"], n)
+    prices = rng.uniform(90, 110, n)
+    volumes = rng.integers(1, 100, n)
+    timestamps = 1000.0 + np.sort(rng.uniform(0, 600, n))
+    return symbols, prices, volumes, timestamps
+
+def test_batch_matches_per_tick_ingest():
+    symbols, prices, volumes, timestamps = _ticks()
+    options = dict(buffer_size=500, window_size=30, time_windows=(5,), bar_resolutions=(60,), hot_symbols=8)
+    single, batched = RealTimeDataEngine(**options), RealTimeDataEngine(**options)
+    for row in zip(symbols.tolist(), prices.tolist(), volumes.tolist(), timestamps.tolist()):
+        single.ingest(*row)
+    for i in range(0, len(prices), 700):
+        batched.ingest_batch(symbols[i:i + 700], prices[i:i + 700], volumes[i:i + 700], timestamps[i:i + 700])
+
+    assert single.list_symbols() == batched.list_symbols()
+    assert single.get_all_data() == batched.get_all_data()
+    for symbol in single.list_symbols():
+        assert np.array_equal(single.get_price_history(symbol), batched.get_price_history(symbol))
+        assert single.get_rolling_std(symbol) == batched.get_rolling_std(symbol)
+        assert single.get_window_stats(symbol, 5) == batched.get_window_stats(symbol, 5)
+    assert single.top_gainers(4) == batched.top_gainers(4)
+    assert single.symbols_above_average() == batched.symbols_above_average()
+
+def test_bytes_symbols_register_as_names():
+    symbols, prices, volumes, timestamps = _ticks(100)
+    records = np.empty(100, dtype=[("symbol", "S8"), ("price", "f8"), ("volume", "f8"), ("timestamp", "f8")])
+    records["symbol"], records["price"], records["volume"], records["timestamp"] = symbols, prices, volumes, timestamps
+    engine = RealTimeDataEngine()
+    engine.ingest_records(records)
+    engine.ingest("AAPL", 123.0, 1, 5000.0)
+    assert sorted(engine.list_symbols()) == ["AAPL", "GOOGL", "MSFT", "TSLA"]
+    assert engine.get_latest_price("AAPL") == 123.0
+
+def test_mismatched_columns_are_rejected():
+    engine = RealTimeDataEngine()
+    with pytest.raises(ValueError):
+        engine.ingest_batch(["A", "B"], [1.0])
+    assert engine.list_symbols() == []
@@ -0,0 +1,22 @@
+import json
+import random
+import benchmark
+
+def test_micro_and_engine_benchmarks_produce_rows():
+    rng = random.Random(1)
+    rows = (benchmark.bench_circular_buffer([8], 200, rng) + benchmark.bench_sliding_window([8], 200, rng)
+            + benchmark.bench_extremes([8], 200, rng) + benchmark.bench_hashtable([8], 200, rng)
+            + benchmark.bench_priority_queue([8], 200, rng))
+    engine_rows = benchmark.bench_engine([5], [4], 300, rng)
+    assert rows and engine_rows
+    for row in rows + engine_rows:
+        assert row["ops"] > 0 and row["seconds"] >= 0 and row["ops_per_sec"] >= 0
+    assert {row["structure"] for row in rows} >= {"CircularBuffer", "ColumnarCircularBuffer", "SlidingWindow"}
+    json.dumps(rows + engine_rows)  # results must stay serialisable
+
+def test_compare_prints_ratios_for_matching_rows(capsys):
+    row = {"structure": "HashTable", "op": "get", "size": 8, "ops_per_sec": 100.0}
+    baseline = {"micro": [row], "engine": []}
+    current = {"micro": [dict(row, ops_per_sec=250.0), dict(row, size=16)], "engine": []}
+    benchmark.compare(baseline, current)
+    assert capsys.readouterr().out.split() == ["2.50x", "structure=HashTable,", "op=get,", "size=8"]
@@ -0,0 +1,69 @@
+from data_engine import RealTimeDataEngine
+
+class _InterleavingLog(dict):
+    """Change log that runs a reader in the middle of a write, between its log and version updates"""
+
+    def __init__(self, reader):
+        super().__init__()
+        self.reader = reader
+        self.seen = []
+
+    def pop(self, key, default=None):
+        result = super().pop(key, default)
+        if result is not None and not self.seen:
+            self.seen.append(self.reader())
+        return result
+
+def test_changes_since_returns_only_newer_writes():
+    engine = RealTimeDataEngine()
+    engine.ingest("A", 1.0, 1, 1.0)
+    engine.ingest("B", 2.0, 1, 2.0)
+    first = engine.get_changes_since(0)
+    assert list(first["changes"]) == ["A", "B"]
+
+    engine.ingest("A", 3.0, 1, 3.0)
+    delta = engine.get_changes_since(first["version"])
+    assert delta["changes"] == {"A": {"latest": 3.0, "avg": 2.0, "min": 1.0, "max": 3.0}}
+    assert engine.get_changes_since(delta["version"])["changes"] == {}
+
+def test_version_never_covers_an_unseen_write():
+    engine = RealTimeDataEngine()
+    engine.ingest("A", 1.0, 1, 1.0)
+    engine.ingest("B", 2.0, 1, 2.0)
+    start = engine.get_changes_since(0)["version"]
+    engine._change_log = _InterleavingLog(lambda: engine.get_changes_since(start))
+    engine._change_log.update({0: 1, 1: 2})
+
+    engine.ingest("A", 5.0, 1, 3.0)
+    mid = engine._change_log.seen[0]
+    after = engine.get_changes_since(mid["version"])
+    latest = {**mid["changes"], **after["changes"]}
+    assert latest["A"]["latest"] == 5.0
+
+def test_get_all_data_swaps_summaries_without_copying_the_map():
+    engine = RealTimeDataEngine()
+    engine.ingest("A", 1.0, 1, 1.0)
+    engine.ingest("B", 5.0, 1, 1.0)
+    before = engine.get_all_data()
+    summary = before["A"]
+    engine.ingest("A", 2.0, 1, 2.0)
+    after = engine.get_all_data()
+    assert after is before and after["A"]["latest"] == 2.0  # updated in place, O(changed)
+    assert summary == {"latest": 1.0, "avg": 1.0, "min": 1.0, "max": 1.0}  # summaries are never mutated
+    assert after["B"] is engine.get_all_data()["B"]  # unchanged symbols are not re-read
+    engine.ingest("C", 3.0, 1, 3.0)
+    grown = engine.get_all_data()
+    assert grown is not before and list(before) == ["A", "B"] and list(grown) == ["A", "B", "C"]
+
+def test_get_all_data_can_be_iterated_during_updates():
+    engine = RealTimeDataEngine()
+    for i in range(50):
+        engine.ingest(f"S{i}", 1.0, 1, 1.0)
+    snapshot = engine.get_all_data()
+    seen = 0
+    for i, symbol in enumerate(snapshot):
+        engine.ingest(symbol, 2.0, 1, 2.0)
+        engine.ingest(f"NEW{i}", 1.0, 1, 2.0)
+        engine.get_all_data()
+        seen += 1
+    assert seen == 50 and len(engine.get_all_data()) == 100
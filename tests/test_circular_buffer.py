@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+from stockAppFns.circular_buffer import CircularBuffer, ColumnarCircularBuffer
+
+def _points(n, start=0):
+    return [(float(100 + i), float(1000 + i)) for i in range(start, start + n)]
+
+@pytest.mark.parametrize("count", [0, 3, 5, 12])
+def test_columnar_matches_list_buffer(count):
+    plain, columnar = CircularBuffer(5), ColumnarCircularBuffer(5)
+    for point in _points(count):
+        plain.append(point)
+        columnar.append(point)
+    assert len(plain) == len(columnar) == min(count, 5)
+    assert [tuple(p) for p in zip(columnar.newest_prices(), columnar.newest_timestamps())] == plain.get_all()
+    assert columnar.latest() == plain.latest()
+    assert [p[0] for p in plain.return_n_newest(2)] == columnar.newest_prices(2)[::-1].tolist()
+
+@pytest.mark.parametrize("chunks", [[3], [4, 4], [2, 7], [11], [5, 1, 1, 9]])
+def test_extend_matches_append(chunks):
+    appended, extended = ColumnarCircularBuffer(6), ColumnarCircularBuffer(6)
+    start = 0
+    for size in chunks:
+        points = _points(size, start)
+        start += size
+        for point in points:
+            appended.append(point)
+        extended.extend([p[0] for p in points], [p[1] for p in points])
+        assert np.array_equal(appended.newest_prices(), extended.newest_prices())
+        assert np.array_equal(appended.newest_timestamps(), extended.newest_timestamps())
+        assert len(appended) == len(extended) and appended.latest() == extended.latest()
+
+def test_reads_are_views_until_the_range_wraps():
+    buffer = ColumnarCircularBuffer(8)
+    buffer.extend(*zip(*_points(6)))
+    assert np.shares_memory(buffer.newest_prices(), buffer.prices)
+    buffer.extend(*zip(*_points(4, 6)))  # wraps: head is now 2
+    assert len(buffer.price_segments()) == 2
+    assert buffer.newest_prices().tolist() == [102.0 + i for i in range(8)]
+    assert np.shares_memory(buffer.newest_prices(2), buffer.prices)
+
+def test_count_after_binary_searches_across_the_wrap():
+    buffer = ColumnarCircularBuffer(8)
+    buffer.extend(*zip(*_points(13)))
+    timestamps = buffer.newest_timestamps().tolist()
+    for cutoff in (900.0, 1004.0, 1005.0, 1008.5, 1012.0, 2000.0):
+        assert buffer.count_after(cutoff) == sum(ts > cutoff for ts in timestamps)
+
+def test_remove_oldest():
+    for buffer in (CircularBuffer(3), ColumnarCircularBuffer(3)):
+        for point in _points(4):
+            buffer.append(point)
+        assert buffer.remove_oldest() == (101.0, 1001.0)
+        assert len(buffer) == 2 and buffer.latest() == (103.0, 1003.0)
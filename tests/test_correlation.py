@@ -0,0 +1,71 @@
+import numpy as np
+import pytest
+from data_engine import RealTimeDataEngine
+from stockAppFns.correlation import RollingCorrelation
+
+T = 400
+
+def _prices(seed=1):
+    rng = np.random.default_rng(seed)
+    base = rng.normal(size=T)
+    returns = np.stack([base + rng.normal(size=T) * scale for scale in (0.5, 1.0, 2.0, 0.3)], axis=1) * 0.01
+    return 100 * np.exp(np.cumsum(returns, axis=0))
+
+def _log_returns(prices):
+    return np.diff(np.log(prices), axis=0)
+
+def test_matches_corrcoef_when_every_key_has_every_sample():
+    prices = _prices()
+    tracker = RollingCorrelation(window=1000)
+    for key in "ABCD":
+        tracker.add(key)
+    for t in range(T):
+        for col in range(4):
+            tracker.observe(col, prices[t, col], t + 0.5)
+    # the sample taken at tick t holds the prices of tick t - 1
+    expected = np.corrcoef(_log_returns(prices[:T - 1]).T)
+    assert np.allclose(tracker.correlation(), expected, atol=1e-12)
+
+def test_late_key_is_measured_over_shared_samples_only():
+    prices = _prices()
+    tracker = RollingCorrelation(window=1000)
+    for key in "ABC":
+        tracker.add(key)
+    for t in range(T):
+        if t == 300:
+            tracker.add("D")
+        for col in range(4 if t >= 300 else 3):
+            tracker.observe(col, prices[t, col], t + 0.5)
+
+    shared = _log_returns(prices[300:T - 1])
+    expected = np.corrcoef(shared[:, 0], shared[:, 3])[0, 1]
+    assert tracker.correlation()[0, 3] == pytest.approx(expected, abs=1e-12)
+    assert tracker.correlation_row(3)[0] == pytest.approx(expected, abs=1e-12)
+    assert tracker.top(3, 1)[0] == (0, pytest.approx(expected, abs=1e-12))
+
+def test_rolling_window_and_refresh_agree():
+    prices = _prices(2)
+    incremental = RollingCorrelation(window=50, refresh_every=10 ** 9)
+    refreshed = RollingCorrelation(window=50, refresh_every=7)
+    for tracker in (incremental, refreshed):
+        for key in "ABCD":
+            tracker.add(key)
+        for t in range(T):
+            for col in range(4):
+                tracker.observe(col, prices[t, col], t + 0.5)
+    expected = np.corrcoef(_log_returns(prices[T - 52:T - 1]).T)
+    assert np.allclose(incremental.correlation(), expected, atol=1e-9)
+    assert np.allclose(refreshed.correlation(), expected, atol=1e-12)
+
+def test_engine_batch_matches_per_tick():
+    prices = _prices(3)
+    symbols = ["A", "B", "C", "D"]
+    single = RealTimeDataEngine(correlation_symbols=symbols, correlation_window=100)
+    batched = RealTimeDataEngine(correlation_symbols=symbols, correlation_window=100)
+    rows = [(symbol, prices[t, col], t + 0.25 * col) for t in range(T) for col, symbol in enumerate(symbols)]
+    for symbol, price, timestamp in rows:
+        single.ingest(symbol, float(price), 1, timestamp)
+    batched.ingest_batch([r[0] for r in rows], [r[1] for r in rows], timestamps=[r[2] for r in rows])
+    assert single.top_correlated("A", 3) == batched.top_correlated("A", 3)
+    keys, matrix = single.get_correlation_matrix()
+    assert keys == symbols and np.array_equal(matrix, batched.get_correlation_matrix()[1])
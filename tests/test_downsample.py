@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+from data_engine import RealTimeDataEngine
+from stockAppFns.downsample import lttb, min_max
+
+def _series(n, seed=6):
+    y = 100 + np.cumsum(np.random.default_rng(seed).normal(0, 1, n))
+    return np.arange(n, dtype=np.float64) * 0.5, y
+
+def _reference_lttb(x, y, threshold):
+    """Plain LTTB as published: bucket i covers floor(i * every) + 1 .. floor((i + 1) * every)"""
+    n = len(x)
+    every = (n - 2) / (threshold - 2)
+    keep, a = [0], 0
+    for i in range(threshold - 2):
+        start, end = int(i * every) + 1, int((i + 1) * every) + 1
+        next_end = min(int((i + 2) * every) + 1, n)
+        avg_x, avg_y = np.mean(x[end:next_end]), np.mean(y[end:next_end])
+        areas = [abs((x[a] - avg_x) * (y[j] - y[a]) - (x[a] - x[j]) * (avg_y - y[a])) for j in range(start, end)]
+        a = start + int(np.argmax(areas))
+        keep.append(a)
+    return keep + [n - 1]
+
+@pytest.mark.parametrize("n,threshold", [(1000, 50), (1000, 3), (101, 100), (57, 10)])
+def test_lttb_matches_reference(n, threshold):
+    x, y = _series(n)
+    out_x, out_y = lttb(x, y, threshold)
+    keep = _reference_lttb(x, y, threshold)
+    assert len(out_x) == threshold and out_x.tolist() == x[keep].tolist() and out_y.tolist() == y[keep].tolist()
+    assert out_x[0] == x[0] and out_x[-1] == x[-1] and np.all(np.diff(out_x) > 0)
+
+def test_short_series_pass_through():
+    x, y = _series(10)
+    for result in (lttb(x, y, 10), lttb(x, y, 2), min_max(x, y, 10), min_max(x, y, 1)):
+        assert result[0].tolist() == x.tolist() and result[1].tolist() == y.tolist()
+
+@pytest.mark.parametrize("n,width", [(1000, 40), (1001, 40), (999, 7), (50, 48)])
+def test_min_max_keeps_every_bucket_extreme(n, width):
+    x, y = _series(n)
+    y[n // 3] = 1e6  # a one-tick spike
+    y[n // 2] = -1e6
+    out_x, out_y = min_max(x, y, width)
+    assert len(out_x) <= width + 2 and np.all(np.diff(out_x) > 0)
+    assert out_x[0] == x[0] and out_x[-1] == x[-1]
+    assert 1e6 in out_y and -1e6 in out_y
+    assert set(zip(out_x, out_y)) <= set(zip(x, y))
+
+def test_engine_downsampled_history():
+    engine = RealTimeDataEngine(buffer_size=2000, bar_resolutions=(10.0,))
+    x, y = _series(1500)
+    engine.ingest_batch(["A"] * 1500, y, timestamps=x)
+    out_x, out_y = engine.get_downsampled_history("A", width=100)
+    assert len(out_x) == 100 and out_x[0] == x[0] and out_y[-1] == y[-1]
+    out_x, _ = engine.get_downsampled_history("A", width=100, n=300, method="minmax")
+    assert out_x[0] == x[-300] and out_x[-1] == x[-1]
+    bars_x, bars_y = engine.get_downsampled_history("A", width=20, resolution=10.0)
+    closes = engine.get_bars("A", 10.0)
+    assert len(bars_x) == 20 and bars_x[-1] == closes["time"][-1] and bars_y[-1] == closes["close"][-1]
+    assert engine.get_downsampled_history("missing") is None
+    with pytest.raises(ValueError):
+        engine.get_downsampled_history("A", method="cubic")
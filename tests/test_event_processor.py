@@ -0,0 +1,81 @@
+import logging
+import threading
+from data_engine import EventProcessor
+from stockAppFns.priority_queue import PriorityQueue
+
+def _collecting(processor):
+    seen, lock = [], threading.Lock()
+    def handler(event):
+        with lock:
+            seen.append(event)
+    processor.add_handler(handler)
+    return seen
+
+def test_queue_pops_lowest_priority_first_and_fifo_on_ties():
+    queue = PriorityQueue()
+    queue.push_many([(2, "c"), (1, "a"), (2, "d")])
+    queue.push(1, "b")
+    key = queue.push(0, "cancelled")
+    assert queue.cancel(key) == "cancelled" and key not in queue
+    assert [queue.pop() for _ in range(len(queue))] == ["a", "b", "c", "d"]
+    assert queue.is_empty()
+
+def test_events_with_a_queued_key_are_coalesced():
+    processor = EventProcessor()
+    seen = _collecting(processor)
+    processor.add_event(5, "first", key="A")
+    processor.add_event(3, "b", key="B")
+    processor.add_event(1, "latest", key="A")
+    processor.add_events([(4, "x"), (9, "c1", "C"), (2, "c2", "C"), (7, "b2", "B")])
+    processor.process_all()
+    # A keeps its newest payload at the better priority; B and C coalesce the same way
+    assert seen == ["latest", "c2", "b2", "x"]
+    assert processor.get_stats() == {"queued": 0, "dispatched": 4, "coalesced": 3, "handler_errors": 0}
+    processor.add_event(1, "again", key="A") # no longer queued, so queued afresh
+    assert processor.process_next() == "again" and processor.process_next() is None
+
+def test_cancel_removes_a_queued_event():
+    processor = EventProcessor()
+    seen = _collecting(processor)
+    processor.add_event(1, "gone", key="A")
+    processor.add_event(2, "kept", key="B")
+    assert processor.cancel("A") == "gone" and processor.cancel("A") is None
+    processor.process_all()
+    assert seen == ["kept"]
+
+def test_dispatch_batch_runs_every_handler_and_counts_errors():
+    processor = EventProcessor(max_workers=2, batch_size=3)
+    seen = _collecting(processor)
+    def failing(event):
+        if event % 2:
+            raise RuntimeError(event)
+    processor.add_handler(failing)
+    processor.add_events([(i, i) for i in range(5)])
+    for future in processor.dispatch_batch():
+        future.result()
+    assert sorted(seen) == [0, 1, 2] and processor.handler_errors == 1
+    assert len(processor.queue) == 2
+    processor.stop()
+
+def test_background_dispatcher_drains_before_stopping():
+    processor = EventProcessor(max_workers=3, batch_size=8)
+    seen = _collecting(processor)
+    processor.start()
+    for i in range(200):
+        processor.add_event(i % 5, i, key=i)
+    processor.stop(wait=True)
+    assert sorted(seen) == list(range(200))
+    assert processor.get_stats()["dispatched"] == 200 and processor.thread is None
+
+def test_handler_failures_are_logged_and_counted_exactly(caplog):
+    processor = EventProcessor(max_workers=8, batch_size=50)
+    for _ in range(8):
+        processor.add_handler(lambda event: 1 / 0)
+    processor.add_events([(0, i) for i in range(500)])
+    with caplog.at_level(logging.ERROR, logger="data_engine"):
+        while processor.queue:
+            for future in processor.dispatch_batch():
+                future.result()
+    processor.stop()
+    assert processor.get_stats()["handler_errors"] == 4000 and processor.get_stats()["dispatched"] == 500
+    assert len(caplog.records) == 4000 and caplog.records[0].exc_info[0] is ZeroDivisionError
@@ -0,0 +1,37 @@
+import random
+from stockAppFns.min_max_heap import RunningExtremes, MinMaxHeap
+
+def test_running_extremes_add_and_extend_agree():
+    rng = random.Random(3)
+    values = [rng.uniform(-50, 50) for _ in range(10)] + [7.0, -80.0, 80.0, 0.0]
+    one, many = RunningExtremes(), RunningExtremes()
+    for value in values:
+        one.add(value)
+    many.extend(values[:5])
+    many.extend([])
+    many.extend(values[5:])
+    for extremes in (one, many):
+        assert (extremes.get_min(), extremes.get_max(), len(extremes)) == (min(values), max(values), len(values))
+
+def test_empty_extremes():
+    extremes = RunningExtremes()
+    assert extremes.get_min() is None and extremes.get_max() is None and len(extremes) == 0
+
+def test_min_max_heap_matches_sorted_list():
+    rng = random.Random(11)
+    heap, reference = MinMaxHeap(), []
+    for _ in range(2000):
+        op = rng.random()
+        if op < 0.6 or not reference:
+            value = rng.randint(0, 100)
+            heap.add(value)
+            reference.append(value)
+        elif op < 0.8:
+            assert heap.remove_min() == min(reference)
+            reference.remove(min(reference))
+        else:
+            assert heap.remove_max() == max(reference)
+            reference.remove(max(reference))
+        assert len(heap) == len(reference)
+        if reference:
+            assert (heap.get_min(), heap.get_max()) == (min(reference), max(reference))
@@ -0,0 +1,100 @@
+import numpy as np
+import pytest
+from data_engine import RealTimeDataEngine
+from stockAppFns.heavy_hitters import DecayingSpaceSaving
+
+def _feed(counter, rates, seconds):
+    """Tick each key at its rate (ticks per second) for seconds"""
+    for key, rate in rates.items():
+        counter.add_many(key, np.arange(0.0, seconds, 1.0 / rate))
+
+def test_rates_converge_to_the_steady_tick_rate():
+    counter = DecayingSpaceSaving(capacity=8, half_life=5.0)
+    rates = {"A": 50.0, "B": 20.0, "C": 5.0}
+    _feed(counter, rates, 120.0)
+    top = counter.top(2)
+    assert [key for key, _, _ in top] == ["A", "B"]
+    for key, rate in rates.items():
+        assert counter.rate(key) == pytest.approx(rate, rel=0.05)
+    assert counter.rate("missing") is None and counter.evictions == 0
+
+def test_rates_decay_after_a_symbol_goes_quiet():
+    counter = DecayingSpaceSaving(capacity=4, half_life=2.0)
+    counter.add_many("A", np.arange(0.0, 60.0, 0.1))
+    busy = counter.rate("A")
+    last = counter.last_time
+    assert counter.rate("A", now=last + 2.0) == pytest.approx(busy / 2)
+    assert counter.top(1, now=last + 4.0)[0][1] == pytest.approx(busy / 4)
+
+def test_add_many_matches_add():
+    one, many = DecayingSpaceSaving(4, 3.0), DecayingSpaceSaving(4, 3.0)
+    timestamps = np.sort(np.random.default_rng(2).uniform(0, 30, 500))
+    for ts in timestamps:
+        one.add("A", ts)
+    many.add_many("A", timestamps[:100])
+    many.add_many("A", timestamps[100:])
+    assert many.rate("A") == pytest.approx(one.rate("A"), rel=1e-12)
+
+def test_counts_survive_landmark_rescaling():
+    counter = DecayingSpaceSaving(capacity=2, half_life=0.1)
+    for i in range(30000):
+        counter.add("A", i * 0.002)
+    # 600 half-lives: the landmark moved, the weights stayed finite and the rate is 500/s
+    assert counter.landmark > 0 and counter.rate("A") == pytest.approx(500.0, rel=0.02)
+
+def test_new_keys_take_over_the_smallest_counter():
+    counter = DecayingSpaceSaving(capacity=2, half_life=10.0)
+    counter.add("A", 0.0, count=10)
+    counter.add("B", 0.0, count=3)
+    counter.add("C", 0.0, count=1)
+    assert counter.evictions == 1 and len(counter) == 2
+    top = counter.top()
+    assert [key for key, _, _ in top] == ["A", "C"]
+    # C inherited B's count as its error bound
+    assert top[1][1] == pytest.approx(4 / 3 * top[1][2])
+
+def test_engine_hottest_symbols_and_buffer_sizes():
+    engine = RealTimeDataEngine(buffer_size=10, hot_symbols=4, rate_half_life=2.0)
+    n = 3000
+    symbols = np.where(np.arange(n) % 10 < 7, "HOT", np.where(np.arange(n) % 10 < 9, "WARM", "COLD"))
+    timestamps = np.arange(n) * 0.01  # 100 ticks per second overall
+    engine.ingest_batch(symbols, np.full(n, 10.0), timestamps=timestamps)
+    hot = engine.hottest_symbols(2)
+    assert [symbol for symbol, _, _ in hot] == ["HOT", "WARM"]
+    assert hot[0][1] == pytest.approx(70.0, rel=0.05)
+    sizes = engine.suggest_buffer_sizes(seconds=5.0, maximum=300)
+    assert sizes["HOT"] == 300 and sizes["WARM"] == pytest.approx(101, abs=5) and sizes["COLD"] == pytest.approx(51, abs=3)
+    assert engine.suggest_buffer_sizes(seconds=0.01) == {"HOT": 10, "WARM": 10, "COLD": 10}
+    assert RealTimeDataEngine().hottest_symbols() == []
+
+def test_batch_ingest_ranks_like_per_tick_ingest_when_symbols_outnumber_counters():
+    rng = np.random.default_rng(8)
+    n = 4000
+    weights = np.array([8, 6, 5, 5, 4, 3, 2, 2, 1, 1], dtype=np.float64)
+    symbols = np.array([f"S{i}" for i in range(10)])[rng.choice(10, n, p=weights / weights.sum())]
+    timestamps = np.arange(n) * 0.01
+    single = RealTimeDataEngine(hot_symbols=4, rate_half_life=3.0)
+    batched = RealTimeDataEngine(hot_symbols=4, rate_half_life=3.0)
+    for symbol, ts in zip(symbols.tolist(), timestamps.tolist()):
+        single.ingest(symbol, 10.0, 0, ts)
+    for i in range(0, n, 512):
+        batched.ingest_batch(symbols[i:i + 512], np.full(len(symbols[i:i + 512]), 10.0), timestamps=timestamps[i:i + 512])
+    assert single.tick_rates.evictions == batched.tick_rates.evictions > 0
+    expected = single.hottest_symbols(4)
+    actual = batched.hottest_symbols(4)
+    assert [s for s, _, _ in actual] == [s for s, _, _ in expected]
+    for (_, rate, error), (_, expected_rate, expected_error) in zip(actual, expected):
+        assert rate == pytest.approx(expected_rate, rel=1e-9) and error == pytest.approx(expected_error, rel=1e-9, abs=1e-12)
+
+def test_add_sequence_matches_add():
+    keys = np.random.default_rng(5).choice(["A", "B", "C", "D", "E"], 800)
+    timestamps = np.arange(800) * 0.05
+    one, many = DecayingSpaceSaving(3, 4.0), DecayingSpaceSaving(3, 4.0)
+    for key, ts in zip(keys.tolist(), timestamps.tolist()):
+        one.add(key, ts)
+    many.add_sequence(keys[:300], timestamps[:300])
+    many.add_sequence(keys[300:], timestamps[300:])
+    assert one.evictions == many.evictions
+    assert [key for key, _, _ in one.top()] == [key for key, _, _ in many.top()]
+    for (_, rate, error), (_, other_rate, other_error) in zip(one.top(), many.top()):
+        assert rate == pytest.approx(other_rate, rel=1e-9) and error == pytest.approx(other_error, rel=1e-9)
@@ -0,0 +1,64 @@
+import pytest
+from data_engine import RealTimeDataEngine
+from stockAppFns import indicators
+
+def _engine(**kwargs):
+    engine = RealTimeDataEngine(buffer_size=200, **kwargs)
+    for i in range(60):
+        engine.ingest("AAPL", 100.0 + (i % 7) - (i % 3), 10, 1000.0 + i)
+    return engine
+
+def test_bad_spec_leaves_no_stand_in():
+    engine = _engine()
+    with pytest.raises(ValueError):
+        engine.get_indicator("AAPL", "rsi14")
+    for i in range(100):
+        engine.ingest("AAPL", 101.0, 10, 2000.0 + i)
+    assert engine.get_indicators("AAPL") == {}
+
+def test_failed_seed_removes_stand_in():
+    class Broken(indicators.Indicator):
+        def extend(self, prices, volumes, timestamps):
+            raise RuntimeError("seed failed")
+    indicators.register("broken", Broken)
+    try:
+        engine = _engine()
+        with pytest.raises(RuntimeError):
+            engine.get_indicator("AAPL", "broken")
+        assert engine.get_indicators("AAPL") == {}
+    finally:
+        del indicators.INDICATORS["broken"]
+
+def test_lazy_indicator_matches_one_attached_from_start():
+    configured = _engine(indicator_specs=("ema:10", "rsi:14"))
+    lazy = _engine()
+    for spec in ("ema:10", "rsi:14"):
+        assert lazy.get_indicator("AAPL", spec) == pytest.approx(configured.get_indicator("AAPL", spec))
+
+def test_ema_and_rsi_values():
+    ema = indicators.create("ema:3")
+    for price in (1.0, 2.0, 3.0):
+        ema.update(price, 0, 0)
+    assert ema.value() == pytest.approx(2.25)
+
+    rsi = indicators.create("rsi:2")
+    for price in (10.0, 11.0, 10.5):
+        rsi.update(price, 0, 0)
+    assert rsi.value() == pytest.approx(100 - 100 / (1 + 0.5 / 0.25))
+
+def test_global_specs_attach_only_to_queried_symbols():
+    engine = _engine(indicator_specs=("ema:10",))
+    engine.ingest("MSFT", 50.0, 10, 1000.0)
+    engine.add_indicator("rsi:14")
+    assert all(data["indicators"] == {} for data in engine.registry.by_id)  # nothing updated per tick yet
+
+    values = engine.get_indicators("AAPL")
+    assert set(values) == {"ema:10", "rsi:14"}
+    assert values["ema:10"] == pytest.approx(_engine(indicator_specs=()).get_indicator("AAPL", "ema:10"))
+    assert engine.registry.get_symbol_data("MSFT")["indicators"] == {}
+    engine.add_indicator("macd:3,6,2", "MSFT")  # a per-symbol spec is attached at once
+    assert set(engine.registry.get_symbol_data("MSFT")["indicators"]) == {"macd:3,6,2"}
+
+    engine.remove_indicator("rsi:14")
+    assert set(engine.get_indicators("AAPL")) == {"ema:10"}
+    assert set(engine.get_indicators("MSFT")) == {"ema:10", "macd:3,6,2"}
@@ -0,0 +1,46 @@
+import asyncio
+import threading
+from data_engine import RealTimeDataEngine
+from ingest_pipeline import AsyncIngestPipeline, SourceQueue, BLOCK, DROP_OLDEST, CONFLATE
+
+def test_conflate_keeps_latest_tick_per_symbol():
+    async def scenario():
+        queue = SourceQueue("feed", 10, CONFLATE)
+        for symbol, price in (("A", 1.0), ("B", 2.0), ("A", 3.0), ("A", 4.0)):
+            queue.put_nowait(symbol, price, 1, 0.0)
+        out = ([], [], [], [])
+        queue.drain(10, out)
+        return queue, out
+    queue, out = asyncio.run(scenario())
+    assert out[0] == ["A", "B"] and out[1] == [4.0, 2.0] and out[2] == [3, 1]
+    assert queue.conflated == 2 and queue.dropped == 0
+
+def test_drop_oldest_counts_drops():
+    async def scenario():
+        queue = SourceQueue("feed", 3, DROP_OLDEST)
+        for i in range(5):
+            queue.put_nowait("A", float(i), 1, 0.0)
+        return queue
+    queue = asyncio.run(scenario())
+    assert [entry[1] for entry in queue.items] == [2.0, 3.0, 4.0]
+    assert queue.dropped == 2 and queue.received == 5
+
+def test_put_threadsafe_blocks_instead_of_dropping():
+    engine = RealTimeDataEngine(buffer_size=1000)
+
+    async def scenario():
+        pipeline = AsyncIngestPipeline(engine, queue_capacity=2, batch_size=4, policy=BLOCK)
+        source = pipeline.add_source("feed")
+        pipeline.start()
+        producer = threading.Thread(target=lambda: [pipeline.put_threadsafe("feed", "A", float(i), 1, float(i))
+                                                    for i in range(200)])
+        producer.start()
+        while producer.is_alive():
+            await asyncio.sleep(0.001)
+        await pipeline.stop()
+        return source
+
+    source = asyncio.run(scenario())
+    assert source.dropped == 0 and source.received == 200
+    assert source.max_depth <= 2
+    assert list(engine.get_price_history("A")) == [float(i) for i in range(200)]
@@ -0,0 +1,83 @@
+import numpy as np
+import pytest
+from data_engine import RealTimeDataEngine
+
+def _ticks(n, symbols=20, seed=5):
+    rng = np.random.default_rng(seed)
+    names = np.array([f"S{i:02d}" for i in range(symbols)])[rng.integers(0, symbols, n)]
+    prices = rng.uniform(50, 150, n).round(2)
+    return names, prices, np.arange(n, dtype=np.float64)
+
+def _brute_force(ticks, window, session_length=None):
+    names, prices, timestamps = ticks
+    change, ranges = {}, {}
+    for symbol in set(names.tolist()):
+        rows = names == symbol
+        history, stamps = prices[rows], timestamps[rows]
+        if session_length:
+            history = history[stamps >= stamps[-1] - stamps[-1] % session_length]
+        recent = prices[rows][-window:]
+        change[symbol] = (history[-1] / history[0] - 1) * 100
+        ranges[symbol] = (recent.max() - recent.min()) / recent.mean() * 100
+    return change, ranges
+
+def _check(engine, change, ranges, k=5):
+    ranked = sorted(change.items(), key=lambda item: item[1])
+    gainers = [(s, v) for s, v in reversed(ranked) if v > 0][:k]
+    losers = [(s, v) for s, v in ranked if v < 0][:k]
+    assert [s for s, _, _ in engine.top_gainers(k)] == [s for s, _ in gainers]
+    assert [s for s, _, _ in engine.top_losers(k)] == [s for s, _ in losers]
+    for symbol, value, price in engine.top_gainers(k) + engine.top_losers(k):
+        assert value == pytest.approx(change[symbol]) and price == engine.get_latest_price(symbol)
+    widest = sorted(ranges.items(), key=lambda item: item[1], reverse=True)[:k]
+    assert [(s, pytest.approx(v)) for s, v, _ in engine.widest_ranges(k)] == widest
+
+@pytest.mark.parametrize("batched", [False, True])
+def test_leaderboards_match_brute_force(batched):
+    ticks = _ticks(600)
+    engine = RealTimeDataEngine(window_size=8)
+    if batched:
+        for i in range(0, 600, 128):
+            engine.ingest_batch(*(column[i:i + 128] for column in ticks[:2]), timestamps=ticks[2][i:i + 128])
+    else:
+        for symbol, price, ts in zip(*ticks):
+            engine.ingest(str(symbol), float(price), 1, float(ts))
+    _check(engine, *_brute_force(ticks, 8))
+
+@pytest.mark.parametrize("batched", [False, True])
+def test_session_open_rolls_at_each_boundary(batched):
+    ticks = _ticks(500, symbols=6)
+    engine = RealTimeDataEngine(window_size=8, session_length=120.0)
+    if batched:
+        for i in range(0, 500, 70):
+            engine.ingest_batch(*(column[i:i + 70] for column in ticks[:2]), timestamps=ticks[2][i:i + 70])
+    else:
+        for symbol, price, ts in zip(*ticks):
+            engine.ingest(str(symbol), float(price), 1, float(ts))
+    _check(engine, *_brute_force(ticks, 8, session_length=120.0), k=6)
+
+def test_start_session_resets_the_open():
+    engine = RealTimeDataEngine(window_size=4)
+    for i, (a, b) in enumerate([(100.0, 100.0), (110.0, 90.0)]):
+        engine.ingest("A", a, 1, float(i))
+        engine.ingest("B", b, 1, float(i))
+    assert engine.top_gainers() == [("A", pytest.approx(10.0), 110.0)]
+    assert engine.top_losers() == [("B", pytest.approx(-10.0), 90.0)]
+    engine.start_session()
+    assert engine.top_gainers()[0][0] == "A"  # applied by the ingest thread before its next tick
+    engine.ingest("B", 99.0, 1, 5.0)
+    assert engine.top_gainers() == [("B", pytest.approx(10.0), 99.0)] and engine.top_losers() == []
+    assert engine.top_gainers(0) == [] and RealTimeDataEngine().widest_ranges() == []
+
+def test_rankings_refresh_only_on_query():
+    ticks = _ticks(900, symbols=15)
+    engine = RealTimeDataEngine(window_size=8)
+    for i, (symbol, price, ts) in enumerate(zip(*ticks)):
+        engine.ingest(str(symbol), float(price), 1, float(ts))
+        if i % 97 == 0:
+            seen = tuple(column[:i + 1] for column in ticks)
+            _check(engine, *_brute_force(seen, 8))
+    assert len(engine.change_index) == 15
+    engine.ingest("NEW", 10.0, 1, 1000.0)
+    assert len(engine.change_index) == 15  # ingest does not touch the ranking indexes
+    _check(engine, *_brute_force(tuple(np.append(c, v) for c, v in zip(ticks, ("NEW", 10.0, 1000.0))), 8))
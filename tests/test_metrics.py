@@ -0,0 +1,54 @@
+from data_engine import RealTimeDataEngine
+from stockAppFns.metrics import LatencyHistogram
+
+def _feed(engine):
+    engine.add_alert("A", "above", 105.0)
+    for i in range(200):
+        engine.ingest("A" if i % 3 else "B", 100.0 + i % 11, 1, 1000.0 + i)
+
+def test_instrumented_ingest_matches_plain_ingest():
+    options = dict(quantiles=True, bar_resolutions=(10,), hot_symbols=4, correlation_symbols=("A", "B"))
+    plain, timed = RealTimeDataEngine(**options), RealTimeDataEngine(instrument=True, **options)
+    for engine in (plain, timed):
+        for symbol in ("A", "B"): # per-symbol specs update from the first tick (global ones wait for a read)
+            engine.add_indicator("ema:5", symbol)
+        _feed(engine)
+    assert plain.get_all_data() == timed.get_all_data()
+    assert plain.get_indicators("A") == timed.get_indicators("A")
+    assert plain.get_quantiles("A") == timed.get_quantiles("A")
+
+    metrics = timed.get_metrics()
+    assert metrics["instrumented"] and not plain.get_metrics()["instrumented"]
+    assert metrics["ingest"]["count"] == 200
+    for stage in ("registry", "buffer", "window", "extremes", "bars", "quantiles", "indicators",
+                  "indexes", "rates", "correlation"):
+        assert metrics["stages"][stage]["count"] == 200, stage
+    assert metrics["stages"]["alerts"]["count"] == 133  # only ticks of the symbol with an alert
+    assert metrics["queries"]["get_all_data"]["count"] == 1
+
+def test_instrumentation_can_be_switched_off():
+    engine = RealTimeDataEngine(instrument=True)
+    engine.set_instrumentation(False)
+    _feed(engine)
+    metrics = engine.get_metrics()
+    assert not metrics["instrumented"] and metrics["total_points"] == 200
+    assert "get_latest_price" not in engine.__dict__
+
+def test_histogram_percentiles_are_within_bucket_width():
+    histogram = LatencyHistogram()
+    for us in range(1, 1001):
+        histogram.record(us / 1e6)
+    for q, exact in ((50, 500), (99, 990), (99.9, 999)):
+        assert exact <= histogram.percentile(q) * 1e6 <= exact * 1.125
+    assert histogram.summary()["max_us"] == 1000.0
+
+def test_nested_queries_are_timed_once():
+    engine = RealTimeDataEngine(instrument=True, quantiles=True, bar_resolutions=(10,))
+    _feed(engine)
+    engine.get_all_data()  # built on get_changes_since
+    engine.get_quantiles("A")  # built on get_digest
+    engine.get_downsampled_history("A", resolution=10)  # built on get_bars
+    engine.get_digest("A")
+    queries = engine.get_metrics()["queries"]
+    assert {name: stats["count"] for name, stats in queries.items()} == \
+           {"get_all_data": 1, "get_quantiles": 1, "get_downsampled_history": 1, "get_digest": 1}
@@ -0,0 +1,57 @@
+import numpy as np
+from data_engine import RealTimeDataEngine
+from stockAppFns.quantiles import TDigest, RollingQuantiles
+
+QS = [0.001, 0.01, 0.1, 0.5, 0.9, 0.99, 0.999]
+
+def _rank_error(values, qs, estimates):
+    ordered = np.sort(values)
+    return max(abs(np.searchsorted(ordered, e) / len(ordered) - q) for q, e in zip(qs, estimates))
+
+def test_digest_quantiles_are_accurate():
+    values = np.random.default_rng(0).lognormal(size=50000)
+    digest = TDigest()
+    for value in values[:1000]:
+        digest.add(value)
+    digest.extend(values[1000:])
+    assert len(digest) == len(values)
+    assert _rank_error(values, QS, digest.quantiles(QS)) < 0.005
+    assert digest.quantile(0) == values.min() and digest.quantile(1) == values.max()
+
+def test_merge_matches_a_single_digest():
+    rng = np.random.default_rng(1)
+    a, b = rng.normal(0, 1, 20000), rng.normal(3, 1, 20000)
+    left, right = TDigest(), TDigest()
+    left.extend(a)
+    right.extend(b)
+    merged = left.copy().merge(right)
+    assert len(merged) == 40000 and len(left) == 20000
+    assert _rank_error(np.concatenate([a, b]), QS, merged.quantiles(QS)) < 0.005
+
+def test_reads_do_not_modify_the_digest():
+    digest = TDigest()
+    digest.extend(np.arange(1000.0))
+    digest.add(5000.0)
+    buffer, means, weights = list(digest.buffer), digest.means.copy(), digest.weights.copy()
+    first = digest.quantiles(QS)
+    copy = digest.copy()
+    assert digest.buffer == buffer
+    assert np.array_equal(digest.means, means) and np.array_equal(digest.weights, weights)
+    assert copy.quantiles(QS) == first == digest.quantiles(QS)
+
+def test_rolling_quantiles_forget_old_values():
+    rolling = RollingQuantiles(1000, buckets=8)
+    rolling.extend(np.full(5000, 10.0))
+    rolling.extend(np.full(1000, 20.0))
+    assert 875 <= len(rolling) <= 1000
+    assert rolling.quantiles([0.0, 0.5, 1.0]) == [20.0, 20.0, 20.0]
+
+def test_engine_quantiles_per_tick_and_batch_agree():
+    prices = np.random.default_rng(2).uniform(90, 110, 3000)
+    single = RealTimeDataEngine(window_size=500, quantiles=True)
+    batched = RealTimeDataEngine(window_size=500, quantiles=True)
+    for i, price in enumerate(prices):
+        single.ingest("A", float(price), 1, float(i))
+    batched.ingest_batch(["A"] * len(prices), prices, timestamps=np.arange(len(prices), dtype=float))
+    for rolling in (False, True):
+        assert single.get_quantiles("A", QS, rolling) == batched.get_quantiles("A", QS, rolling)
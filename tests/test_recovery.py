@@ -0,0 +1,106 @@
+import json
+import os
+import subprocess
+import sys
+import pickle
+import time
+from data_engine import RealTimeDataEngine
+from stockAppFns import hashtable, tick_log
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SYMBOLS = ["AAPL", "MSFT", "GOOGL", "TSLA", "AMZN", "NVDA"]
+
+# each step opens the engine on log_dir, optionally ingests, and reports what it sees
+SCRIPT = """
+import json, sys
+from data_engine import RealTimeDataEngine
+log_dir, ticks, checkpoint = sys.argv[1], json.loads(sys.argv[2]), sys.argv[3] == "1"
+engine = RealTimeDataEngine(buffer_size=50, log_dir=log_dir)
+for symbol, price, timestamp in ticks:
+    engine.ingest(symbol, price, 1, timestamp)
+if checkpoint:
+    engine.checkpoint()
+result = {"symbols": engine.list_symbols(),
+          "history": {s: len(engine.get_price_history(s)) for s in engine.list_symbols()}}
+engine.close()
+print(json.dumps(result))
+"""
+
+def _run(log_dir, seed, ticks=(), checkpoint=False):
+    env = dict(os.environ, PYTHONHASHSEED=str(seed), PYTHONPATH=ROOT)
+    out = subprocess.run([sys.executable, "-c", SCRIPT, log_dir, json.dumps(list(ticks)), "1" if checkpoint else "0"],
+                         env=env, capture_output=True, text=True, check=True)
+    return json.loads(out.stdout)
+
+def test_restart_under_different_hash_seeds(tmp_path):
+    log_dir = str(tmp_path)
+    first = [(s, 100.0 + i, 1000.0 + i) for i, s in enumerate(SYMBOLS)]
+    _run(log_dir, 1, first, checkpoint=True)
+
+    # a new process with a different seed must resolve the checkpointed symbols, not re-register them
+    second = _run(log_dir, 2, [(s, 200.0, 2000.0) for s in SYMBOLS])
+    assert second["symbols"] == SYMBOLS
+    assert all(n == 2 for n in second["history"].values())
+
+    third = _run(log_dir, 3)
+    assert third["symbols"] == SYMBOLS
+    assert third["history"] == second["history"]
+
+def test_recover_replays_log_tail_after_checkpoint(tmp_path):
+    engine = RealTimeDataEngine(buffer_size=20, log_dir=str(tmp_path))
+    for i in range(10):
+        engine.ingest("AAPL", 100.0 + i, 1, 1000.0 + i)
+    engine.checkpoint()
+    for i in range(5):
+        engine.ingest("MSFT", 50.0 + i, 1, 2000.0 + i)
+    engine.close()
+
+    restarted = RealTimeDataEngine(buffer_size=20, log_dir=str(tmp_path))
+    assert restarted.replayed == 5
+    assert restarted.list_symbols() == ["AAPL", "MSFT"]
+    assert list(restarted.get_price_history("AAPL")) == [100.0 + i for i in range(10)]
+    assert restarted.get_latest_price("MSFT") == 54.0
+    restarted.close()
+
+def test_hashtable_rehashes_on_unpickle():
+    table = hashtable.HashTable()
+    for i, symbol in enumerate(SYMBOLS):
+        table.put(symbol, i)
+    state = pickle.loads(pickle.dumps(table))
+    # simulate another process: corrupt the stored hashes, then restore through __setstate__
+    stale = dict(state.__dict__, buckets=[[(k, v, h + 1) for k, v, h in bucket] for bucket in state.buckets])
+    restored = hashtable.HashTable.__new__(hashtable.HashTable)
+    restored.__setstate__(stale)
+    assert [restored.get(s) for s in SYMBOLS] == list(range(len(SYMBOLS)))
+
+def test_restart_with_new_settings_rebuilds_from_the_log(tmp_path):
+    engine = RealTimeDataEngine(buffer_size=20, window_size=5, log_dir=str(tmp_path))
+    for i in range(30):
+        engine.ingest("AAPL", 100.0 + i, 1, 1000.0 + i)
+    engine.checkpoint()
+    engine.ingest("AAPL", 200.0, 1, 2000.0)
+    engine.close()
+
+    resized = RealTimeDataEngine(buffer_size=50, window_size=3, indicator_specs=("ema:3",), log_dir=str(tmp_path))
+    assert resized.replayed == 31  # checkpoint ignored, whole log replayed under the new settings
+    assert len(resized.get_price_history("AAPL")) == 31
+    assert resized.get_rolling_average("AAPL") == (128.0 + 129.0 + 200.0) / 3
+    resized.close()
+
+    same = RealTimeDataEngine(buffer_size=20, window_size=5, indicator_specs=("ema:3",), log_dir=str(tmp_path))
+    assert same.replayed == 1 and same.registry.indicator_specs == ["ema:3"]
+    assert same.get_rolling_average("AAPL") == (126.0 + 127.0 + 128.0 + 129.0 + 200.0) / 5
+    assert same.get_indicator("AAPL", "ema:3") is not None
+    same.close()
+
+def test_idle_feed_is_committed_without_further_ticks(tmp_path):
+    log = tick_log.TickLog(str(tmp_path), fsync_interval=0.02)
+    log.define_symbol(0, "AAPL")
+    log.append(0, 100.0, 1, 1000.0)
+    deadline = time.monotonic() + 5
+    while not len(tick_log.read_ticks(str(tmp_path))) and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert tick_log.read_ticks(str(tmp_path))["price"].tolist() == [100.0]
+    assert tick_log.read_symbols(str(tmp_path)) == ["AAPL"]
+    log.close()
+    assert not log._flusher.is_alive()
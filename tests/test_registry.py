@@ -0,0 +1,53 @@
+import sys
+import threading
+from stockAppFns.registery import SymbolRegistry
+from stockAppFns.hashtable import HashTable
+
+def test_symbols_are_interned_to_dense_ids():
+    registry = SymbolRegistry(buffer_size=10, buffer_sizes={"HOT": 500})
+    symbols = ["AAPL", "MSFT", "AAPL", "HOT", "MSFT", "TSLA"]
+    ids = [registry.register(symbol) for symbol in symbols]
+    assert ids == [0, 1, 0, 2, 1, 3]
+    assert registry.all_symbols() == ["AAPL", "MSFT", "HOT", "TSLA"]
+    assert registry.symbol_id("HOT") == 2 and registry.symbol_name(2) == "HOT"
+    assert registry.get_by_id(1) is registry.get_symbol_data("MSFT") is registry.get_or_create("MSFT")
+    assert registry.get_symbol_data("HOT")["buffer"].capacity == 500
+    assert registry.get_symbol_data("AAPL")["buffer"].capacity == 10
+    assert registry.symbol_id("NOPE") is None and not registry.exists("NOPE") and len(registry) == 4
+
+def test_hashtable_survives_resizes_and_removals():
+    table = HashTable(initial_capacity=2)
+    for i in range(200):
+        table.put(f"S{i}", i)
+    table.put("S7", -7)
+    assert len(table) == 200 and table.capacity >= 256
+    assert table.get("S7") == -7 and table.get("S199") == 199
+    assert table.remove("S7") == -7 and table.get("S7") is None and len(table) == 199
+    assert sorted(table.keys()) == sorted(f"S{i}" for i in range(200) if i != 7)
+
+def test_lookups_during_resizes_never_miss():
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    table = HashTable(initial_capacity=2)
+    table.put("FIRST", 0)
+    errors = []
+    done = threading.Event()
+
+    def read():
+        try:
+            while not done.is_set():
+                if table.get("FIRST") != 0:
+                    errors.append("missed")
+        except Exception as e:
+            errors.append(e)
+
+    reader = threading.Thread(target=read)
+    reader.start()
+    try:
+        for i in range(100000):
+            table.put(f"S{i}", i)
+    finally:
+        done.set()
+        reader.join()
+        sys.setswitchinterval(interval)
+    assert errors == [] and len(table) == 100001
@@ -0,0 +1,69 @@
+import numpy as np
+import pytest
+from data_engine import RealTimeDataEngine
+from replay import ReplayDriver, iter_csv, iter_records, iter_tick_log
+
+SYMBOLS = ["AAPL", "MSFT", "GOOG"]
+
+def _ticks(n):
+    rng = np.random.default_rng(4)
+    symbols = np.array(SYMBOLS)[rng.integers(0, len(SYMBOLS), n)]
+    prices = rng.uniform(10, 20, n).round(2)
+    volumes = rng.integers(1, 100, n).astype(np.float64)
+    timestamps = 1000.0 + np.arange(n) * 0.5
+    return symbols, prices, volumes, timestamps
+
+def _history(engine):
+    return {symbol: list(engine.get_price_history(symbol)) for symbol in engine.list_symbols()}
+
+def _expected(ticks):
+    symbols, prices = ticks[0], ticks[1]
+    return {symbol: prices[symbols == symbol].tolist() for symbol in SYMBOLS}
+
+def _replay(chunks, **kwargs):
+    engine = RealTimeDataEngine(buffer_size=100)
+    stats = ReplayDriver(engine, **kwargs).run(chunks)
+    return engine, stats
+
+def test_csv_replay_in_chunks(tmp_path):
+    ticks = _ticks(50)
+    path = tmp_path / "ticks.csv"
+    lines = ["symbol,price,volume,timestamp"] + [f"{s},{p},{v},{t}" for s, p, v, t in zip(*ticks)]
+    path.write_text("\n".join(lines) + "\n")
+    engine, stats = _replay(iter_csv(str(path), chunk_size=16))
+    assert stats["ticks"] == 50 and stats["chunks"] == 4
+    assert _history(engine) == _expected(ticks)
+    assert engine.registry.get_symbol_data("GOOG")["buffer"].latest()[1] == ticks[3][ticks[0] == "GOOG"][-1]
+
+def test_csv_parses_datetimes_and_missing_volume(tmp_path):
+    path = tmp_path / "ticks.csv"
+    path.write_text("timestamp,symbol,price\n1970-01-01T00:00:10,AAPL,1.5\n1970-01-01T00:00:11,AAPL,2.5\n")
+    symbols, prices, volumes, timestamps = next(iter_csv(str(path)))
+    assert symbols.tolist() == ["AAPL", "AAPL"] and prices.tolist() == [1.5, 2.5]
+    assert volumes.tolist() == [0.0, 0.0] and timestamps.tolist() == [10.0, 11.0]
+
+def test_npy_records_with_bytes_symbols(tmp_path):
+    ticks = _ticks(30)
+    records = np.zeros(30, dtype=[("symbol", "S8"), ("price", "f8"), ("volume", "f8"), ("timestamp", "f8")])
+    records["symbol"] = ticks[0].astype("S8")
+    records["price"], records["volume"], records["timestamp"] = ticks[1:]
+    path = tmp_path / "ticks.npy"
+    np.save(path, records)
+    engine, stats = _replay(iter_records(str(path), chunk_size=7))
+    assert stats["chunks"] == 5 and sorted(engine.list_symbols()) == sorted(SYMBOLS)
+    assert _history(engine) == _expected(ticks)
+
+def test_tick_log_replay(tmp_path):
+    ticks = _ticks(40)
+    source = RealTimeDataEngine(buffer_size=100, log_dir=str(tmp_path))
+    source.ingest_batch(*ticks)
+    source.close()
+    engine, stats = _replay(iter_tick_log(str(tmp_path), chunk_size=15))
+    assert stats["ticks"] == 40 and _history(engine) == _expected(ticks)
+
+def test_paced_replay_follows_the_recorded_clock():
+    symbols, prices, volumes, _ = _ticks(6)
+    timestamps = np.linspace(0.0, 1.0, 6)
+    engine, stats = _replay([(symbols, prices, volumes, timestamps)], speed=10.0)
+    assert stats["ticks"] == 6 and stats["seconds"] == pytest.approx(0.1, abs=0.09)
+    assert sum(len(v) for v in _history(engine).values()) == 6
@@ -0,0 +1,112 @@
+import sys
+import threading
+import time
+from data_engine import RealTimeDataEngine
+
+def test_reader_waits_for_a_write_in_progress():
+    engine = RealTimeDataEngine(window_size=4)
+    for _ in range(4):
+        engine.ingest("A", 100.0, 1, 1.0)
+    symbol_data = engine.registry.get_symbol_data("A")
+
+    # open a write by hand and leave the window torn: evicted value subtracted, new one not added yet
+    symbol_data["seq"] += 1
+    symbol_data["stats"].sum -= 100.0
+    result = []
+    reader = threading.Thread(target=lambda: result.append(engine.get_rolling_average("A")))
+    reader.start()
+    time.sleep(0.05)
+    assert reader.is_alive() and not result
+    symbol_data["stats"].sum += 100.0
+    symbol_data["seq"] += 1
+    reader.join(timeout=5)
+    assert result == [100.0]
+    assert engine.get_read_stats()["read_retries"] > 0
+
+def test_concurrent_reads_never_see_torn_state():
+    engine = RealTimeDataEngine(window_size=50)
+    for _ in range(50):
+        engine.ingest("A", 100.0, 1, 1.0)
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    stop = threading.Event()
+
+    def write():
+        while not stop.is_set():
+            engine.ingest("A", 100.0, 1, 1.0)
+
+    writer = threading.Thread(target=write)
+    writer.start()
+    try:
+        readings = set()
+        for _ in range(20000):
+            readings.add(engine.get_rolling_average("A"))
+            readings.add(engine.get_rolling_std("A"))
+            readings.add(engine.get_latest_price("A"))
+    finally:
+        stop.set()
+        writer.join()
+        sys.setswitchinterval(interval)
+    assert readings == {100.0, 0.0}
+
+def test_reader_errors_on_torn_state_are_retried():
+    engine = RealTimeDataEngine()
+    engine.ingest("A", 100.0, 1, 1.0)
+    symbol_data = engine.registry.get_symbol_data("A")
+    calls = []
+
+    def reader(data):
+        calls.append(data["seq"])
+        if len(calls) == 1: # a write completes while this read runs and leaves it torn
+            data["seq"] += 2
+            raise IndexError("deque index out of range")
+        return data["buffer"].latest()[0]
+
+    assert engine._read(symbol_data, reader) == 100.0 and len(calls) == 2
+
+    def broken(data):
+        raise KeyError("spec")
+
+    try:
+        engine._read(symbol_data, broken)
+    except KeyError:
+        pass
+    else:
+        raise AssertionError("an error from a stable read must reach the caller")
+
+def test_concurrent_window_and_indicator_reads_do_not_raise():
+    engine = RealTimeDataEngine(time_windows=(0.05,), indicator_specs=("ema:5",))
+    engine.ingest("A", 100.0, 1, 0.0)
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    stop = threading.Event()
+    errors = []
+
+    def write():
+        ts = 0.0
+        while not stop.is_set():
+            ts += 0.001  # every tick evicts from the 0.05s window
+            engine.ingest("A", 100.0 + ts % 1, 1, ts)
+
+    def read():
+        try:
+            for _ in range(20000):
+                engine.get_window_stats("A", 0.05)
+                engine.get_window_stats("A", 0.05, now=time.time())
+                engine.get_indicator("A", "ema:5")
+        except Exception as e:
+            errors.append(e)
+
+    writer = threading.Thread(target=write)
+    readers = [threading.Thread(target=read) for _ in range(2)]
+    writer.start()
+    try:
+        for reader in readers:
+            reader.start()
+        for reader in readers:
+            reader.join()
+    finally:
+        stop.set()
+        writer.join()
+        sys.setswitchinterval(interval)
+    assert errors == []
@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+from data_engine import RealTimeDataEngine
+from sharded_engine import ShardedDataEngine, shard_for
+
+SYMBOLS = ["AAPL", "MSFT", "GOOGL", "TSLA", "AMZN", "NVDA", "META", "INFY"]
+
+@pytest.fixture
+def engine():
+    sharded = ShardedDataEngine(num_shards=2, buffer_size=20, window_size=5, flush_size=4)
+    for i, symbol in enumerate(SYMBOLS):
+        sharded.ingest(symbol, 10.0 * (i + 1), 1, 1000.0 + i)
+    yield sharded
+    sharded.close()
+
+def test_error_on_one_shard_does_not_desync_the_others(engine):
+    assert len({shard_for(s, 2) for s in SYMBOLS}) == 2
+    with pytest.raises(ValueError):
+        engine._call_all("get_indicator", "AAPL", "rsi14")  # only AAPL's shard fails
+    assert sorted(engine.list_symbols()) == sorted(SYMBOLS)
+    assert engine.get_latest_price("MSFT") == 20.0
+
+def test_failed_batch_is_reported_and_worker_survives(engine):
+    shard = engine._shard("AAPL")
+    engine._chunks[shard].append((["AAPL"], [1.0, 2.0], [1], [2000.0]))  # mismatched columns
+    with pytest.raises(ValueError):
+        engine.get_latest_price("AAPL")
+    assert engine.get_latest_price("AAPL") == 10.0
+    engine.ingest("AAPL", 11.0, 1, 3000.0)
+    assert engine.get_latest_price("AAPL") == 11.0
+
+def test_bytes_symbols_route_like_names(engine):
+    engine.ingest_batch(np.array([b"AAPL", b"MSFT"]), [15.0, 25.0], [1, 1], [4000.0, 4000.0])
+    assert engine.get_latest_price("AAPL") == 15.0 and engine.get_latest_price("MSFT") == 25.0
+    assert sorted(engine.list_symbols()) == sorted(SYMBOLS)
+
+def test_price_queries_are_sorted_by_price(engine):
+    above = engine.symbols_above_price(25.0)
+    below = engine.symbols_below_price(55.0)
+    assert [price for _, price in above] == [30.0, 40.0, 50.0, 60.0, 70.0, 80.0]
+    assert [price for _, price in below] == [10.0, 20.0, 30.0, 40.0, 50.0]
+    assert [price for _, price in engine.symbols_in_price_range(20.0, 40.0)] == [20.0, 30.0, 40.0]
+
+def test_average_queries_are_sorted_like_a_single_engine(engine):
+    single = RealTimeDataEngine(buffer_size=20, window_size=5)
+    for i, symbol in enumerate(SYMBOLS):
+        single.ingest(symbol, 10.0 * (i + 1), 1, 1000.0 + i)
+    moves = [1.3, 0.6, 1.05, 0.9, 1.2, 0.75, 1.1, 0.95]
+    for i, (symbol, move) in enumerate(zip(SYMBOLS, moves)):
+        for target in (engine, single):
+            target.ingest(symbol, 10.0 * (i + 1) * move, 1, 2000.0 + i)
+    for query in ("symbols_above_average", "symbols_below_average"):
+        expected = getattr(single, query)()
+        assert len(expected) == 4 and getattr(engine, query)() == expected
@@ -0,0 +1,35 @@
+import numpy as np
+import pytest
+from stockAppFns.sliding_window import SlidingWindow
+
+@pytest.mark.parametrize("size", [1, 2, 7, 50])
+def test_window_stats_match_brute_force(size):
+    values = np.random.default_rng(size).uniform(50, 150, 400).round(2).tolist()
+    window = SlidingWindow(size)
+    for i, value in enumerate(values):
+        window.add(value)
+        recent = values[max(0, i + 1 - size):i + 1]
+        assert window.get_values() == recent
+        assert window.get_average() == pytest.approx(np.mean(recent))
+        assert (window.get_min(), window.get_max()) == (min(recent), max(recent))
+        assert window.get_std() == pytest.approx(np.std(recent), abs=1e-9)
+        returns = np.array(recent[1:]) / np.array(recent[:-1]) - 1
+        if len(returns) >= 2:
+            assert window.get_volatility() == pytest.approx(np.std(returns, ddof=1), abs=1e-9)
+        else:
+            assert window.get_volatility() is None
+
+def test_extend_matches_add():
+    values = np.random.default_rng(9).uniform(1, 2, 300).tolist()
+    one, many = SlidingWindow(20), SlidingWindow(20)
+    for value in values:
+        one.add(value)
+    many.extend(values)
+    assert one.get_values() == many.get_values()
+    assert (one.get_average(), one.get_min(), one.get_max(), one.get_std()) == \
+           (many.get_average(), many.get_min(), many.get_max(), many.get_std())
+
+def test_empty_window():
+    window = SlidingWindow(5)
+    assert window.get_average() == 0 and window.get_min() is None and window.get_max() is None
+    assert window.get_std() is None and window.get_volatility() is None and not window.is_full()
@@ -0,0 +1,68 @@
+import random
+from data_engine import RealTimeDataEngine
+from stockAppFns.sorted_index import SortedIndex
+
+def _filled(n=1000, load=4, seed=7):
+    rng = random.Random(seed)
+    index = SortedIndex(load=load)
+    values = {}
+    for _ in range(3 * n):
+        key = rng.randrange(n)
+        values[key] = round(rng.uniform(0, 100), 1)
+        index.update(key, values[key])
+    return index, values
+
+def test_range_queries_match_brute_force():
+    index, values = _filled()
+    assert len(index.blocks) > 10
+    rng = random.Random(1)
+    for _ in range(200):
+        low, high = sorted(round(rng.uniform(-5, 105), 1) for _ in range(2))
+        expected = sorted((v, k) for k, v in values.items() if low <= v <= high)
+        assert index.range(low, high) == expected
+        assert index.above(low) == sorted((v, k) for k, v in values.items() if v > low)
+        assert index.below(high) == sorted((v, k) for k, v in values.items() if v < high)
+
+def test_inverted_range_is_empty():
+    index, values = _filled()
+    for low, high in ((1000, 10), (60.0, 40.0), (50.0, 49.9), (100.0, 0.0)):
+        assert index.range(low, high) == []
+    assert SortedIndex().range(5, 1) == []
+
+def test_engine_inverted_price_range():
+    engine = RealTimeDataEngine()
+    engine.ingest("A", 50.0, 1, 1.0)
+    engine.ingest("B", 500.0, 1, 2.0)
+    assert engine.symbols_in_price_range(1000, 10) == []
+    assert engine.symbols_in_price_range(10, 1000) == [("A", 50.0), ("B", 500.0)]
+
+def test_smallest_largest_and_removal():
+    index, values = _filled(n=200)
+    ordered = sorted((v, k) for k, v in values.items())
+    assert index.smallest(15) == ordered[:15]
+    assert index.largest(15) == ordered[::-1][:15]
+    for key in list(values)[:100]:
+        index.discard(key)
+        del values[key]
+    assert index.range() == sorted((v, k) for k, v in values.items())
+    assert len(index) == len(values)
+
+def test_average_queries_see_every_write_since_the_last_query():
+    rng = random.Random(3)
+    engine = RealTimeDataEngine(window_size=5)
+    history = {}
+    for step in range(600):
+        symbol = f"S{rng.randrange(30)}"
+        price = round(rng.uniform(90, 110), 2)
+        engine.ingest(symbol, price, 1, float(step))
+        history.setdefault(symbol, []).append(price)
+        if step % 37 == 0 or step == 599:
+            averages = {s: sum(h[-5:]) / len(h[-5:]) for s, h in history.items()}
+            above = {s for s, avg in averages.items() if history[s][-1] > avg + 1e-9}
+            below = {s for s, avg in averages.items() if history[s][-1] < avg - 1e-9}
+            assert {s for s, _, _ in engine.symbols_above_average()} == above
+            assert {s for s, _, _ in engine.symbols_below_average()} == below
+    # nothing is ranked at ingest time
+    engine.ingest("S0", 1000.0, 1, 1000.0)
+    assert engine.deviation_index.get(engine.registry.symbol_id("S0")) < 1000
+    assert "S0" in {s for s, _, _ in engine.symbols_above_average()}
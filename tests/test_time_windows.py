@@ -0,0 +1,43 @@
+import pytest
+from data_engine import RealTimeDataEngine
+from stockAppFns.sliding_window import TimeWindow
+
+EMPTY = {"count": 0, "sum": 0.0, "avg": 0, "min": None, "max": None, "truncated": False}
+
+@pytest.fixture(params=[True, False], ids=["columnar", "list"])
+def engine(request):
+    engine = RealTimeDataEngine(buffer_size=100, columnar=request.param, time_windows=(10,))
+    for i in range(30):
+        engine.ingest("A", float(i), 1, 1000.0 + i)
+    return engine
+
+def test_empty_window_returns_empty_stats(engine):
+    assert engine.get_window_stats("A", 0) == EMPTY
+    assert engine.get_window_stats("A", 5, now=5000.0) == EMPTY
+
+def test_windows_end_at_newest_tick_by_default(engine):
+    for seconds in (10, 5):
+        stats = engine.get_window_stats("A", seconds)
+        expected = [float(i) for i in range(30) if 1000.0 + i > 1029.0 - seconds]
+        assert stats["count"] == len(expected)
+        assert stats["sum"] == sum(expected)
+        assert (stats["min"], stats["max"]) == (min(expected), max(expected))
+
+def test_quiet_symbol_ages_out_against_now(engine):
+    assert engine.get_window_stats("A", 10, now=1029.0)["count"] == 10  # nothing expired, O(1) window
+    aged = engine.get_window_stats("A", 10, now=1034.0)
+    assert aged["count"] == 5 and aged["min"] == 25.0
+    assert engine.get_window_stats("A", 10, now=1100.0) == EMPTY
+    assert engine.get_window_stats("A", 10)["count"] == 10  # reads never evict
+
+def test_time_window_extend_matches_add():
+    one, many = TimeWindow(3), TimeWindow(3)
+    values = [5.0, 1.0, 4.0, 2.0, 8.0, 3.0]
+    timestamps = [0.0, 1.0, 2.0, 3.5, 4.0, 6.0]
+    for value, timestamp in zip(values, timestamps):
+        one.add(value, timestamp)
+    many.extend(values, timestamps)
+    for window in (one, many):
+        assert (len(window), window.get_sum(), window.get_min(), window.get_max()) == (3, 13.0, 2.0, 8.0)
+    one.expire(7.5)
+    assert (len(one), one.get_min(), one.get_max()) == (1, 3.0, 3.0)
@@ -5,7 +5,7 @@ import time
 import random
 import sys
 import os
-from queue import Queue
+from queue import Queue, Empty
 import threading
 
 # Add the current directory to Python path for imports
@@ -26,112 +26,139 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# Initialize session state with proper defaults
-def init_session_state():
-    if 'engine' not in st.session_state:
-        st.session_state.engine = RealTimeDataEngine(buffer_size=100, window_size=20)
+class DataSimulator:
+    """
+    The only thread that writes to the shared engine: it generates simulated ticks while
+    running and applies points queued by any session, so the engine keeps a single writer.
+    """
+    def __init__(self, engine, symbols, base_prices):
+        self.engine = engine
+        self.symbols = symbols  # shared with the sidebar, so added symbols get simulated
+        self.base_prices = base_prices
+        self.manual_points = Queue()  # (symbol, price) from sessions
+        self.running = False  # simulating
+        self.speed = 3
+        self.volatility = 1.0
+        self.thread = threading.Thread(target=self.ingest_loop, daemon=True)
+        self.thread.start()
     
-    if 'symbols' not in st.session_state:
-        st.session_state.symbols = ["AAPL", "TSLA", "GOOGL", "MSFT", "AMZN", "INFY", "NVDA"]
+    def simulate_tick(self):
+        symbol = random.choice(self.symbols)
+        # Add some trending behavior
+        self.base_prices[symbol] *= random.uniform(0.99, 1.01)
+        noise = random.uniform(-self.volatility, self.volatility)
+        price = max(1, self.base_prices[symbol] + noise)
+        self.engine.ingest(symbol, round(price, 2), random.randint(1, 1000))
     
-    if 'simulation_running' not in st.session_state:
-        st.session_state.simulation_running = False
+    def ingest_loop(self):
+        """Background ingestion: manual points as they arrive, simulated ticks at speed per second"""
+        next_tick = time.monotonic()
+        while True:
+            try:
+                wait = max(0.0, next_tick - time.monotonic()) if self.running else 0.5
+                try:
+                    symbol, price = self.manual_points.get(timeout=wait)
+                    self.engine.ingest(symbol, price)
+                    continue
+                except Empty:
+                    pass
+                if self.running and time.monotonic() >= next_tick:
+                    self.simulate_tick()
+                    next_tick = time.monotonic() + 1.0 / self.speed
+            except Exception as e:
+                print(f"Simulation error: {e}")
+                time.sleep(1.0)  # back off so a failure that keeps repeating cannot spin
+                next_tick = time.monotonic() + 1.0 / self.speed
+    
+    def add_point(self, symbol, price):
+        self.manual_points.put((symbol, price))
+    
+    def start(self):
+        if not self.running:
+            self.running = True
+            return True
+        return False
     
-    if 'data_queue' not in st.session_state:
-        st.session_state.data_queue = Queue()
+    def stop(self):
+        self.running = False
+
+# One engine and one ingestion thread per server process, shared by every browser session
+@st.cache_resource
+def get_shared_feed():
+    engine = RealTimeDataEngine(
+        buffer_size=5000, window_size=20, bar_resolutions=(1, 60, 300, 3600),
+        log_dir=os.environ.get("STOCK_ENGINE_LOG_DIR"),  # set to survive restarts
+        checkpoint_every=10000,
+        instrument=True,  # latency histograms for the Engine Latency panel
+        hot_symbols=32
+    )
+    symbols = ["AAPL", "TSLA", "GOOGL", "MSFT", "AMZN", "INFY", "NVDA"]
+    base_prices = {symbol: random.uniform(100, 500) for symbol in symbols}
+    return DataSimulator(engine, symbols, base_prices)
+
+feed = get_shared_feed()
+engine = feed.engine
+
+# Per-session state is only a read-only view: the symbol summaries seen so far and the
+# engine version they are current to, so each rerun pulls just the symbols changed since
+def init_session_state():
+    if 'last_version' not in st.session_state:
+        st.session_state.last_version = 0
     
-    if 'base_prices' not in st.session_state:
-        st.session_state.base_prices = {symbol: random.uniform(100, 500) for symbol in st.session_state.symbols}
+    if 'view' not in st.session_state:
+        st.session_state.view = {}
 
 init_session_state()
 
-# Sidebar controls
+def refresh_view() -> dict:
+    delta = engine.get_changes_since(st.session_state.last_version)
+    st.session_state.view.update(delta["changes"])
+    st.session_state.last_version = delta["version"]
+    return st.session_state.view
+
+# Sidebar controls (they drive the shared feed, so every viewer sees the effect)
 st.sidebar.title("🎛️ Controls")
 
 # Symbol management
 st.sidebar.subheader("Symbol Management")
 new_symbol = st.sidebar.text_input("Add New Symbol", placeholder="e.g., META")
 if st.sidebar.button("Add Symbol"):
-    if new_symbol and new_symbol.upper() not in st.session_state.symbols:
-        st.session_state.symbols.append(new_symbol.upper())
-        st.session_state.base_prices[new_symbol.upper()] = random.uniform(100, 500)
+    if new_symbol and new_symbol.upper() not in feed.symbols:
+        feed.base_prices[new_symbol.upper()] = random.uniform(100, 500)
+        feed.symbols.append(new_symbol.upper())
         st.sidebar.success(f"Added {new_symbol.upper()}")
 
 # Display current symbols
 st.sidebar.write("**Current Symbols:**")
-for symbol in st.session_state.symbols:
+for symbol in feed.symbols:
     st.sidebar.write(f"• {symbol}")
 
 # Simulation controls
 st.sidebar.subheader("Data Simulation")
-simulation_speed = st.sidebar.slider("Speed (updates/sec)", 1, 10, 3)
-price_volatility = st.sidebar.slider("Price Volatility", 0.1, 5.0, 1.0)
-
-class DataSimulator:
-    def __init__(self, engine, symbols, base_prices):
-        self.engine = engine
-        self.symbols = symbols.copy()  # Create a copy
-        self.base_prices = base_prices.copy()  # Create a copy
-        self.running = False
-        self.thread = None
-    
-    def simulate_data(self, speed, volatility):
-        """Background simulation function"""
-        while self.running:
-            try:
-                symbol = random.choice(self.symbols)
-                # Add some trending behavior
-                self.base_prices[symbol] *= random.uniform(0.99, 1.01)
-                noise = random.uniform(-volatility, volatility)
-                price = max(1, self.base_prices[symbol] + noise)
-                
-                self.engine.ingest(symbol, round(price, 2))
-                time.sleep(1.0 / speed)
-            except Exception as e:
-                print(f"Simulation error: {e}")
-                break
-    
-    def start(self, speed, volatility):
-        if not self.running:
-            self.running = True
-            self.thread = threading.Thread(target=self.simulate_data, args=(speed, volatility), daemon=True)
-            self.thread.start()
-            return True
-        return False
-    
-    def stop(self):
-        self.running = False
-        if self.thread and self.thread.is_alive():
-            self.thread.join(timeout=1)
-
-# Initialize simulator if not exists
-if 'simulator' not in st.session_state:
-    st.session_state.simulator = DataSimulator(
-        st.session_state.engine, 
-        st.session_state.symbols, 
-        st.session_state.base_prices
-    )
+# moving a slider retunes the shared feed at once; a new viewer's sliders start at its current settings
+st.sidebar.slider("Speed (updates/sec)", 1, 10, feed.speed, key="simulation_speed",
+                  on_change=lambda: setattr(feed, "speed", st.session_state.simulation_speed))
+st.sidebar.slider("Price Volatility", 0.1, 5.0, float(feed.volatility), key="price_volatility",
+                  on_change=lambda: setattr(feed, "volatility", st.session_state.price_volatility))
 
 # Start/Stop simulation
 col1, col2 = st.sidebar.columns(2)
 with col1:
-    if st.button("▶️ Start", disabled=st.session_state.simulation_running):
-        if st.session_state.simulator.start(simulation_speed, price_volatility):
-            st.session_state.simulation_running = True
+    if st.button("▶️ Start", disabled=feed.running):
+        if feed.start():
             st.success("Started!")
 
 with col2:
-    if st.button("⏹️ Stop", disabled=not st.session_state.simulation_running):
-        st.session_state.simulator.stop()
-        st.session_state.simulation_running = False
+    if st.button("⏹️ Stop", disabled=not feed.running):
+        feed.stop()
         st.success("Stopped!")
 
 # Manual data adding for testing
 st.sidebar.subheader("Manual Testing")
-test_symbol = st.sidebar.selectbox("Symbol", st.session_state.symbols)
+test_symbol = st.sidebar.selectbox("Symbol", feed.symbols)
 test_price = st.sidebar.number_input("Price", min_value=1.0, value=250.0, step=1.0)
 if st.sidebar.button("Add Data Point"):
-    st.session_state.engine.ingest(test_symbol, test_price)
+    feed.add_point(test_symbol, test_price)  # applied by the ingestion thread
     st.sidebar.success(f"Added {test_symbol} @ ${test_price}")
 
 # Main dashboard
@@ -140,8 +167,8 @@ st.markdown("---")
 
 # Create dashboard function
 def create_dashboard():
-    # Get all current data
-    all_data = st.session_state.engine.get_all_data()
+    # Get all current data (only symbols changed since this session's last refresh are fetched)
+    all_data = refresh_view()
     
     if not all_data:
         st.info("🚀 Start the simulation or manually add data points to begin!")
@@ -152,7 +179,8 @@ def create_dashboard():
     cols = st.columns(4)
     
     active_symbols = len(all_data)
-    total_points = st.session_state.engine.total_points
+    metrics = engine.get_metrics()
+    total_points = metrics["total_points"]
     
     with cols[0]:
         st.metric("Active Symbols", active_symbols)
@@ -166,8 +194,22 @@ def create_dashboard():
         st.metric("Avg Current Price", f"${avg_price:.2f}")
     
     with cols[3]:
-        processing_rate = st.session_state.engine.total_points / max(st.session_state.engine.total_time, 0.001)
-        st.metric("Processing Rate", f"{processing_rate:.1f} pts/sec")
+        st.metric("Processing Rate", f"{metrics['points_per_second']:.1f} pts/sec")
+
+    if metrics["instrumented"]:
+        with st.expander("⏱️ Engine Latency"):
+            ingest = metrics["ingest"]
+            st.write(f"Per tick: p50 {ingest['p50_us']:.1f}µs · p99 {ingest['p99_us']:.1f}µs · "
+                     f"p99.9 {ingest['p999_us']:.1f}µs · max {ingest['max_us']:.1f}µs")
+            rows = [{"Name": name, "Kind": kind, "Calls": h["count"], "Mean (µs)": round(h["mean_us"], 1),
+                     "p50 (µs)": round(h["p50_us"], 1), "p99 (µs)": round(h["p99_us"], 1),
+                     "p99.9 (µs)": round(h["p999_us"], 1)}
+                    for kind in ("stages", "queries") for name, h in metrics[kind].items()]
+            if rows:
+                st.dataframe(pd.DataFrame(rows), use_container_width=True)
+            hot = engine.hottest_symbols(5)
+            if hot:
+                st.write("Busiest symbols: " + ", ".join(f"{symbol} ({rate:.2f}/s)" for symbol, rate, _ in hot))
     
     # Charts row
     col1, col2 = st.columns(2)
@@ -251,35 +293,29 @@ def create_dashboard():
     # Recent price movements
     st.subheader("⏰ Recent Price Movements")
     
-    # Get recent data for each symbol
+    # Get the buffered history for each symbol, downsampled to about one point per pixel
     recent_data = {}
-    for symbol in st.session_state.symbols:
-        if st.session_state.engine.registry.exists(symbol):
-            buffer = st.session_state.engine.registry.get_symbol_data(symbol)["buffer"]
-            recent = buffer.return_n_newest(20)  # Get last 20 points
-            if recent and len(recent) > 1:  # Only show if we have multiple points
-                recent_data[symbol] = recent
+    for symbol in feed.symbols:
+        recent = engine.get_downsampled_history(symbol, width=600)  # (timestamps, prices)
+        if recent is not None and len(recent[1]) > 1:  # Only show if we have multiple points
+            recent_data[symbol] = recent
     
     if recent_data:
         fig = go.Figure()
         
-        for symbol, data_points in recent_data.items():
-            prices = [point[0] for point in reversed(data_points)]  # Reverse to show chronologically
-            x_values = list(range(len(prices)))
-            
+        for symbol, (timestamps, prices) in recent_data.items():
             fig.add_trace(go.Scatter(
-                x=x_values,
+                x=pd.to_datetime(timestamps, unit="s"),
                 y=prices,
-                mode='lines+markers',
+                mode='lines',
                 name=symbol,
-                line=dict(width=2),
-                marker=dict(size=4)
+                line=dict(width=2)
             ))
         
         fig.update_layout(
             height=400,
-            title="Recent Price Trends (Last 20 Data Points)",
-            xaxis_title="Data Point Index",
+            title="Recent Price Trends (buffered history, downsampled)",
+            xaxis_title="Time",
             yaxis_title="Price ($)",
             hovermode='x unified'
         )
@@ -287,12 +323,31 @@ def create_dashboard():
     else:
         st.info("Not enough data points for trend analysis yet")
     
+    # Leaderboards
+    st.subheader("🏆 Top Movers")
+    col1, col2, col3 = st.columns(3)
+    boards = [
+        (col1, "Gainers", engine.top_gainers(5)),
+        (col2, "Losers", engine.top_losers(5)),
+        (col3, "Furthest From Average", engine.top_above_average(5)
+                                         + engine.top_below_average(5)),
+    ]
+    for col, title, rows in boards:
+        with col:
+            st.write(f"**{title}**")
+            if rows:
+                for symbol, pct, price in sorted(rows, key=lambda row: abs(row[1]), reverse=True)[:5]:
+                    st.write(f"• **{symbol}** {pct:+.2f}% (${price:.2f})")
+            else:
+                st.write("—")
+
     # Data table
     st.subheader("📋 Symbol Summary Table")
     
     if all_data:
         df_data = []
         for symbol, data in all_data.items():
+            rsi = engine.get_indicator(symbol, "rsi:14")  # attached on first view, then updated per tick
             df_data.append({
                 "Symbol": symbol,
                 "Latest Price": f"${data['latest']:.2f}" if data['latest'] else "N/A",
@@ -300,6 +355,7 @@ def create_dashboard():
                 "Min": f"${data['min']:.2f}" if data['min'] else "N/A",
                 "Max": f"${data['max']:.2f}" if data['max'] else "N/A",
                 "Range": f"${data['max'] - data['min']:.2f}" if data['min'] and data['max'] else "N/A",
+                "RSI (14)": f"{rsi:.1f}" if rsi is not None else "N/A",
                 "Trend": "🟢 Above Avg" if (data['latest'] and data['avg'] and data['latest'] > data['avg']) else "🔴 Below Avg"
             })
         
@@ -313,7 +369,7 @@ def create_dashboard():
     
     with col1:
         threshold_high = st.number_input("High Price Alert ($)", min_value=0.0, value=300.0, step=10.0)
-        high_alerts = st.session_state.engine.symbols_above_price(threshold_high)
+        high_alerts = engine.symbols_above_price(threshold_high)
         
         if high_alerts:
             st.error(f"🔥 {len(high_alerts)} symbols above ${threshold_high}:")
@@ -324,7 +380,7 @@ def create_dashboard():
     
     with col2:
         threshold_low = st.number_input("Low Price Alert ($)", min_value=0.0, value=150.0, step=10.0)
-        low_alerts = st.session_state.engine.symbols_below_price(threshold_low)
+        low_alerts = engine.symbols_below_price(threshold_low)
         
         if low_alerts:
             st.warning(f"⚠️ {len(low_alerts)} symbols below ${threshold_low}:")
@@ -337,7 +393,7 @@ def create_dashboard():
 create_dashboard()
 
 # Auto-refresh logic - only refresh if simulation is running
-if st.session_state.simulation_running:
+if feed.running:
     time.sleep(1)
     st.rerun()
 